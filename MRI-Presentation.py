@@ -1,6 +1,32 @@
 from manim import *
 import numpy as np
 
+from mri.bloch import SliceSelection, simulate
+from mri.brain_mask import BrainMask
+from mri.compressed_sensing import fista, forward, variable_density_mask
+from mri.contrast import TissueMaps, weighted_images
+from mri.epi_distortion import EPIDistortion, EPITiming, susceptibility_field_map
+from mri.gradient_table import GradientTable, StepGradientTable
+from mri.gridding import Gridding
+from mri.isochromats import IsochromatEnsemble, PhaseHistogram
+from mri.kspace import (ProgressiveReconstruction, apply_lookup_table, image_spectrum, kspace_pixels, load_grayscale,
+                        log_magnitude, lookup_table, sampling_order, sweep_reconstructions)
+from mri.magnetization_vectors import MagnetizationVectors
+from mri.phantom import shepp_logan, shepp_logan_kspace, shepp_logan_transform
+from mri.phase_colors import PhaseColormap
+from mri.phase_encoding import phase_encode_preview, phase_encode_steps, phase_encode_table
+from mri.plotting import coords_to_points, plot_piecewise
+from mri.pulse_sequence import PulseSequence, epi_sequence
+from mri.rf_pulses import pulse_bezier
+from mri.sense import acquire, coil_sensitivities, root_sum_of_squares, sense_unfold
+from mri.sequence_diagram import SequenceDiagram
+from mri.signal_equation import kspace_from_gradients, signal
+from mri.signal_readout import SignalRecorder, SignalTrace
+from mri.spin_arrows import EvolveSpinField, PlayBlochTrajectory, RecolorSpinArrows, SpinArrows, SpinDots
+from mri.spin_field import SpinField
+from mri.spin_raster import SpinRaster
+from mri.trajectories import radial, spiral
+
 
 LIGHT_GREEN = "#95C05C"
 PINK = "#EA337F"
@@ -90,7 +116,7 @@ class SliceSelectionGraph(Scene):
         z_label = MathTex("z", color="BLACK").next_to(w_z_axes.y_axis.get_end(), LEFT)
 
         # Create the gradient line (linear mapping from w to z)
-        gradient_line = w_z_axes.plot(lambda x: x, x_range=[0, 5], color=LIGHT_GREEN)
+        gradient_line = plot_piecewise(w_z_axes, [0, 5], [lambda w: w], color=LIGHT_GREEN)
         gradient_line_label = MathTex("G_z", color=LIGHT_GREEN).next_to(gradient_line, RIGHT, buff=-0.2)
 
         # Create second axes for RF pulse
@@ -250,28 +276,11 @@ class SliceSelectionGraph(Scene):
             dash_length=0.1
         )
 
-        # Create a wave function that's zero outside the bandwidth and a sinc wave inside
-        def wave_function(x):
-            import numpy as np
-            if w_min <= x <= w_max:
-                return 1
-            else:
-                return 0
-
-        # Plot the wave on the RF pulse axes
-        rf_wave = rf_axes.plot(
-            wave_function,
-            x_range=[0, 5, 0.01],  # Smaller step for smoother curve
-            color=PINK,
-        )
+        # The RF pulse's spectrum: flat across the bandwidth and zero outside it, as exact corners
+        rf_wave = plot_piecewise(rf_axes, [0, w_min, w_max, 5], [0, 1, 0], color=PINK)
 
         # Add a fill below the curve to make it more visible
-        rf_fill = rf_axes.get_area(
-            rf_wave,
-            x_range=[w_min, w_max],
-            color=PINK,
-            opacity=0.3
-        )
+        rf_fill = plot_piecewise(rf_axes, [w_min, w_max], [1], color=PINK, stroke_width=0, fill_opacity=0.3)
 
         # Add ticks on the second graph
         rf_w_min_tick = Line(
@@ -348,74 +357,37 @@ class SliceSelectionAnimation(Scene):
         num_rows = 15
         num_cols = 7
 
-        initial_angle = 30 * DEGREES
-        starting_animation_duration = 5
-        gradient_animation_duration = 5
+        excitation_animation_duration = 5
 
-        spin_speed_up_factor = 2
-
-        base_frequency = 1.0
+        # Rotate the rotating frame so in-slice spins end up pointing across the screen
+        phase_offset = PI / 2
 
         brain_center = brain_image.get_center()
-        brain_width = brain_image.width
-        brain_height = brain_image.height
-
-        def is_within_brain(x, y):
-            rel_x = x - brain_center[0]
-            rel_y = y - brain_center[1]
-
-            norm_x = rel_x / (brain_width / 2)
-            norm_y = rel_y / (brain_height / 2)
-
-            return (norm_x ** 2 / 0.7 ** 2 + norm_y ** 2 / 0.9 ** 2) < 1
-
-        all_spins = []
-        spin_positions = []
 
-        base_spin_anims = []
+        # Skip positions that are outside the brain
+        is_within_brain = BrainMask.load("assets/brain-sagittal").for_image(brain_image)
+        spin_field = SpinField.from_grid(num_rows, num_cols, center=brain_center, spacing=0.8, mask=is_within_brain)
 
-        for row in range(num_rows):
-            for col in range(num_cols):
-                x = (col - (num_cols - 1) / 2) * 0.8 + brain_center[0]
-                y = (row - (num_rows - 1) / 2) * 0.8 + brain_center[1]
-
-                # Skip positions that are outside the brain
-                if not is_within_brain(x, y):
-                    continue
-
-                spin_circle = Circle(radius=0.1, color=WHITE)
-                spin_circle.set_fill(WHITE)
-
-                line = Line([0, -0.25, 0], [0, 0.25, 0], color=LIGHT_GREEN, stroke_width=5)
-                arrow_tip = ArrowTriangleFilledTip(color=LIGHT_GREEN).scale(0.5)
-                line.add_tip(tip=arrow_tip, at_start=False, tip_length=0.1)
-
-                gradient_factor = (row - (num_rows - 1) / 2) / ((num_rows - 1) / 2)
-                precession_frequency = base_frequency + (gradient_factor)
-                phase_angle = precession_frequency * TAU
-
-                if 6 <= row <= 7:
-                    line.rotate(90 * DEGREES)
-                else:
-                    line.rotate(initial_angle)
-                line.rotate(phase_angle, axis=UP)
-
-                spin_group = VGroup(spin_circle, line)
-                spin_group.move_to([x, y, 0])
-                self.add(spin_group)
-
-                all_spins.append(spin_group)
-                spin_positions.append([row, col, x, y, spin_group])
-
-                anim = Rotate(
-                    line,
-                    angle=base_frequency * TAU * spin_speed_up_factor,
-                    axis=UP,
-                    about_point=spin_group.get_center(),
-                    rate_func=linear,
-                    run_time=starting_animation_duration
-                )
-                base_spin_anims.append(anim)
+        # Simulate the sinc pulse under G_z for a two-row slice centered at z_0
+        z_0_index = num_rows // 2 - 0.5
+        excitation = SliceSelection(slice_thickness=2, slice_center=z_0_index)
+        trajectory = simulate(spin_field.rows, excitation.b1, excitation.gradient, excitation.dt)
+        rf_end_time = excitation.num_rf_samples * excitation.dt
+
+        # Show the state right after the pulse, with the slice gradient still dephasing it:
+        # true 3D vectors, with the cone each one sweeps out as it precesses
+        spin_dots = SpinDots(spin_field, radius=0.1, color=WHITE)
+        spin_vectors = MagnetizationVectors(trajectory.at(rf_end_time), spin_field.positions, color=LIGHT_GREEN)
+        spin_vectors.set_magnetization(trajectory.at(rf_end_time), phase_offset)
+        self.add(spin_dots, spin_vectors)
+
+        excitation_anim = PlayBlochTrajectory(
+            spin_vectors,
+            trajectory,
+            end_time=rf_end_time,
+            phase_offset=phase_offset,
+            run_time=excitation_animation_duration
+        )
         # === Add Z-axis on the left ===
         z_axis = NumberLine(
             x_range=[0, num_rows - 1, 1],
@@ -430,7 +402,6 @@ class SliceSelectionAnimation(Scene):
         z_label.next_to(z_axis, LEFT).shift(UP * 3)
 
         # Mark z_0 (middle slice)
-        z_0_index = num_rows // 2 - 0.5
         z_0_value = z_axis.number_to_point(z_0_index)[1]
         z_0_marker = Dot(z_axis.number_to_point(z_0_index), color=YELLOW)
         z_0_label = MathTex("z_0", font_size=36, color=YELLOW)
@@ -454,8 +425,6 @@ class SliceSelectionAnimation(Scene):
         overlay_rect.move_to([brain_center[0], z_0_y, 0])
         self.add(overlay_rect)
 
-        # self.play(*base_spin_anims)
-        #
         # # Gradient Application
         gradient_arrow = Arrow(start=np.array([4, -3, 0]), end=np.array([4, 3, 0]), buff=0.1, color=LIGHT_BLUE)
         gradient_label = MathTex("G_z", color=LIGHT_BLUE, font_size=48)
@@ -472,26 +441,8 @@ class SliceSelectionAnimation(Scene):
 
         # self.add(omega_small, omega_large)
         #
-        # precession_anims = []
-        #
-        # for row, col, x, y, spin_group in spin_positions:
-        #     arrow = spin_group[1]
-        #
-        #     gradient_factor = (row - (num_rows - 1) / 2) / ((num_rows - 1) / 2)
-        #     precession_frequency = base_frequency + (gradient_factor * 0.5)
-        #     rotation_angle = precession_frequency * TAU
-        #
-        #     anim = Rotate(
-        #         arrow,
-        #         angle=rotation_angle * spin_speed_up_factor,
-        #         axis=UP,
-        #         about_point=spin_group.get_center(),
-        #         rate_func=linear,
-        #         run_time=gradient_animation_duration
-        #     )
-        #     precession_anims.append(anim)
-        #
-        # self.play(*precession_anims)
+        # # RF pulse under the slice gradient, looked up from the precomputed trajectory
+        # self.play(excitation_anim)
 
 
 class SliceSelectionRephasingAnimation(Scene):
@@ -518,63 +469,27 @@ class SliceSelectionRephasingAnimation(Scene):
         num_rows = 15
         num_cols = 7
 
-        initial_angle = 30 * DEGREES
         rephasing_animation_duration = 5  # Reverse gradient (half duration)
 
-        spin_speed_up_factor = 2
-
-        base_frequency = 1.0
+        phase_offset = PI / 2
 
         brain_center = brain_image.get_center()
-        brain_width = brain_image.width
-        brain_height = brain_image.height
-
-        def is_within_brain(x, y):
-            rel_x = x - brain_center[0]
-            rel_y = y - brain_center[1]
-
-            norm_x = rel_x / (brain_width / 2)
-            norm_y = rel_y / (brain_height / 2)
-
-            return (norm_x ** 2 / 0.7 ** 2 + norm_y ** 2 / 0.9 ** 2) < 1
 
-        all_spins = []
-        spin_positions = []
+        # Skip positions that are outside the brain
+        is_within_brain = BrainMask.load("assets/brain-sagittal").for_image(brain_image)
+        spin_field = SpinField.from_grid(num_rows, num_cols, center=brain_center, spacing=0.8, mask=is_within_brain)
 
-        # Create all spins
-        for row in range(num_rows):
-            for col in range(num_cols):
-                x = (col - (num_cols - 1) / 2) * 0.8 + brain_center[0]
-                y = (row - (num_rows - 1) / 2) * 0.8 + brain_center[1]
-
-                # Skip positions that are outside the brain
-                if not is_within_brain(x, y):
-                    continue
-
-                spin_circle = Circle(radius=0.1, color=WHITE)
-                spin_circle.set_fill(WHITE)
-
-                line = Line([0, -0.25, 0], [0, 0.25, 0], color=LIGHT_GREEN, stroke_width=5)
-                arrow_tip = ArrowTriangleFilledTip(color=LIGHT_GREEN).scale(0.5)
-                line.add_tip(tip=arrow_tip, at_start=False, tip_length=0.1)
-
-                # Calculate position-dependent phase based on row position
-                gradient_factor = (row - (num_rows - 1) / 2) / ((num_rows - 1) / 2)
-                precession_frequency = base_frequency + (gradient_factor)
-                phase_angle = precession_frequency * TAU
-
-                if 6 <= row <= 7:
-                    line.rotate(90 * DEGREES)
-                else:
-                    line.rotate(initial_angle)
-                line.rotate(phase_angle, axis=UP)
-
-                spin_group = VGroup(spin_circle, line)
-                spin_group.move_to([x, y, 0])
-                self.add(spin_group)
+        # Same excitation as SliceSelectionAnimation, including the rephasing lobe
+        z_0_index = num_rows // 2 - 0.5
+        excitation = SliceSelection(slice_thickness=2, slice_center=z_0_index)
+        trajectory = simulate(spin_field.rows, excitation.b1, excitation.gradient, excitation.dt)
+        rf_end_time = excitation.num_rf_samples * excitation.dt
 
-                all_spins.append(spin_group)
-                spin_positions.append([row, col, x, y, spin_group, gradient_factor])
+        # Create all spins, with the position-dependent phase left behind by the slice gradient
+        spin_dots = SpinDots(spin_field, radius=0.1, color=WHITE)
+        spin_vectors = MagnetizationVectors(trajectory.at(rf_end_time), spin_field.positions, color=LIGHT_GREEN)
+        spin_vectors.set_magnetization(trajectory.at(rf_end_time), phase_offset)
+        self.add(spin_dots, spin_vectors)
 
         # Start with a gradient arrow showing the dephasing that has already occurred
         gradient_arrow = Arrow(start=np.array([4, -3, 0]), end=np.array([4, 3, 0]), buff=0.1, color=LIGHT_BLUE)
@@ -598,27 +513,14 @@ class SliceSelectionRephasingAnimation(Scene):
             run_time=0.5
         )
 
-        # Create animations for rephasing
-        rephasing_anims = []
-
-        for row, col, x, y, spin_group, gradient_factor in spin_positions:
-            arrow = spin_group[1]
-
-            # Reverse rotation - faster spins now rotate slower and vice versa to catch up
-            rephasing_frequency = base_frequency - (gradient_factor * 0.5)
-            rotation_angle = rephasing_frequency * TAU
-
-            anim = Rotate(
-                arrow,
-                angle=rotation_angle * spin_speed_up_factor,
-                axis=UP,
-                about_point=spin_group.get_center(),
-                rate_func=linear,
-                run_time=rephasing_animation_duration
-            )
-            rephasing_anims.append(anim)
-
-        self.play(*rephasing_anims)
+        # Reverse gradient - spins that ran ahead now fall back and vice versa to catch up
+        self.play(PlayBlochTrajectory(
+            spin_vectors,
+            trajectory,
+            start_time=rf_end_time,
+            phase_offset=phase_offset,
+            run_time=rephasing_animation_duration
+        ))
 
         # self.wait(2)
 
@@ -631,6 +533,142 @@ class SliceSelectionRephasingAnimation(Scene):
         self.wait(4)
 
 
+class SpinEchoDephasing(Scene):
+    num_isochromats = 50_000
+
+    def construct(self):
+        self.camera.frame_width = 16
+        self.camera.frame_height = 9
+
+        # Times are in units of T2' so the echo lands at a round number
+        echo_time = 8
+        end_time = 12
+        seconds_per_unit = 0.75
+
+        ensemble = IsochromatEnsemble(self.num_isochromats, t2=8.0, t2_prime=1.0)
+
+        # Transverse plane in the rotating frame, with the phase histogram as a ring around it
+        plane_center = LEFT * 4.5
+        plane_radius = 2
+        num_bins = 48
+
+        plane = Circle(radius=plane_radius, color=WHITE, stroke_width=2).move_to(plane_center)
+        x_axis = Line(plane_center + LEFT * plane_radius, plane_center + RIGHT * plane_radius, color=GRAY, stroke_width=2)
+        y_axis = Line(plane_center + DOWN * plane_radius, plane_center + UP * plane_radius, color=GRAY, stroke_width=2)
+        x_label = MathTex("x'", color=GRAY).scale(0.7).next_to(x_axis, RIGHT, buff=1.4)
+        y_label = MathTex("y'", color=GRAY).scale(0.7).next_to(y_axis, UP, buff=1.4)
+        self.add(plane, x_axis, y_axis, x_label, y_label)
+
+        histogram = PhaseHistogram(
+            num_bins=num_bins,
+            inner_radius=plane_radius + 0.1,
+            max_length=1.2,
+            fill_color=LIGHT_BLUE,
+            fill_opacity=0.8,
+            stroke_width=0
+        )
+        histogram.shift(plane_center)
+        histogram.set_fractions(ensemble.phase_histogram(num_bins))
+        self.add(histogram)
+
+        def net_vector_arrow():
+            net = ensemble.net_magnetization()
+            end = plane_center + plane_radius * np.array([net.real, net.imag, 0])
+            if np.linalg.norm(end - plane_center) < 1e-3:
+                end = plane_center + RIGHT * 1e-3
+            return Arrow(plane_center, end, buff=0, color=LIGHT_GREEN, stroke_width=6)
+
+        net_arrow = net_vector_arrow()
+        self.add(net_arrow)
+
+        count_label = Tex(f"{len(ensemble):,} isochromats", color=WHITE).scale(0.6)
+        count_label.next_to(plane, DOWN, buff=1.5)
+        self.add(count_label)
+
+        # Signal magnitude against time, with the T2* and T2 envelopes it moves between
+        signal_axes = Axes(
+            x_range=[0, end_time, 1],
+            y_range=[0, 1, 0.5],
+            x_length=7,
+            y_length=4,
+            tips=False,
+            axis_config={"color": WHITE, "include_ticks": False},
+        )
+        signal_axes.move_to(RIGHT * 3.8)
+        time_label = MathTex("t", color=WHITE).scale(0.7).next_to(signal_axes.x_axis, RIGHT, buff=0.2)
+        signal_label = MathTex("|M_{xy}|", color=WHITE).scale(0.7).next_to(signal_axes.y_axis, UP, buff=0.2)
+        self.add(signal_axes, time_label, signal_label)
+
+        t2_star_curve = DashedVMobject(signal_axes.plot(
+            lambda t: np.exp(-t / ensemble.t2_star), x_range=[0, echo_time / 2, 0.05], color=PINK, stroke_width=2
+        ))
+        t2_curve = DashedVMobject(signal_axes.plot(
+            lambda t: np.exp(-t / ensemble.t2), x_range=[0, end_time, 0.05], color=YELLOW, stroke_width=2
+        ))
+        t2_star_label = MathTex("T_2^*", color=PINK).scale(0.6).next_to(signal_axes.c2p(1.2, 0.35), UR, buff=0.1)
+        t2_label = MathTex("T_2", color=YELLOW).scale(0.6).next_to(signal_axes.c2p(end_time, np.exp(-end_time / ensemble.t2)), UP, buff=0.15)
+        self.add(t2_star_curve, t2_curve, t2_star_label, t2_label)
+
+        def pulse_marker(time, label):
+            marker = DashedLine(signal_axes.c2p(time, 0), signal_axes.c2p(time, 1), color=GRAY, stroke_width=2)
+            text = MathTex(label, color=GRAY).scale(0.6).next_to(marker, UP, buff=0.15)
+            return VGroup(marker, text)
+
+        excitation_marker = pulse_marker(0, r"90^\circ")
+        refocusing_marker = pulse_marker(echo_time / 2, r"180^\circ")
+        echo_marker = pulse_marker(echo_time, r"\text{TE}")
+        self.add(excitation_marker)
+
+        signal_trace = SignalTrace(signal_axes, num_samples=2000, color=LIGHT_GREEN, stroke_width=4)
+        signal_trace.append_sample(0, abs(ensemble.net_magnetization()))
+        self.add(signal_trace)
+
+        time_tracker = ValueTracker(0)
+
+        def follow_ensemble(mobject):
+            # Per-frame cost is the ensemble update; the drawing is a fixed handful of mobjects
+            dt = time_tracker.get_value() - ensemble.time
+            if dt <= 1e-9:
+                return
+            ensemble.evolve(dt)
+            histogram.set_fractions(ensemble.phase_histogram(num_bins))
+            net_arrow.become(net_vector_arrow())
+            signal_trace.append_sample(ensemble.time, abs(ensemble.net_magnetization()))
+
+        histogram.add_updater(follow_ensemble)
+
+        self.wait(1)
+
+        # Free induction decay: the isochromats fan out and the net vector shrinks
+        self.play(
+            time_tracker.animate.set_value(echo_time / 2),
+            run_time=echo_time / 2 * seconds_per_unit,
+            rate_func=linear
+        )
+
+        # The 180° pulse mirrors every phase, so the fastest isochromats now trail the rest
+        ensemble.refocus()
+        histogram.set_fractions(ensemble.phase_histogram(num_bins))
+        net_arrow.become(net_vector_arrow())
+        self.play(FadeIn(refocusing_marker), Flash(plane_center, color=RED, flash_radius=plane_radius + 1.4), run_time=1)
+
+        # They catch up at TE, then fan out again
+        self.play(
+            time_tracker.animate.set_value(echo_time),
+            run_time=echo_time / 2 * seconds_per_unit,
+            rate_func=linear
+        )
+        self.play(FadeIn(echo_marker), run_time=0.5)
+        self.play(
+            time_tracker.animate.set_value(end_time),
+            run_time=(end_time - echo_time) * seconds_per_unit,
+            rate_func=linear
+        )
+
+        histogram.remove_updater(follow_ensemble)
+        self.wait(2)
+
+
 class SpinSignalEquations(Scene):
     def construct(self):
         self.camera.frame_width = 16
@@ -671,9 +709,11 @@ class FrequencyEncoding(Scene):
         self.camera.frame_width = 16
         self.camera.frame_height = 9
 
+        # Leave the right half of the frame for the received signal
         brain_image = ImageMobject("assets/brain-axial")
         brain_image.rotate(90 * DEGREES)
-        brain_image.scale_to_fit_height(7)
+        brain_image.scale_to_fit_height(6)
+        brain_image.move_to(LEFT * 3.8)
         self.add(brain_image)
 
         brain_overlay = Rectangle(
@@ -686,15 +726,6 @@ class FrequencyEncoding(Scene):
         brain_overlay.move_to(brain_image.get_center())
         self.add(brain_overlay)
 
-        def is_within_brain(x, y):
-            rel_x = x - brain_center[0]
-            rel_y = y - brain_center[1]
-
-            norm_x = rel_x / (brain_width / 2)
-            norm_y = rel_y / (brain_height / 2)
-
-            return (norm_x ** 2 / 0.9 ** 2 + norm_y ** 2 / 0.7 ** 2) < 1
-
         num_rows = 5
         num_cols = 15
 
@@ -705,45 +736,22 @@ class FrequencyEncoding(Scene):
         animation_speed_up_factor = 1.5
 
         brain_center = brain_image.get_center()
-        brain_width = brain_image.width
-        brain_height = brain_image.height
-
-        all_spins = []
-        spin_positions = []
-        base_spin_anims = []
-
-        for row in range(num_rows):
-            for col in range(num_cols):
-                x = (col - (num_cols - 1) / 2) * 0.8 + brain_center[0]
-                y = (row - (num_rows - 1) / 2) * 0.8 + brain_center[1]
-
-                if not is_within_brain(x, y):
-                    continue
-
-                spin_circle = Circle(radius=0.1, color=WHITE, fill_opacity=1)
-
-                arrow = Line([0, -0.25, 0], [0, 0.25, 0], color=LIGHT_GREEN, stroke_width=5)
-                arrow_tip = ArrowTriangleFilledTip(color=LIGHT_GREEN).scale(0.5)
-                arrow.add_tip(tip=arrow_tip, at_start=False, tip_length=0.1)
-
-                spin_group = VGroup(spin_circle, arrow)
-                spin_group.move_to([x, y, 0])
-                self.add(spin_group)
-                all_spins.append(spin_group)
-                spin_positions.append([row, col, x, y, spin_group])
-
-                anim = Rotate(
-                    arrow,
-                    angle=base_frequency * TAU * animation_speed_up_factor,
-                    axis=OUT,
-                    about_point=spin_group.get_center(),
-                    rate_func=linear,
-                    run_time=spin_duration
-                )
-                arrow.rotate(base_frequency * TAU * animation_speed_up_factor, axis=OUT, about_point=spin_group.get_center())
-                base_spin_anims.append(anim)
-
-        # self.play(*base_spin_anims)
+        spacing = 0.8 * brain_image.height / 7
+
+        is_within_brain = BrainMask.load("assets/brain-axial", quarter_turns=1).for_image(brain_image)
+        spin_field = SpinField.from_grid(num_rows, num_cols, center=brain_center, spacing=spacing,
+                                         mask=is_within_brain)
+
+        spin_dots = SpinDots(spin_field, radius=0.1, color=WHITE, fill_opacity=1)
+        spin_arrows = SpinArrows(spin_field, color=LIGHT_GREEN)
+        self.add(spin_dots, spin_arrows)
+
+        base_spin_angles = spin_field.phase_increment(animation_speed_up_factor, base_frequency)
+        base_spin_anim = EvolveSpinField(spin_arrows, base_spin_angles, run_time=spin_duration)
+        spin_field.phase += base_spin_angles
+        spin_arrows.update_from_field()
+
+        # self.play(base_spin_anim)
 
         # Gradient Application
         gradient_arrow = Arrow(start=np.array([-4, -3, 0]), end=np.array([4, -3, 0]), buff=0.1, color=LIGHT_BLUE)
@@ -754,37 +762,98 @@ class FrequencyEncoding(Scene):
         # self.play(Create(gradient_arrow), Write(gradient_label), run_time=0.5)
         self.add(gradient_arrow, gradient_label)
 
-        frequency_anims = []
-
-        for row, col, x, y, spin_group in spin_positions:
-            arrow = spin_group[1]
+        # Frequency increases with column under the readout gradient
+        spin_field.frequency = base_frequency + gradient_strength * spin_field.cols
+        frequency_angles = spin_field.phase_increment(0.5)
 
-            gradient_factor = (col - (num_cols - 1) / 2) / ((num_cols - 1) / 2)
-            frequency = base_frequency + gradient_strength * col
-            rotation_angle = frequency * TAU
-
-            anim = Rotate(
-                arrow,
-                angle=rotation_angle / 2,
-                axis=OUT,
-                about_point=spin_group.get_center(),
-                rate_func=linear,
-                run_time=gradient_duration
-            )
-            arrow.rotate(rotation_angle / 2, axis=OUT, about_point=spin_group.get_center())
-            frequency_anims.append(anim)
+        frequency_anim = EvolveSpinField(spin_arrows, frequency_angles, run_time=gradient_duration)
+        spin_field.phase += frequency_angles
+        spin_arrows.update_from_field()
 
         omega_small = MathTex(r"\downarrow \omega", color=PINK, font_size=36)
         omega_large = MathTex(r"\uparrow \omega", color=PINK, font_size=60)
 
-        omega_small.next_to(brain_image, LEFT, buff=0.5)
-        omega_large.next_to(brain_image, RIGHT, buff=0.5)
+        omega_small.next_to(brain_image, LEFT, buff=0.3)
+        omega_large.next_to(brain_image, RIGHT, buff=0.3)
         # self.play(Write(omega_small), Write(omega_large))
         self.add(omega_small, omega_large)
 
-        # self.play(*frequency_anims)
+        # self.play(frequency_anim)
         # self.wait(4)
 
+        # === Received signal panel ===
+        readout_duration = 6  # on-screen seconds
+        readout_time = 2  # simulated readout length
+        num_samples = int(readout_duration * config.frame_rate)
+        sample_interval = readout_time / num_samples
+        num_spins = len(spin_field)
+
+        signal_axes = Axes(
+            x_range=[0, readout_time, 0.5],
+            y_range=[-num_spins, num_spins, num_spins / 2],
+            x_length=6.5,
+            y_length=2.5,
+            axis_config={"include_tip": False, "include_numbers": False}
+        )
+        signal_axes.move_to(RIGHT * 4.25 + UP * 2)
+        signal_label = MathTex("s(t)", color=LIGHT_BLUE).next_to(signal_axes, LEFT, buff=0.2)
+
+        projection_axes = Axes(
+            x_range=[-8, 8, 1],
+            y_range=[0, 1, 0.5],
+            x_length=6.5,
+            y_length=2.5,
+            axis_config={"include_tip": False, "include_numbers": False}
+        )
+        projection_axes.move_to(RIGHT * 4.25 + DOWN * 2)
+        projection_label = Tex("Projection", color=LIGHT_GREEN).scale(0.6)
+        projection_label.next_to(projection_axes, UP, buff=0.2)
+        x_label = MathTex("x", color=LIGHT_GREEN).next_to(projection_axes.x_axis, DOWN, buff=0.2)
+
+        self.play(Create(signal_axes), Write(signal_label), run_time=1)
+
+        # Readout in the rotating frame of the center column. The prephasing lobe has wound the
+        # spins back by half the readout, so they realign into an echo at its midpoint.
+        spin_field.frequency = gradient_strength * (spin_field.cols - (num_cols - 1) / 2)
+        spin_field.phase = -spin_field.phase_increment(readout_time / 2)
+        spin_arrows.update_from_field()
+
+        recorder = SignalRecorder(num_samples, sample_interval)
+        signal_trace = SignalTrace(signal_axes, num_samples, color=LIGHT_BLUE, stroke_width=3)
+        self.add(signal_trace)
+
+        def record_sample(trace):
+            # One vectorized sum over the spins and one appended segment per frame
+            sample = recorder.record(spin_field)
+            trace.append_sample((len(recorder) - 1) * sample_interval, sample.real)
+
+        signal_trace.add_updater(record_sample)
+        self.play(
+            EvolveSpinField(spin_arrows, spin_field.phase_increment(readout_time)),
+            run_time=readout_duration
+        )
+        signal_trace.remove_updater(record_sample)
+
+        # The FFT of the collected samples is the projection of the object along x,
+        # with frequency mapped back to a column offset through the gradient strength
+        frequencies = recorder.frequencies() / gradient_strength
+        projection = recorder.projection()
+        visible = np.abs(frequencies) <= 8
+
+        projection_curve = VMobject(color=LIGHT_GREEN, stroke_width=3)
+        projection_curve.set_points_as_corners(
+            coords_to_points(projection_axes, frequencies[visible], projection[visible] / projection.max())
+        )
+
+        self.play(
+            Create(projection_axes),
+            Write(projection_label),
+            Write(x_label),
+            run_time=1
+        )
+        self.play(Create(projection_curve), run_time=2)
+        self.wait(3)
+
 
 class PhaseEncoding(Scene):
     def construct(self):
@@ -807,17 +876,8 @@ class PhaseEncoding(Scene):
         self.add(brain_overlay)
 
         brain_center = brain_image.get_center()
-        brain_width = brain_image.width
-        brain_height = brain_image.height
-
-        def is_within_brain(x, y):
-            rel_x = x - brain_center[0]
-            rel_y = y - brain_center[1]
-
-            norm_x = rel_x / (brain_width / 2)
-            norm_y = rel_y / (brain_height / 2)
 
-            return (norm_x ** 2 / 0.9 ** 2 + norm_y ** 2 / 0.7 ** 2) < 1
+        is_within_brain = BrainMask.load("assets/brain-axial", quarter_turns=1).for_image(brain_image)
 
         num_rows = 5
         num_cols = 15
@@ -828,42 +888,17 @@ class PhaseEncoding(Scene):
         gradient_duration = 3
         spin_speed_factor = 2
 
-        all_spins = []
-        spin_positions = []
-        base_spin_anims = []
+        spin_field = SpinField.from_grid(num_rows, num_cols, center=brain_center, spacing=0.8, mask=is_within_brain)
+        spin_dots = SpinDots(spin_field, radius=0.1, color=WHITE, fill_opacity=1)
+        spin_arrows = SpinArrows(spin_field, color=LIGHT_GREEN)
+        self.add(spin_dots, spin_arrows)
 
-        for row in range(num_rows):
-            for col in range(num_cols):
-                x = (col - (num_cols - 1) / 2) * 0.8 + brain_center[0]
-                y = (row - (num_rows - 1) / 2) * 0.8 + brain_center[1]
+        base_spin_angles = spin_field.phase_increment(spin_speed_factor, base_frequency)
+        base_spin_anim = EvolveSpinField(spin_arrows, base_spin_angles, run_time=spin_duration)
+        spin_field.phase += base_spin_angles
+        spin_arrows.update_from_field()
 
-                if not is_within_brain(x, y):
-                    continue
-
-                spin_circle = Circle(radius=0.1, color=WHITE, fill_opacity=1)
-
-                arrow = Line([0, -0.25, 0], [0, 0.25, 0], color=LIGHT_GREEN, stroke_width=5)
-                arrow_tip = ArrowTriangleFilledTip(color=LIGHT_GREEN).scale(0.5)
-                arrow.add_tip(tip=arrow_tip, at_start=False, tip_length=0.1)
-
-                spin_group = VGroup(spin_circle, arrow)
-                spin_group.move_to([x, y, 0])
-                self.add(spin_group)
-                all_spins.append(spin_group)
-                spin_positions.append([row, col, x, y, spin_group])
-
-                anim = Rotate(
-                    arrow,
-                    angle=base_frequency * TAU * spin_speed_factor,
-                    axis=OUT,
-                    about_point=spin_group.get_center(),
-                    rate_func=linear,
-                    run_time=spin_duration
-                )
-                base_spin_anims.append(anim)
-                arrow.rotate(base_frequency * TAU * spin_speed_factor, axis=OUT, about_point=spin_group.get_center())
-
-        # self.play(*base_spin_anims)
+        # self.play(base_spin_anim)
 
         # Gradient Application
         gradient_arrow = Arrow(start=np.array([0, -3, 0]), end=np.array([0, 3, 0]), buff=0.1, color=LIGHT_BLUE)
@@ -874,49 +909,27 @@ class PhaseEncoding(Scene):
         # self.play(Create(gradient_arrow), Write(gradient_label), run_time=0.5)
         self.add(gradient_arrow, gradient_label)
 
-        frequency_anims = []
+        spin_field.set_gradient("row", gradient_strength, base_frequency=base_frequency, offset=0.5)
+        frequency_angles = spin_field.phase_increment(1)
 
-        for row, col, x, y, spin_group in spin_positions:
-            arrow = spin_group[1]
+        frequency_anim = EvolveSpinField(spin_arrows, frequency_angles, run_time=gradient_duration)
+        spin_field.phase += frequency_angles
+        spin_arrows.update_from_field()
 
-            gradient_factor = (row - (num_rows - 1) / 2) / ((num_rows - 1) / 2) + 0.5
-            frequency = base_frequency + gradient_strength * gradient_factor
-            rotation_angle = frequency * TAU
-
-            anim = Rotate(
-                arrow,
-                angle=rotation_angle,
-                axis=OUT,
-                about_point=spin_group.get_center(),
-                rate_func=linear,
-                run_time=gradient_duration
-            )
-            frequency_anims.append(anim)
-            arrow.rotate(rotation_angle, axis=OUT, about_point=spin_group.get_center())
-
-        # self.play(*frequency_anims)
+        # self.play(frequency_anim)
 
         # stop gradient
         # self.play(FadeOut(gradient_arrow), FadeOut(gradient_label))
         self.remove(gradient_arrow, gradient_label)
 
         # all spins precess at the same rate
-        all_frequency_anims = []
-        for row, col, x, y, spin_group in spin_positions:
-            arrow = spin_group[1]
-
-            anim = Rotate(
-                arrow,
-                angle=base_frequency * 0.875 * TAU * spin_speed_factor,
-                axis=OUT,
-                about_point=spin_group.get_center(),
-                rate_func=linear,
-                run_time=spin_duration
-            )
-            all_frequency_anims.append(anim)
-            arrow.rotate(base_frequency * 0.875 * TAU * spin_speed_factor, axis=OUT, about_point=spin_group.get_center())
+        free_precession_angles = spin_field.phase_increment(spin_speed_factor, base_frequency * 0.875)
 
-        # self.play(*all_frequency_anims)
+        all_frequency_anim = EvolveSpinField(spin_arrows, free_precession_angles, run_time=spin_duration)
+        spin_field.phase += free_precession_angles
+        spin_arrows.update_from_field()
+
+        # self.play(all_frequency_anim)
 
         # self.wait(0.5)
 
@@ -924,52 +937,16 @@ class PhaseEncoding(Scene):
         LEFT_COLOR = YELLOW
         RIGHT_COLOR = BLUE
 
-        color_change_anims = []
-
-        # First determine arrow directions
-        for spin_group in all_spins:
-            arrow = spin_group[1]
+        # Arrows pointing rightward (positive x-component) get RIGHT_COLOR, the rest LEFT_COLOR
+        left_right_colors = PhaseColormap.left_right(LEFT_COLOR, RIGHT_COLOR)
 
-            # Get the start and end points of the arrow (in global coordinates)
-            start_point = arrow.get_start()
-            end_point = arrow.get_end()
+        color_change_anim = RecolorSpinArrows(spin_arrows, left_right_colors, run_time=0.75)
+        spin_arrows.set_colormap(left_right_colors)
 
-            # Calculate the direction vector
-            direction_vector = np.array(end_point) - np.array(start_point)
-
-            # Check if the arrow is pointing more left or more right
-            # If x-component is positive, it's pointing rightward
-            is_pointing_right = direction_vector[0] > 0
-
-            new_color = RIGHT_COLOR if is_pointing_right else LEFT_COLOR
-
-            # Create animation to change color
-            color_change = ApplyMethod(
-                arrow.set_color,
-                new_color,
-                run_time=0.75
-            )
-
-            # Also change the arrow tip color
-            for submob in arrow.submobjects:
-                if isinstance(submob, ArrowTriangleFilledTip):
-                    tip_color_change = ApplyMethod(
-                        submob.set_color,
-                        new_color,
-                        run_time=0.75
-                    )
-                    color_change_anims.append(tip_color_change)
-
-            color_change_anims.append(color_change)
-            arrow.set_color(new_color)
-            arrow_tip.set_color(new_color)
-
-        # Play all color change animations simultaneously
-        # self.play(*color_change_anims)
+        # Play the color change for all arrows at once
+        # self.play(color_change_anim)
 
         # Now add more rows of spins in between the existing rows
-        additional_spins = []
-        create_anims = []
 
         # Create in-between rows (4 additional rows between each original row)
         subrows_per_row = 2
@@ -977,75 +954,33 @@ class PhaseEncoding(Scene):
 
         small_spin_scale = 0.75  # Smaller size for the additional spins
 
-        # Keeping track of phase across all rows for spatial frequency pattern
-        all_row_positions = []
-        for row in range(num_interleaved_rows):
-            # Calculate the original row number (floating point)
-            orig_row = row / (subrows_per_row + 1)
-            all_row_positions.append(orig_row)
-
-            # Skip if this was an original row
-            if row % (subrows_per_row + 1) == 0:
-                continue
-
-            for col in range(num_cols):
-                x = (col - (num_cols - 1) / 2) * 0.8 + brain_center[0]
-                # Calculate y position for the in-between row
-                base_row_spacing = 0.8
-                y = (orig_row - (num_rows - 1) / 2) * base_row_spacing + brain_center[1]
-
-                if not is_within_brain(x, y):
-                    continue
+        # Calculate the original row number (floating point), skipping the original rows
+        interleaved_rows = np.arange(num_interleaved_rows)
+        interleaved_rows = interleaved_rows[interleaved_rows % (subrows_per_row + 1) != 0] / (subrows_per_row + 1)
 
-                # Create smaller spin
-                spin_circle = Circle(radius=0.08 * small_spin_scale, color=WHITE, fill_opacity=1)
+        interleaved_field = SpinField.from_grid(num_rows, num_cols, center=brain_center, spacing=0.8,
+                                                mask=is_within_brain, row_values=interleaved_rows)
 
-                # Calculate the appropriate phase for this row based on spatial frequency of 2.5
-                # Normalize row position from 0 to 1
-                norm_row_pos = (orig_row - 0) / (num_rows - 1)
-                # Complete 2.5 cycles over the entire height
-                phase_angle = - (2 * TAU * norm_row_pos - PI / 2)
+        # Phase for each row based on a spatial frequency of 2 cycles over the entire height
+        norm_row_pos = interleaved_field.rows / (num_rows - 1)
+        interleaved_field.phase = -(2 * TAU * norm_row_pos - PI / 2)
 
-                arrow = Line([0, -0.25 * small_spin_scale, 0],
-                             [0, 0.25 * small_spin_scale, 0],
-                             stroke_width=4 * small_spin_scale)
-
-                arrow_tip = ArrowTriangleFilledTip().scale(0.5 * small_spin_scale)
-                arrow.add_tip(tip=arrow_tip, at_start=False, tip_length=0.1 * small_spin_scale)
-
-                # Rotate the arrow to match the phase
-                arrow.rotate(phase_angle, axis=OUT)
-
-                # Get the start and end points of the arrow (in global coordinates)
-                start_point = arrow.get_start()
-                end_point = arrow.get_end()
-
-                # Calculate the direction vector
-                direction_vector = np.array(end_point) - np.array(start_point)
-
-                # Calculate the angle in the X-Y plane (in radians)
-                angle = np.arctan2(direction_vector[0], direction_vector[1])
-
-                # Normalize the angle to be between 0 and 1 for color interpolation
-                # Map -π to π range to 0 to 1 range
-                normalized_angle = (angle + np.pi) / (2 * np.pi)
-
-                # Create a color gradient between LEFT_COLOR and RIGHT_COLOR based on the angle
-                # Using color_gradient to get a smooth transition
-                arrow_color = interpolate_color(LEFT_COLOR, RIGHT_COLOR, normalized_angle)
-
-                arrow.set_color(arrow_color)
-                arrow_tip.set_color(arrow_color)
-
-                spin_group = VGroup(spin_circle, arrow)
-                spin_group.move_to([x, y, 0])
+        # Create smaller spins, colored on a gradient between LEFT_COLOR and RIGHT_COLOR by their angle
+        additional_dots = SpinDots(interleaved_field, radius=0.08 * small_spin_scale, color=WHITE, fill_opacity=1)
+        additional_arrows = SpinArrows(
+            interleaved_field,
+            length=0.5 * small_spin_scale,
+            tip_length=0.1 * small_spin_scale,
+            stroke_width=4 * small_spin_scale,
+            colormap=PhaseColormap.linear(LEFT_COLOR, RIGHT_COLOR)
+        )
+        additional_spins = VGroup(additional_dots, additional_arrows)
 
-                additional_spins.append(spin_group)
-                create_anims.append(FadeIn(spin_group, scale=1.2))
-                self.add(spin_group)
+        create_anim = FadeIn(additional_spins, scale=1.2)
+        self.add(additional_spins)
 
         # Create animation to display additional spins
-        # self.play(*create_anims, run_time=1.5)
+        # self.play(create_anim, run_time=1.5)
 
 
         # Add a label for spatial frequency
@@ -1085,6 +1020,115 @@ class PhaseEncoding(Scene):
         print(f"Final frame saved as: {png_path}")
 
 
+class PhaseEncodingTable(Scene):
+    # 64, 128 or 256 phase-encode steps
+    num_phase_steps = 128
+    steps_per_second = 16
+    # "arrows" draws every spin; "raster" paints phase into one image and stays cheap on much denser grids
+    render_mode = "arrows"
+
+    def construct(self):
+        self.camera.frame_width = 16
+        self.camera.frame_height = 9
+
+        brain_image = ImageMobject("assets/brain-axial")
+        brain_image.rotate(90 * DEGREES)
+        brain_image.scale_to_fit_height(7)
+        brain_image.shift(LEFT * 2)
+        self.add(brain_image)
+
+        brain_overlay = Rectangle(
+            width=brain_image.width,
+            height=brain_image.height,
+            fill_color=BLACK,
+            fill_opacity=0.4,
+            stroke_opacity=0
+        )
+        brain_overlay.move_to(brain_image.get_center())
+        self.add(brain_overlay)
+
+        brain_center = brain_image.get_center()
+        fov = brain_image.height
+
+        # A denser grid than PhaseEncoding so higher spatial frequencies stay visible. The highest
+        # step winds num_steps / 2 cycles across the FOV, so at least num_steps rows avoid aliasing
+        preferred_spacing = 0.2 if self.render_mode == "arrows" else 0.04
+        num_rows = max(int(fov / preferred_spacing), self.num_phase_steps)
+        spacing = fov / num_rows
+        num_cols = int(brain_image.width / spacing)
+
+        is_within_brain = BrainMask.load("assets/brain-axial", quarter_turns=1).for_image(brain_image)
+        spin_field = SpinField.from_grid(num_rows, num_cols, center=brain_center, spacing=spacing, mask=is_within_brain)
+
+        # Phase of every spin at every step, computed once
+        num_steps = self.num_phase_steps
+        phase_table = phase_encode_table(spin_field.positions[:, 1] - brain_center[1], num_steps, fov)
+        k_y_steps = phase_encode_steps(num_steps)
+
+        phase_colors = PhaseColormap.cyclic([YELLOW, PINK, BLUE, LIGHT_GREEN])
+        if self.render_mode == "raster":
+            spin_display = SpinRaster(spin_field, spacing, colormap=phase_colors)
+        else:
+            # Arrows shrink with the grid so neighbours never overlap
+            arrow_scale = spacing / 0.2
+            spin_display = SpinArrows(spin_field, length=0.16 * arrow_scale, tip_length=0.05 * arrow_scale,
+                                      stroke_width=max(2 * arrow_scale, 0.5), colormap=phase_colors)
+        self.add(spin_display)
+
+        # Preview of the stripe pattern each step encodes, at full resolution
+        preview_height = 2 * num_steps
+        preview_table = phase_encode_preview(num_steps, preview_height)
+
+        preview_pixels = np.full((preview_height, preview_height, 4), 255, dtype=np.uint8)
+        preview = ImageMobject(preview_pixels)
+        preview.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        preview.height = 3.5
+        preview.next_to(brain_image, RIGHT, buff=0.75).shift(UP)
+
+        preview_frame = SurroundingRectangle(preview, color=LIGHT_BLUE, buff=0)
+        preview_title = Tex("Encoded pattern", color=LIGHT_BLUE).scale(0.6)
+        preview_title.next_to(preview_frame, UP, buff=0.2)
+        self.add(preview, preview_frame, preview_title)
+
+        step_label = MathTex("k_y =", color=PINK).scale(0.9)
+        step_value = Integer(k_y_steps[0], color=PINK).scale(0.9)
+        step_readout = VGroup(step_label, step_value).arrange(RIGHT, buff=0.2)
+        step_readout.next_to(preview_frame, DOWN, buff=0.4)
+        self.add(step_readout)
+
+        count_label = Tex(f"{num_steps} phase-encode steps", color=WHITE).scale(0.6)
+        count_label.next_to(step_readout, DOWN, buff=0.3)
+        self.add(count_label)
+
+        step_tracker = ValueTracker(0)
+        shown_step = [None]
+
+        def show_current_step(mobject):
+            # Only redraw when the step changes: a row lookup plus in-place writes
+            step = min(int(step_tracker.get_value()), num_steps - 1)
+            if step == shown_step[0]:
+                return
+            shown_step[0] = step
+
+            spin_field.phase[:] = phase_table[step]
+            spin_display.update_from_field()
+            preview.pixel_array[:, :, :3] = preview_table[step][:, None, None]
+            step_value.set_value(k_y_steps[step])
+
+        show_current_step(spin_display)
+        spin_display.add_updater(show_current_step)
+
+        self.wait(1)
+        self.play(
+            step_tracker.animate.set_value(num_steps),
+            run_time=num_steps / self.steps_per_second,
+            rate_func=linear
+        )
+        self.wait(1)
+
+        spin_display.remove_updater(show_current_step)
+
+
 class PhiDefinition(Scene):
     def construct(self):
         self.camera.frame_width = 16
@@ -1182,6 +1226,51 @@ class TotalSignalEquation(Scene):
         equation[7].set_color(PINK)
 
         self.add(equation)
+        self.wait(2)
+
+        # === The equation evaluated for a gradient-echo readout of the phantom ===
+        resolution = 128
+        image = np.array(shepp_logan(resolution))
+        # One extra sample because the trapezoid spends a step turning the gradient around
+        prephase_samples = resolution // 2 + 1
+        gx = np.concatenate([-np.ones(prephase_samples), np.ones(resolution)])
+        gy = np.zeros_like(gx)
+        times = np.arange(len(gx))
+        kx, ky = kspace_from_gradients(gx, gy, dt=1)
+
+        # Samples on the Cartesian grid come from one FFT, anything else from direct summation
+        signal_magnitude = np.abs(signal(image, kx, ky))
+        signal_magnitude /= signal_magnitude.max()
+
+        gradient_axes = Axes(
+            x_range=[0, len(gx), 16],
+            y_range=[-1.2, 1.2, 1],
+            x_length=11,
+            y_length=1.4,
+            tips=False,
+            axis_config={"include_ticks": False},
+        )
+        signal_axes = Axes(
+            x_range=[0, len(gx), 16],
+            y_range=[0, 1, 0.5],
+            x_length=11,
+            y_length=2.4,
+            tips=False,
+            axis_config={"include_ticks": False},
+        )
+        plots = VGroup(gradient_axes, signal_axes).arrange(DOWN, buff=0.6).to_edge(DOWN, buff=0.5).shift(RIGHT * 0.6)
+        gradient_label = MathTex("G_x", color=LIGHT_BLUE).scale(0.8).next_to(gradient_axes, LEFT, buff=0.3)
+        signal_label = MathTex("|s(t)|", color=LIGHT_GREEN).scale(0.8).next_to(signal_axes, LEFT, buff=0.3)
+
+        gradient_curve = VMobject(stroke_color=LIGHT_BLUE, stroke_width=3)
+        gradient_curve.set_points_as_corners(coords_to_points(gradient_axes, times, gx))
+        signal_curve = VMobject(stroke_color=LIGHT_GREEN, stroke_width=3)
+        signal_curve.set_points_as_corners(coords_to_points(signal_axes, times, signal_magnitude))
+
+        self.play(equation.animate.scale(0.7).to_edge(UP, buff=0.4))
+        self.play(FadeIn(plots), FadeIn(gradient_label), FadeIn(signal_label))
+        self.play(Create(gradient_curve), Create(signal_curve), run_time=3, rate_func=linear)
+        self.wait(2)
 
 
 class ImageToKSpace(Scene):
@@ -1194,8 +1283,9 @@ class ImageToKSpace(Scene):
         brain_img = ImageMobject("assets/brain-axial.png").scale(1.15)
         brain_img.rotate(90 * DEGREES)
 
-        # Ensure the k-space image is properly created
-        k_space_img = ImageMobject("assets/spectrum.png").scale(1.15)
+        # k-space of the brain image as displayed, computed once and cached on disk
+        k_space_img = ImageMobject(kspace_pixels("assets/brain-axial.png", quarter_turns=1))
+        k_space_img.scale_to_fit_height(brain_img.height)
 
         # Position the images with more separation (left and right sides)
         image_title = Text("Image Space", color=PINK).scale(0.8)
@@ -1385,6 +1475,157 @@ class ImageToKSpace(Scene):
         self.wait(3)  # Extended final pause
 
 
+class KSpaceFill(Scene):
+    resolution = 256
+    # "linear", "centric" or "random" line order
+    sampling = "linear"
+    lines_per_second = 32
+    # An asset image, or "phantom" for the analytic Shepp–Logan phantom at any resolution
+    source = "assets/brain-axial.png"
+
+    def construct(self):
+        self.camera.frame_width = 16
+        self.camera.frame_height = 9
+
+        if self.source == "phantom":
+            kspace = shepp_logan_kspace(self.resolution)
+            kspace_picture = apply_lookup_table(log_magnitude(kspace, dynamic_range=6.5), lookup_table())
+        else:
+            kspace = image_spectrum(self.source, quarter_turns=1, resolution=self.resolution)
+            kspace_picture = kspace_pixels(self.source, quarter_turns=1, resolution=self.resolution)
+        num_lines = kspace.shape[0]
+        order = sampling_order(num_lines, self.sampling)
+
+        reconstruction = ProgressiveReconstruction(kspace)
+        gray = lookup_table()
+
+        # Both panels start black and are written in place as lines come in
+        kspace_pixels_shown = np.zeros_like(kspace_picture)
+        kspace_pixels_shown[..., 3] = 255
+        kspace_img = ImageMobject(kspace_pixels_shown)
+        kspace_img.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        kspace_img.scale_to_fit_height(6)
+        kspace_img.move_to(LEFT * 3.8 + DOWN * 0.4)
+
+        image_img = ImageMobject(np.array(kspace_pixels_shown))
+        image_img.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        image_img.scale_to_fit_height(6)
+        image_img.move_to(RIGHT * 3.8 + DOWN * 0.4)
+
+        k_space_title = Text("K-Space", color=PINK).scale(0.7).next_to(kspace_img, UP, buff=0.4)
+        image_title = Text("Image Space", color=PINK).scale(0.7).next_to(image_img, UP, buff=0.4)
+        transform_arrow = Arrow(kspace_img.get_right(), image_img.get_left(), buff=0.3, color=LIGHT_BLUE)
+        transform_label = MathTex(r"\mathcal{F}^{-1}", color=LIGHT_BLUE).next_to(transform_arrow, UP, buff=0.15)
+        self.add(kspace_img, image_img, k_space_title, image_title, transform_arrow, transform_label)
+
+        line_count = Integer(0, color=LIGHT_GREEN).scale(0.7)
+        line_label = Tex(f"/ {num_lines} lines", color=LIGHT_GREEN).scale(0.7)
+        line_readout = VGroup(line_count, line_label).arrange(RIGHT, buff=0.15)
+        line_readout.next_to(kspace_img, DOWN, buff=0.3)
+        self.add(line_readout)
+
+        lines_tracker = ValueTracker(0)
+        acquired_count = [0]
+
+        def acquire_new_lines(mobject):
+            count = min(int(lines_tracker.get_value()), num_lines)
+            if count == acquired_count[0]:
+                return
+            new_lines = order[acquired_count[0]:count]
+            acquired_count[0] = count
+
+            # Only the new lines are transformed; the image is rescaled to its current peak
+            reconstruction.acquire_lines(new_lines)
+            kspace_img.pixel_array[new_lines] = kspace_picture[new_lines]
+            magnitude = reconstruction.magnitude()
+            image_img.pixel_array[:] = apply_lookup_table(magnitude / max(magnitude.max(), 1e-12), gray)
+            line_count.set_value(count)
+
+        image_img.add_updater(acquire_new_lines)
+
+        self.wait(1)
+        self.play(
+            lines_tracker.animate.set_value(num_lines),
+            run_time=num_lines / self.lines_per_second,
+            rate_func=linear
+        )
+        self.wait(2)
+
+        image_img.remove_updater(acquire_new_lines)
+
+
+class CompressedSensing(Scene):
+    resolution = 256
+    acceleration = 4
+    iterations = 100
+    iterations_per_second = 20
+    # An asset image, or "phantom" for the Shepp–Logan phantom (sparser, so it recovers better)
+    source = "phantom"
+
+    def construct(self):
+        self.camera.frame_width = 16
+        self.camera.frame_height = 9
+
+        if self.source == "phantom":
+            image = np.array(shepp_logan(self.resolution))
+        else:
+            image = load_grayscale(self.source, quarter_turns=1, resolution=self.resolution)
+
+        kspace = forward(image)
+        mask = variable_density_mask(image.shape, self.acceleration)
+
+        # Every iterate is solved up front; the animation only indexes into the frames
+        frames = fista(kspace, mask, self.iterations)
+        gray = lookup_table()
+        scale = 1 / frames[-1].max()
+
+        kspace_img = ImageMobject(apply_lookup_table(log_magnitude(np.where(mask, kspace, 0), dynamic_range=6.5), gray))
+        kspace_img.set_resampling_algorithm(RESAMPLING_ALGORITHMS["nearest"])
+        kspace_img.scale_to_fit_height(6)
+        kspace_img.move_to(LEFT * 3.8 + DOWN * 0.4)
+
+        image_img = ImageMobject(apply_lookup_table(frames[0] * scale, gray))
+        image_img.scale_to_fit_height(6)
+        image_img.move_to(RIGHT * 3.8 + DOWN * 0.4)
+
+        k_space_title = Text("Undersampled K-Space", color=PINK).scale(0.7).next_to(kspace_img, UP, buff=0.4)
+        image_title = Text("Reconstruction", color=PINK).scale(0.7).next_to(image_img, UP, buff=0.4)
+        sampled_label = Tex(f"{mask.mean():.0%} of samples acquired", color=LIGHT_GREEN).scale(0.6)
+        sampled_label.next_to(kspace_img, DOWN, buff=0.3)
+
+        iteration_label = Tex("Iteration", color=LIGHT_BLUE).scale(0.7)
+        iteration_value = Integer(0, color=LIGHT_BLUE).scale(0.7)
+        iteration_readout = VGroup(iteration_label, iteration_value).arrange(RIGHT, buff=0.2)
+        iteration_readout.next_to(image_img, DOWN, buff=0.3)
+
+        self.add(kspace_img, image_img, k_space_title, image_title, sampled_label, iteration_readout)
+
+        # Zero-filled first: the aliasing that the sparsity term has to remove
+        self.wait(2)
+
+        iteration_tracker = ValueTracker(0)
+        shown_iteration = [0]
+
+        def show_current_iteration(mobject):
+            iteration = min(int(iteration_tracker.get_value()), self.iterations)
+            if iteration == shown_iteration[0]:
+                return
+            shown_iteration[0] = iteration
+            image_img.pixel_array[:] = apply_lookup_table(frames[iteration] * scale, gray)
+            iteration_value.set_value(iteration)
+
+        image_img.add_updater(show_current_iteration)
+
+        self.play(
+            iteration_tracker.animate.set_value(self.iterations),
+            run_time=self.iterations / self.iterations_per_second,
+            rate_func=linear
+        )
+        self.wait(2)
+
+        image_img.remove_updater(show_current_iteration)
+
+
 class KSpaceRelations(Scene):
     def construct(self):
         self.camera.frame_width = 16
@@ -1420,41 +1661,208 @@ class KSpaceRelations(Scene):
         num_points_equation.move_to(DOWN * 2)
 
         self.add(nyquist_equation, FOV_equation, num_points_equation)
+        self.wait(2)
+
+        # === Live demo: widen Δk_y (FOV shrinks, the head wraps), then cut k_max (blurring) ===
+        steps_per_sweep = 60
+        fov_scales = np.concatenate([np.linspace(1, 2, steps_per_sweep), np.ones(steps_per_sweep)])
+        kmax_fractions = np.concatenate([np.ones(steps_per_sweep), np.geomspace(1, 1 / 16, steps_per_sweep)])
+
+        # Every frame of both sweeps, from one batched inverse FFT
+        image = load_grayscale("assets/brain-axial.png", quarter_turns=1, resolution=256)
+        kspace_stack, image_stack = sweep_reconstructions(image, fov_scales, kmax_fractions)
+        gray = lookup_table()
+        kspace_frames = apply_lookup_table(log_magnitude(kspace_stack, dynamic_range=6.5), gray)
+        image_frames = apply_lookup_table(image_stack / image.max(), gray)
+
+        kspace_img = ImageMobject(kspace_frames[0].copy())
+        kspace_img.scale_to_fit_height(5.5)
+        kspace_img.move_to(LEFT * 3.5 + DOWN * 0.6)
+        image_img = ImageMobject(image_frames[0].copy())
+        image_img.scale_to_fit_height(5.5)
+        image_img.move_to(RIGHT * 3.5 + DOWN * 0.6)
+
+        k_space_title = Text("K-Space", color=PINK).scale(0.6).next_to(kspace_img, UP, buff=0.2)
+        image_title = Text("Image Space", color=PINK).scale(0.6).next_to(image_img, UP, buff=0.2)
+
+        delta_k_label = MathTex(r"\Delta k_y = ", color=LIGHT_BLUE).scale(0.8)
+        delta_k_value = DecimalNumber(1, num_decimal_places=2, color=LIGHT_BLUE, unit=r"\,\Delta k_0").scale(0.8)
+        k_max_label = MathTex(r"k_{max} = ", color=LIGHT_GREEN).scale(0.8)
+        k_max_value = DecimalNumber(1, num_decimal_places=2, color=LIGHT_GREEN, unit=r"\,k_{Nyquist}").scale(0.8)
+        readouts = VGroup(
+            VGroup(delta_k_label, delta_k_value).arrange(RIGHT, buff=0.15),
+            VGroup(k_max_label, k_max_value).arrange(RIGHT, buff=0.15),
+        ).arrange(RIGHT, buff=1.5)
+        readouts.next_to(VGroup(kspace_img, image_img), DOWN, buff=0.3)
+
+        self.play(
+            FadeOut(num_points_equation),
+            FOV_equation.animate.scale(0.5).move_to(UP * 4 + LEFT * 3.5),
+            nyquist_equation.animate.scale(0.5).move_to(UP * 4 + RIGHT * 3.5),
+        )
+        self.play(FadeIn(kspace_img), FadeIn(image_img), FadeIn(k_space_title), FadeIn(image_title), FadeIn(readouts))
+
+        step_tracker = ValueTracker(0)
+        shown_step = [0]
+
+        def show_current_step(mobject):
+            # Each frame is two array copies out of the precomputed stacks
+            step = int(np.clip(round(step_tracker.get_value()), 0, len(fov_scales) - 1))
+            if step == shown_step[0]:
+                return
+            shown_step[0] = step
+            kspace_img.pixel_array[:] = kspace_frames[step]
+            image_img.pixel_array[:] = image_frames[step]
+            delta_k_value.set_value(fov_scales[step])
+            k_max_value.set_value(kmax_fractions[step])
+
+        image_img.add_updater(show_current_step)
 
+        self.play(Indicate(FOV_equation, color=LIGHT_BLUE))
+        self.play(step_tracker.animate.set_value(steps_per_sweep - 1), run_time=4, rate_func=there_and_back_with_pause)
+
+        # Jump to the start of the truncation sweep (identical to the first frame) and cut k_max
+        step_tracker.set_value(steps_per_sweep)
+        self.play(Indicate(nyquist_equation, color=LIGHT_GREEN))
+        self.play(step_tracker.animate.set_value(2 * steps_per_sweep - 1), run_time=4, rate_func=linear)
+        self.wait(1)
+        self.play(step_tracker.animate.set_value(steps_per_sweep), run_time=2)
+        self.wait(1)
+
+        image_img.remove_updater(show_current_step)
+
+
+class ParallelImaging(Scene):
+    resolution = 240  # divisible by every acceleration below
+    accelerations = (1, 2, 3, 4)
+    num_coils = 8
+    noise = 0.01
 
-class GRESequence(Scene):
     def construct(self):
         self.camera.frame_width = 16
         self.camera.frame_height = 9
 
-        # Create the 4 axes
-        axes_width = 12
-        axes_height = 1.5
-        axes_spacing = 0.75
+        image = load_grayscale("assets/brain-axial.png", quarter_turns=1, resolution=self.resolution)
+        sensitivities = coil_sensitivities(image.shape, self.num_coils)
+        inside_brain = image > 0.05
+        gray = lookup_table()
+        g_colors = lookup_table([BLACK, BLUE, YELLOW, RED])
+        g_range = 4
+
+        # Everything for every acceleration up front: one batched FFT and one batched solve each
+        results = []
+        for acceleration in self.accelerations:
+            folded = acquire(image, sensitivities, acceleration, noise=self.noise)
+            unfolded, g_factor = sense_unfold(folded, sensitivities, acceleration)
+            results.append((acceleration, folded, root_sum_of_squares(folded), unfolded, g_factor))
+        coil_scale = 1 / np.abs(results[-1][1]).max()
+        combined_scale = 1 / max(combined.max() for _, _, combined, _, _ in results)
+        # SENSE divides the coil profiles back out, so the unfolded image is on the original scale
+        image_scale = 1 / image.max()
+
+        cell_size = 1.75
+        coil_grid_center = LEFT * 4.1 + DOWN * 0.3
+        unfolded_center = RIGHT * 2.1 + DOWN * 0.3
+        g_center = RIGHT * 5.9 + DOWN * 0.3
+        panel_height = 3.5
+
+        def coil_panels(folded, acceleration):
+            # Reduced-FOV images keep their pixel size, so they get shorter as R grows
+            panels = Group()
+            for coil, coil_image in enumerate(folded):
+                panel = ImageMobject(apply_lookup_table(np.abs(coil_image) * coil_scale, gray))
+                panel.stretch_to_fit_width(cell_size * 0.95)
+                panel.stretch_to_fit_height(cell_size * 0.95 / acceleration)
+                row, col = divmod(coil, 4)
+                panel.move_to(coil_grid_center + RIGHT * (col - 1.5) * cell_size + DOWN * (row - 0.5) * cell_size)
+                panels.add(panel)
+            return panels
+
+        def combined_panel(combined, acceleration):
+            # The coils combined before unfolding: still folded, and as short as the coil images
+            panel = ImageMobject(apply_lookup_table(combined * combined_scale, gray))
+            panel.stretch_to_fit_width(panel_height)
+            panel.stretch_to_fit_height(panel_height / acceleration)
+            return panel.move_to(unfolded_center)
+
+        def unfolded_panel(unfolded):
+            panel = ImageMobject(apply_lookup_table(np.abs(unfolded) * image_scale, gray))
+            panel.scale_to_fit_height(panel_height)
+            return panel.move_to(unfolded_center)
+
+        def g_panel(g_factor):
+            pixels = apply_lookup_table((g_factor - 1) / (g_range - 1), g_colors)
+            pixels[~inside_brain, :3] = 0
+            panel = ImageMobject(pixels)
+            panel.scale_to_fit_height(panel_height)
+            return panel.move_to(g_center)
+
+        coils_title = Text(f"{self.num_coils} Coil Images", color=PINK).scale(0.6)
+        coils_title.move_to(coil_grid_center + UP * (cell_size + 0.5))
+        unfolded_title = Text("SENSE Unfolded", color=PINK).scale(0.6)
+        unfolded_title.move_to(unfolded_center + UP * (panel_height / 2 + 0.5))
+        combined_title = Text("Root Sum of Squares", color=PINK).scale(0.6).move_to(unfolded_title)
+        g_title = Text("g-factor", color=PINK).scale(0.6)
+        g_title.move_to(g_center + UP * (panel_height / 2 + 0.5))
+        self.add(coils_title, g_title)
+
+        g_bar = ImageMobject(g_colors[::-1, None].repeat(8, axis=1))
+        g_bar.stretch_to_fit_width(0.2).stretch_to_fit_height(panel_height)
+        g_bar.next_to(g_center + RIGHT * panel_height / 2, RIGHT, buff=0.15)
+        g_bar_labels = VGroup(
+            MathTex("1", color=WHITE).scale(0.5).next_to(g_bar, DOWN, buff=0.1),
+            MathTex(f"{g_range}", color=WHITE).scale(0.5).next_to(g_bar, UP, buff=0.1),
+        )
+        self.add(g_bar, g_bar_labels)
+
+        snr_equation = MathTex(r"SNR_{R} = \frac{SNR_{full}}{g \sqrt{R}}", color=LIGHT_GREEN).scale(0.8)
+        snr_equation.to_edge(DOWN, buff=0.4).shift(RIGHT * 4)
+        self.add(snr_equation)
+
+        def g_label(g_factor):
+            label = MathTex(rf"\bar{{g}} = {g_factor[inside_brain].mean():.2f}", color=LIGHT_BLUE).scale(0.7)
+            return label.next_to(g_center + DOWN * panel_height / 2, DOWN, buff=0.3)
+
+        shown = None
+        acceleration_label = None
+        for acceleration, folded, combined, unfolded, g_factor in results:
+            coils = coil_panels(folded, acceleration)
+            combined_image = combined_panel(combined, acceleration)
+            next_label = MathTex(f"R = {acceleration}", color=LIGHT_BLUE).scale(0.9).to_edge(UP, buff=0.3)
+            if shown is None:
+                self.add(coils, combined_image, combined_title, next_label)
+            else:
+                self.play(FadeOut(shown), FadeOut(unfolded_title), FadeIn(coils), FadeIn(combined_image),
+                          FadeIn(combined_title), ReplacementTransform(acceleration_label, next_label), run_time=1)
+            acceleration_label = next_label
+            self.wait(1)
 
-        # Create the axes
-        slice_select_axes = self.create_labeled_axes("G_z", axes_width, axes_height, color=LIGHT_GREEN,
-                                                     secondary_label="Slice Selection")
-        rf_axes = self.create_labeled_axes("RF", axes_width, axes_height, color=BLACK)
-        phase_encode_axes = self.create_labeled_axes("G_y", axes_width, axes_height, color=PINK,
-                                                     secondary_label="Phase Encoding")
-        freq_encode_axes = self.create_labeled_axes("G_x", axes_width, axes_height, color=LIGHT_BLUE,
-                                                    secondary_label="Frequency Encoding")
+            # Combining the coils alone cannot undo the fold; SENSE restores the full field of view
+            unfolded_image = unfolded_panel(unfolded)
+            g_image, g_text = g_panel(g_factor), g_label(g_factor)
+            self.play(FadeOut(combined_image), FadeOut(combined_title), FadeIn(unfolded_image),
+                      FadeIn(unfolded_title), FadeIn(g_image), FadeIn(g_text), run_time=1)
+            shown = Group(coils, unfolded_image, g_image, g_text)
+            self.wait(2)
 
-        # Stack them vertically with proper alignment
-        axes_group = VGroup(slice_select_axes, rf_axes, phase_encode_axes, freq_encode_axes)
 
-        # Align all axes to the right edge of their labels
-        for i in range(1, len(axes_group)):
-            axes_group[i][0].align_to(axes_group[0][0], RIGHT)
+class GRESequence(SequenceDiagram, Scene):
+    diagram_color = BLACK
+    # Steps in the phase encoding table; a full-resolution 256 draws as cheaply as 6
+    num_phase_steps = 6
 
-        # Now arrange them vertically with proper spacing
-        axes_group.arrange(DOWN, buff=axes_spacing, aligned_edge=RIGHT)
+    def construct(self):
+        self.camera.frame_width = 16
+        self.camera.frame_height = 9
 
-        # Ensure the actual axes (not the labels) are aligned
-        for i in range(1, len(axes_group)):
-            axes_group[i][0].align_to(axes_group[0][0], RIGHT)
+        # Create the axes
+        slice_select_axes = self.create_labeled_axes("G_z", color=LIGHT_GREEN, secondary_label="Slice Selection")
+        rf_axes = self.create_labeled_axes("RF", color=BLACK)
+        phase_encode_axes = self.create_labeled_axes("G_y", color=PINK, secondary_label="Phase Encoding")
+        freq_encode_axes = self.create_labeled_axes("G_x", color=LIGHT_BLUE, secondary_label="Frequency Encoding")
 
+        # Stack them vertically, aligned on the axes rather than the labels
+        axes_group = self.stack_axes(slice_select_axes, rf_axes, phase_encode_axes, freq_encode_axes)
         self.add(axes_group)
 
         # Timing parameters
@@ -1485,23 +1893,40 @@ class GRESequence(Scene):
         fenc_readout_end = fenc_readout_start + fenc_readout_duration
         fenc_readout_center = fenc_readout_start + fenc_readout_duration / 2
 
+        # The sequence itself; every lobe below is drawn from it
+        sequence = PulseSequence()
+        sequence.add("gz", ss_start, ss_duration, 1)
+        sequence.add("rf", rf_start, rf_duration, 1, shape="sinc")
+        sequence.add("gz", ss_rephase_start, ss_rephase_duration, -sequence.area("gz") / 2 / ss_rephase_duration)
+        sequence.add("gy", pe_start, pe_duration, 1)
+        sequence.add("gx", fenc_readout_start, fenc_readout_duration, 1)
+        # Prephase so the echo forms at the center of the readout
+        sequence.add("gx", fenc_rephase_start, fenc_rephase_duration, -sequence.area("gx") / 2 / fenc_rephase_duration)
+        sequence.add("adc", fenc_readout_start, fenc_readout_duration)
+
         # Time markers
         time_markers = self.create_vertical_time_markers(
             [ss_start, ss_end, pe_start, pe_end, ss_rephase_end, fenc_readout_start, fenc_readout_end],
             [slice_select_axes, freq_encode_axes])
 
         # Create gradients and RF pulse
-        ss_gradient = self.create_gradient_rectangle(slice_select_axes, ss_start, ss_duration, 1, color=LIGHT_GREEN)
-        ss_rephase_gradient = self.create_gradient_rectangle(slice_select_axes, ss_rephase_start, ss_rephase_duration, -1, color=LIGHT_GREEN)
-        rf_pulse = self.create_rf_pulse(rf_axes, rf_start, rf_duration, 1)
-        pe_gradient = self.create_gradient_rectangle(phase_encode_axes, pe_start, pe_duration, 1, color=PINK)
-        fenc_rephase_gradient = self.create_gradient_rectangle(freq_encode_axes, fenc_rephase_start,
-                                                               fenc_rephase_duration, -0.5, color=LIGHT_BLUE)
-        fenc_readout_gradient = self.create_gradient_rectangle(freq_encode_axes, fenc_readout_start,
-                                                               fenc_readout_duration, 1, color=LIGHT_BLUE)
+        ss_gradient, ss_rephase_gradient = self.create_gradient_rectangles(slice_select_axes, sequence, "gz",
+                                                                           color=LIGHT_GREEN)
+        _, _, (rf_amplitude,) = sequence.events("rf")
+        rf_pulse = self.create_rf_pulse(rf_axes, rf_start, rf_duration, rf_amplitude)
+
+        # Every phase encoding step as one table, with the sequence's own step at full opacity
+        _, _, (pe_amplitude,) = sequence.events("gy")
+        pe_table = GradientTable(phase_encode_axes[0], pe_start, pe_duration,
+                                 pe_amplitude * np.linspace(1, -1, self.num_phase_steps), color=PINK,
+                                 outline_color=self.diagram_color)
+        pe_table.set_step(0)
+        fenc_rephase_gradient, fenc_readout_gradient = self.create_gradient_rectangles(freq_encode_axes, sequence,
+                                                                                       "gx", color=LIGHT_BLUE)
 
         # Create readout window
-        readout_window = self.create_readout_window(rf_axes, fenc_readout_start, fenc_readout_duration)
+        (adc_start,), (adc_duration,), _ = sequence.events("adc")
+        readout_window = self.create_readout_window(rf_axes, adc_start, adc_duration)
 
         # Create TE
         # Get the actual positions on the axes for the centers
@@ -1532,12 +1957,12 @@ class GRESequence(Scene):
 
         # Phase encoding and frequency encoding rephase
         # self.play(
-        #     Create(pe_gradient),
+        #     Create(pe_table),
         #     Create(fenc_rephase_gradient),
         #     Create(ss_rephase_gradient),
         #     run_time=1.5
         # )
-        self.add(pe_gradient, fenc_rephase_gradient)
+        self.add(pe_table, fenc_rephase_gradient)
 
         # Frequency encoding readout
         # self.play(
@@ -1555,133 +1980,21 @@ class GRESequence(Scene):
         # )
         self.add(te_label, te_brace)
 
-        # Show multiple phase encoding steps
-        additional_pe_gradients = []
-        num_additional_steps = 5
-        for i in range(1, num_additional_steps + 1):
-            # Calculate gradient amplitude as a fraction of the original
-            # Alternate between positive and negative values
-            if i % 2 == 0:
-                amplitude = 1 - (i / num_additional_steps)
-            else:
-                amplitude = -(i / num_additional_steps)
-
-            pe_grad = self.create_gradient_rectangle(
-                phase_encode_axes,
-                pe_start,
-                pe_duration,
-                amplitude,
-                color=PINK,
-                fill_opacity=0.3
-            )
-            additional_pe_gradients.append(pe_grad)
-
-        # self.play(
-        #     *[Create(grad) for grad in additional_pe_gradients],
-        #     run_time=2
-        # )
-        self.add(*[grad for grad in additional_pe_gradients])
+        # Step through the phase encoding table
+        self.play(StepGradientTable(pe_table), run_time=3)
 
         # self.wait(1)
 
-    def create_labeled_axes(self, label, width, height, color=WHITE, secondary_label=None):
-        # Create axes with label but without y-axis
-        axes = Axes(
-            x_range=[0, 10, 1],
-            y_range=[-1, 1, 0.5],
-            x_length=width,
-            y_length=height,
-            axis_config={"include_tip": False, "include_numbers": False, "color": BLACK},
-            y_axis_config={"include_ticks": False, "stroke_opacity": 0}  # Hide y-axis
-        )
-
-        labels = VGroup()
-
-        label_tex = MathTex(label, color=color)
-        labels.add(label_tex)
-
-        if secondary_label:
-            secondary_label_tex = Tex(secondary_label, color=color).scale(0.5)
-            secondary_label_tex.next_to(label_tex, DOWN, buff=0.3)
-            labels.add(secondary_label_tex)
-
-        labels.next_to(axes.y_axis, LEFT, buff=0.2)
-        return VGroup(axes, labels)
-
-    def create_vertical_time_markers(self, time_points, connecting_axes):
-        markers = []
-
-        # Get the top and bottom y coordinates for our dashed lines
-        top_y = connecting_axes[0][0].get_origin()[1] + connecting_axes[0][0].get_y_axis().get_height() / 2
-        bottom_y = connecting_axes[-1][0].get_origin()[1] - connecting_axes[-1][0].get_y_axis().get_height() / 2
-
-        for time in time_points:
-            # Get the x coordinate for this time point
-            x = connecting_axes[0][0].c2p(time, 0)[0]
-
-            # Create dashed line
-            line = DashedLine(
-                start=[x, top_y, 0],
-                end=[x, bottom_y, 0],
-                stroke_width=1,
-                color=BLACK,
-                dash_length=0.1
-            )
-            markers.append(line)
-
-        return markers
-
-    def create_gradient_rectangle(self, axes, start_time, duration, amplitude, color=WHITE, fill_opacity=1):
-        # Calculate coordinates in axes space
-        x_start = start_time
-        x_end = start_time + duration
-        y_height = amplitude
-
-        # Convert to pixel coordinates
-        p1 = axes[0].c2p(x_start, 0)
-        p2 = axes[0].c2p(x_end, y_height)
-
-        # Create the rectangle
-        rect = Rectangle(
-            width=p2[0] - p1[0],
-            height=abs(p2[1] - p1[1]),
-            stroke_width=1.5,
-            fill_color=color,
-            fill_opacity=fill_opacity,
-            color=BLACK
-        )
-
-        # rect.points_in_order = [
-        #     [p1[0], p1[1], 0],  # bottom left
-        #     [p1[0], p1[1] + abs(p2[1] - p1[1]), 0],  # top left
-        #     [p2[0], p2[1], 0],  # top right
-        #     [p2[0], p1[1], 0]  # bottom right
-        # ]
-
-        # Position the rectangle
-        rect.move_to((p1 + p2) / 2)
-
-        return rect
-
-    def create_rf_pulse(self, rf_axes, start_time, duration, amplitude):
-        # Create a sinc pulse for RF
+    def create_rf_pulse(self, rf_axes, start_time, duration, amplitude, shape="sinc"):
+        # Adaptively sampled Bézier outline, cached by its size on screen
         axes = rf_axes[0]
-        center = start_time + duration / 2
-        width = duration * 0.8
-
-        x_values = np.linspace(start_time, start_time + duration, 100)
-
-        # Calculate sinc values with some adjustments to fit in the window
-        # Create a sinc function that's 0 at the start and end of the window
-        x_norm = (x_values - center) / (width / 5)
-        y_values = amplitude * np.sinc(x_norm)
+        origin = axes.c2p(start_time, 0)
+        width = axes.c2p(start_time + duration, 0)[0] - origin[0]
+        height = axes.c2p(start_time, amplitude)[1] - origin[1]
+        pixel_width = round(width * self.camera.pixel_width / self.camera.frame_width)
 
-        # Create points for the curve
-        points = [axes.c2p(x, y) for x, y in zip(x_values, y_values)]
-
-        # Create the curve
         rf_pulse = VMobject()
-        rf_pulse.set_points_smoothly(points)
+        rf_pulse.set_points(origin + pulse_bezier(shape, width, height, pixel_width))
         rf_pulse.set_stroke(YELLOW, width=2)
 
         return rf_pulse
@@ -1737,40 +2050,119 @@ class GRESequence(Scene):
         return VGroup(brace, label)
 
 
-class KSpaceTraversal(Scene):
+class ContrastExplorer(Scene):
+    repetition_times = (500, 4000)  # ms
+    echo_times = np.linspace(5, 150, 100)  # ms
+    flip_angle = 90 * DEGREES
+    scrub_duration = 5
+
     def construct(self):
         self.camera.frame_width = 16
         self.camera.frame_height = 9
 
-        # Create the 4 axes
-        axes_width = 12
-        axes_height = 1.5
-        axes_spacing = 0.75
-
-        # Create the gradient axes
-        gx_axes = self.create_labeled_axes("G_x", axes_width, axes_height, color=LIGHT_BLUE,
-                                           secondary_label="Frequency Encoding")
-        gy_axes = self.create_labeled_axes("G_y", axes_width, axes_height, color=PINK,
-                                           secondary_label="Phase Encoding")
+        maps = TissueMaps.from_image("assets/brain-axial.png", quarter_turns=1, resolution=256)
+
+        # Every TR, TE and flip angle at once, memory-mapped from the cache
+        images = weighted_images(maps, self.repetition_times, self.echo_times, [self.flip_angle])
+        tissue_signals = maps.tissue_means(images[:, :, 0])
+        scale = 1 / images.max()
+        gray = lookup_table()
+
+        image_img = ImageMobject(apply_lookup_table(images[0, 0, 0] * scale, gray))
+        image_img.scale_to_fit_height(6)
+        image_img.move_to(LEFT * 4 + DOWN * 0.3)
+        self.add(image_img)
+
+        signal_axes = Axes(
+            x_range=[0, self.echo_times[-1], 25],
+            y_range=[0, 1, 0.25],
+            x_length=6.5,
+            y_length=4.5,
+            tips=False,
+            axis_config={"color": WHITE, "include_numbers": False},
+        )
+        signal_axes.move_to(RIGHT * 3.8 + DOWN * 0.3)
+        te_label = MathTex(r"TE \; (ms)", color=WHITE).scale(0.6).next_to(signal_axes.x_axis, DOWN, buff=0.25)
+        signal_label = Tex("Signal", color=WHITE).scale(0.6).next_to(signal_axes.y_axis, UP, buff=0.2)
+        self.add(signal_axes, te_label, signal_label)
+
+        tissue_colors = {"csf": LIGHT_BLUE, "gray matter": PINK, "white matter": LIGHT_GREEN}
+        tissue_indices = [maps.tissue_names.index(name) for name in tissue_colors]
+
+        def tissue_curves(tr_index):
+            curves = VGroup()
+            for (name, color), tissue in zip(tissue_colors.items(), tissue_indices):
+                curve = VMobject(stroke_color=color, stroke_width=4)
+                curve.set_points_as_corners(coords_to_points(
+                    signal_axes, self.echo_times, tissue_signals[tr_index, :, tissue] * scale
+                ))
+                label = Tex(name, color=color).scale(0.5).next_to(curve.get_end(), RIGHT, buff=0.15)
+                curves.add(VGroup(curve, label))
+            return curves
+
+        def tr_readout(tr_index):
+            readout = MathTex(f"TR = {self.repetition_times[tr_index]} \\; ms", color=WHITE).scale(0.8)
+            return readout.next_to(signal_axes, UP, buff=0.5)
+
+        curves = tissue_curves(0)
+        tr_label = tr_readout(0)
+        self.add(curves, tr_label)
+
+        te_index = ValueTracker(0)
+        tr_index = [0]
+        te_marker = always_redraw(lambda: DashedLine(
+            signal_axes.c2p(self.echo_times[int(te_index.get_value())], 0),
+            signal_axes.c2p(self.echo_times[int(te_index.get_value())], 1),
+            color=YELLOW, stroke_width=2
+        ))
+        self.add(te_marker)
+
+        shown = [(0, 0)]
+
+        def show_current_image(mobject):
+            # Scrubbing is indexing: one (rows, cols) slice of the memmap per new frame
+            frame = (tr_index[0], int(te_index.get_value()))
+            if frame == shown[0]:
+                return
+            shown[0] = frame
+            image_img.pixel_array[:] = apply_lookup_table(images[frame[0], frame[1], 0] * scale, gray)
+
+        image_img.add_updater(show_current_image)
+
+        last_te = len(self.echo_times) - 1
+        self.wait(1)
+        self.play(te_index.animate.set_value(last_te), run_time=self.scrub_duration, rate_func=linear)
+        self.play(te_index.animate.set_value(0), run_time=1)
+
+        for next_tr in range(1, len(self.repetition_times)):
+            tr_index[0] = next_tr
+            self.play(
+                Transform(curves, tissue_curves(next_tr)),
+                Transform(tr_label, tr_readout(next_tr)),
+                run_time=1
+            )
+            self.play(te_index.animate.set_value(last_te), run_time=self.scrub_duration, rate_func=linear)
+            self.play(te_index.animate.set_value(0), run_time=1)
 
-        # Create the k-space axes
-        kx_axes = self.create_labeled_axes("k_x", axes_width, axes_height, color=LIGHT_BLUE)
-        ky_axes = self.create_labeled_axes("k_y", axes_width, axes_height, color=PINK)
+        self.wait(1)
+        image_img.remove_updater(show_current_image)
 
-        # Stack them vertically with proper alignment
-        axes_group = VGroup(gx_axes, gy_axes, kx_axes, ky_axes)
 
-        # Align all axes to the right edge of their labels
-        for i in range(1, len(axes_group)):
-            axes_group[i][0].align_to(axes_group[0][0], RIGHT)
+class KSpaceTraversal(SequenceDiagram, Scene):
+    def construct(self):
+        self.camera.frame_width = 16
+        self.camera.frame_height = 9
 
-        # Now arrange them vertically with proper spacing
-        axes_group.arrange(DOWN, buff=axes_spacing, aligned_edge=RIGHT)
+        # Create the gradient axes
+        gx_axes = self.create_labeled_axes("G_x", color=LIGHT_BLUE, secondary_label="Frequency Encoding")
+        gy_axes = self.create_labeled_axes("G_y", color=PINK, secondary_label="Phase Encoding")
 
-        # Ensure the actual axes (not the labels) are aligned
-        for i in range(1, len(axes_group)):
-            axes_group[i][0].align_to(axes_group[0][0], RIGHT)
+        # Create the k-space axes
+        kx_axes = self.create_labeled_axes("k_x", color=LIGHT_BLUE)
+        ky_axes = self.create_labeled_axes("k_y", color=PINK)
 
+        # Stack them vertically, aligned on the axes rather than the labels
+        axes_group = self.stack_axes(gx_axes, gy_axes, kx_axes, ky_axes)
         self.add(axes_group)
 
         # Timing parameters
@@ -1791,6 +2183,19 @@ class KSpaceTraversal(Scene):
         fenc_readout_duration = 3
         fenc_readout_end = fenc_readout_start + fenc_readout_duration
 
+        # The sequence for the top phase-encoding step; k-space is its integral
+        sequence = PulseSequence()
+        sequence.add("gy", pe_start, pe_duration, 1)
+        sequence.add("gx", fenc_readout_start, fenc_readout_duration, 1)
+        # Prephase so the echo forms at the center of the readout
+        sequence.add("gx", fenc_rephase_start, fenc_rephase_duration, -sequence.area("gx") / 2 / fenc_rephase_duration)
+        sequence.add("adc", fenc_readout_start, fenc_readout_duration)
+        compiled = sequence.compile()
+
+        # Scale both k axes so the largest excursion reaches the edge
+        kx_scale = 1 / np.abs(compiled.kx).max()
+        ky_scale = 1 / np.abs(compiled.ky).max()
+
         # Time markers
         time_markers = self.create_vertical_time_markers(
             [pe_start, pe_end, fenc_readout_start, fenc_readout_end],
@@ -1800,9 +2205,9 @@ class KSpaceTraversal(Scene):
         self.add(*time_markers)
 
         # Create gradients for G_x and G_y
-        pe_gradient = self.create_gradient_rectangle(gy_axes, pe_start, pe_duration, 1, color=PINK)
-        fenc_rephase_gradient = self.create_gradient_rectangle(gx_axes, fenc_rephase_start,
-                                                               fenc_rephase_duration, -0.5, color=LIGHT_BLUE)
+        pe_gradient, = self.create_gradient_rectangles(gy_axes, sequence, "gy", color=PINK)
+        fenc_rephase_gradient, fenc_readout_gradient = self.create_gradient_rectangles(gx_axes, sequence, "gx",
+                                                                                       color=LIGHT_BLUE)
 
         # Play the phase encoding and frequency rephasing gradients animation
         # self.play(
@@ -1812,26 +2217,14 @@ class KSpaceTraversal(Scene):
         # )
         self.add(pe_gradient, fenc_rephase_gradient)
 
-        # Create k-space changes from phase encoding and frequency rephase
-        # For k_y: Integral of G_y creates a step function
-        ky_change_points = [
-            ky_axes[0].c2p(pe_start, 0),
-            ky_axes[0].c2p(pe_end, 1)  # Step up to final value
-        ]
-
-        ky_change = VMobject()
-        ky_change.set_points_as_corners(ky_change_points)
-        ky_change.set_stroke(PINK, width=2)
+        # k-space changes from phase encoding and frequency rephase
+        # k_y: the integral of G_y climbs to its phase-encoding value
+        times, ky = compiled.segment("ky", pe_start, pe_end)
+        ky_change = self.create_waveform_curve(ky_axes, times, ky * ky_scale, color=PINK)
 
-        # For k_x: Integral of G_x creates negative ramp during rephase
-        kx_rephase_points = [
-            kx_axes[0].c2p(fenc_rephase_start, 0),
-            kx_axes[0].c2p(fenc_rephase_end, -1)  # Ramp down to negative value
-        ]
-
-        kx_rephase = VMobject()
-        kx_rephase.set_points_as_corners(kx_rephase_points)
-        kx_rephase.set_stroke(LIGHT_BLUE, width=2)
+        # k_x: the integral of G_x ramps down during the rephase lobe
+        times, kx = compiled.segment("kx", fenc_rephase_start, fenc_rephase_end)
+        kx_rephase = self.create_waveform_curve(kx_axes, times, kx * kx_scale, color=LIGHT_BLUE)
 
         # Play k-space changes for phase encoding and frequency rephase
         # self.play(
@@ -1841,10 +2234,6 @@ class KSpaceTraversal(Scene):
         # )
         self.add(ky_change, kx_rephase)
 
-        # Create frequency readout gradient
-        fenc_readout_gradient = self.create_gradient_rectangle(gx_axes, fenc_readout_start,
-                                                               fenc_readout_duration, 1, color=LIGHT_BLUE)
-
         # Play frequency readout gradient animation
         # self.play(
         #     Create(fenc_readout_gradient),
@@ -1852,24 +2241,12 @@ class KSpaceTraversal(Scene):
         # )
         self.add(fenc_readout_gradient)
 
-        # Create k_x change during readout (from negative to positive)
-        kx_readout_points = [
-            kx_axes[0].c2p(fenc_readout_start, -1),  # Start from negative value
-            kx_axes[0].c2p(fenc_readout_end, 1)  # Ramp up to positive value
-        ]
+        # k_x sweeps from negative to positive during the readout while k_y holds
+        times, kx = compiled.segment("kx", fenc_readout_start, fenc_readout_end)
+        kx_readout = self.create_waveform_curve(kx_axes, times, kx * kx_scale, color=LIGHT_BLUE)
 
-        ky_readout_points = [
-            ky_axes[0].c2p(pe_end, 1),  # Maintain value
-            ky_axes[0].c2p(fenc_readout_end, 1)  # Maintain value
-        ]
-
-        kx_readout = VMobject()
-        kx_readout.set_points_as_corners(kx_readout_points)
-        kx_readout.set_stroke(LIGHT_BLUE, width=2)
-
-        ky_readout = VMobject()
-        ky_readout.set_points_as_corners(ky_readout_points)
-        ky_readout.set_stroke(PINK, width=2)
+        times, ky = compiled.segment("ky", pe_end, fenc_readout_end)
+        ky_readout = self.create_waveform_curve(ky_axes, times, ky * ky_scale, color=PINK)
 
         # Play k_x change during readout
         # self.play(
@@ -1881,31 +2258,21 @@ class KSpaceTraversal(Scene):
 
         # self.wait(1)
 
-        # Now show another phase encoding path
+        # Now show other phase encoding steps, each compiled from the same sequence
         pe_gradients = []
+        all_ky_changes = []
         amplitudes = [0.5, 0, -0.5, -1]
         for amp in amplitudes:
-            pe_grad = self.create_gradient_rectangle(gy_axes, pe_start, pe_duration, amp, color=PINK,
-                                                     fill_opacity=0.3)
+            step = sequence.scaled("gy", amp)
+            pe_grad, = self.create_gradient_rectangles(gy_axes, step, "gy", color=PINK, fill_opacity=0.3)
             pe_gradients.append(pe_grad)
 
-        self.add(*pe_gradients)
-
-        # Create k_y change for the new phase encoding
-        all_ky_changes = []
-        for amp in amplitudes:
-            ky_change_points = [
-                ky_axes[0].c2p(pe_start, 0),
-                ky_axes[0].c2p(pe_end, amp),  # Step up to the new value
-                ky_axes[0].c2p(fenc_readout_end, amp)  # Maintain value
-            ]
-
-            ky_change = VMobject()
-            ky_change.set_points_as_corners(ky_change_points)
-            ky_change.set_stroke(PINK, width=2, opacity=0.8)
-
+            times, ky = step.compile().segment("ky", pe_start, fenc_readout_end)
+            ky_change = self.create_waveform_curve(ky_axes, times, ky * ky_scale, color=PINK)
+            ky_change.set_stroke(opacity=0.8)
             all_ky_changes.append(ky_change)
 
+        self.add(*pe_gradients)
         self.add(*all_ky_changes)
 
         # Highlight the new k-space trajectory
@@ -1917,335 +2284,267 @@ class KSpaceTraversal(Scene):
         #
         # self.wait(2)
 
-    def create_labeled_axes(self, label, width, height, color=WHITE, secondary_label=None):
-        # Create axes with label but without y-axis
-        axes = Axes(
-            x_range=[0, 10, 1],
-            y_range=[-1, 1, 0.5],
-            x_length=width,
-            y_length=height,
-            axis_config={"include_tip": False, "include_numbers": False},
-            y_axis_config={"include_ticks": False, "stroke_opacity": 0}  # Hide y-axis
-        )
-
-        labels = VGroup()
-
-        label_tex = MathTex(label, color=color)
-        labels.add(label_tex)
-
-        if secondary_label:
-            secondary_label_tex = Tex(secondary_label, color=color).scale(0.5)
-            secondary_label_tex.next_to(label_tex, DOWN, buff=0.3)
-            labels.add(secondary_label_tex)
-
-        labels.next_to(axes.y_axis, LEFT, buff=0.2)
-        return VGroup(axes, labels)
-
-    def create_vertical_time_markers(self, time_points, connecting_axes):
-        markers = []
-
-        # Get the top and bottom y coordinates for our dashed lines
-        top_y = connecting_axes[0][0].get_origin()[1] + connecting_axes[0][0].get_y_axis().get_height() / 2
-        bottom_y = connecting_axes[-1][0].get_origin()[1] - connecting_axes[-1][0].get_y_axis().get_height() / 2
-
-        for time in time_points:
-            # Get the x coordinate for this time point
-            x = connecting_axes[0][0].c2p(time, 0)[0]
-
-            # Create dashed line
-            line = DashedLine(
-                start=[x, top_y, 0],
-                end=[x, bottom_y, 0],
-                stroke_width=1,
-                dash_length=0.1
-            )
-            markers.append(line)
-
-        return markers
 
-    def create_gradient_rectangle(self, axes, start_time, duration, amplitude, color=WHITE, fill_opacity=1):
-        # Calculate coordinates in axes space
-        x_start = start_time
-        x_end = start_time + duration
-        y_height = amplitude
-
-        # Convert to pixel coordinates
-        p1 = axes[0].c2p(x_start, 0)
-        p2 = axes[0].c2p(x_end, y_height)
-
-        # Create the rectangle
-        rect = Rectangle(
-            width=p2[0] - p1[0],
-            height=abs(p2[1] - p1[1]),
-            stroke_width=1.5,
-            fill_color=color,
-            fill_opacity=fill_opacity
-        )
-
-        # Position the rectangle
-        rect.move_to((p1 + p2) / 2)
+class EPISequenceTraversal(SequenceDiagram, Scene):
+    # Echo train, shared with EPIGeometricDistortion; 128 or 256 echoes draw just as cheaply
+    echo_train_length = 10
+    flat_top = 0.875
+    ramp = 0.0625
+    blip_area = 0.1
+    prephase_duration = 0.5
+    max_time_markers = 12
 
-        return rect
+    axes_width = 8.5
+    axes_height = 1.3
+    axes_spacing = 0.6
+    panel_size = 3.6
 
+    @classmethod
+    def create_sequence(cls):
+        return epi_sequence(cls.echo_train_length, flat_top=cls.flat_top, ramp=cls.ramp, blip_area=cls.blip_area,
+                            prephase_duration=cls.prephase_duration)
 
-class EPISequenceTraversal(Scene):
     def construct(self):
         self.camera.frame_width = 16
         self.camera.frame_height = 9
 
-        # Create the 4 axes
-        axes_width = 12
-        axes_height = 1.5
-        axes_spacing = 0.75
+        # The whole train as arrays; its breakpoints trace every waveform exactly
+        sequence = self.create_sequence()
+        compiled = sequence.compile(exact=True)
+        duration = sequence.end
 
         # Create the gradient axes
-        gx_axes = self.create_labeled_axes("G_x", axes_width, axes_height, color=LIGHT_BLUE,
-                                           secondary_label="Frequency Encoding")
-        gy_axes = self.create_labeled_axes("G_y", axes_width, axes_height, color=PINK,
-                                           secondary_label="Phase Encoding")
+        gx_axes = self.create_labeled_axes("G_x", color=LIGHT_BLUE, secondary_label="Frequency Encoding",
+                                           duration=duration)
+        gy_axes = self.create_labeled_axes("G_y", color=PINK, secondary_label="Phase Encoding", duration=duration)
 
         # Create the k-space axes
-        kx_axes = self.create_labeled_axes("k_x", axes_width, axes_height, color=LIGHT_BLUE)
-        ky_axes = self.create_labeled_axes("k_y", axes_width, axes_height, color=PINK)
-
-        # Stack them vertically with proper alignment
-        axes_group = VGroup(gx_axes, gy_axes, kx_axes, ky_axes)
-
-        # Align all axes to the right edge of their labels
-        for i in range(1, len(axes_group)):
-            axes_group[i][0].align_to(axes_group[0][0], RIGHT)
-
-        # Now arrange them vertically with proper spacing
-        axes_group.arrange(DOWN, buff=axes_spacing, aligned_edge=RIGHT)
-
-        # Ensure the actual axes (not the labels) are aligned
-        for i in range(1, len(axes_group)):
-            axes_group[i][0].align_to(axes_group[0][0], RIGHT)
+        kx_axes = self.create_labeled_axes("k_x", color=LIGHT_BLUE, duration=duration)
+        ky_axes = self.create_labeled_axes("k_y", color=PINK, duration=duration)
 
+        # Stack them vertically, aligned on the axes rather than the labels
+        axes_group = self.stack_axes(gx_axes, gy_axes, kx_axes, ky_axes)
+        axes_group.to_edge(LEFT, buff=0.4)
         self.add(axes_group)
 
-        # Timing parameters
-        total_duration = 10  # in seconds
-
-        # Phase encoding
-        pe_start = 0
-        pe_duration = 0.5
-        pe_end = pe_start + pe_duration
-
-        f_enc_duration = 1
-        pulse_duration = 0.125
-        pe_pulses = [0.5, 1.5, 2.5, 3.5, 4.5, 5.5, 6.5, 7.5, 8.5, 9.5]
-
-
-        # Time markers
-        time_markers = self.create_vertical_time_markers(
-            pe_pulses,
-            [gx_axes, ky_axes])
+        # Time markers at the start of every readout but the first, thinned out for long trains
+        readout_starts = sequence.events("gx")[0][1:]
+        stride = int(np.ceil(len(readout_starts) / self.max_time_markers))
+        time_markers = self.create_vertical_time_markers(readout_starts[::stride], [gx_axes, ky_axes])
 
         # self.play(Create(VGroup(*time_markers)), run_time=1)
         self.add(*time_markers)
 
-        # Create gradients for G_x and G_y
-        pe_gradient = self.create_gradient_rectangle(gy_axes, pe_start, pe_duration, -1, color=PINK)
-        fenc_rephase_gradient = self.create_gradient_rectangle(gx_axes, pe_start,
-                                                               pe_duration, -1, color=LIGHT_BLUE)
+        # Each gradient channel is one filled outline, scaled so its largest lobe fills the axes
+        gx, gy = compiled["gx"], compiled["gy"]
+        gx_waveform = self.create_gradient_waveform(gx_axes, compiled.times, gx / np.abs(gx).max(), color=LIGHT_BLUE)
+        gy_waveform = self.create_gradient_waveform(gy_axes, compiled.times, gy / np.abs(gy).max(), color=PINK)
 
-        # Play the phase encoding and frequency rephasing gradients animation
         # self.play(
-        #     Create(pe_gradient),
-        #     Create(fenc_rephase_gradient),
+        #     Create(gx_waveform),
+        #     Create(gy_waveform),
         #     run_time=1.5
         # )
-        self.add(pe_gradient, fenc_rephase_gradient)
-
-        gx_gradients = []
-        gy_pulses = []
-        last_gx_direction = 1
-
-        kx_phases = []
-        ky_phases = []
-        last_ky = -1
-
-        for pulse in pe_pulses:
-            # Create the G_x gradient
-            gx_gradient = self.create_gradient_rectangle(gx_axes, pulse, f_enc_duration, 0.5 * last_gx_direction, color=LIGHT_BLUE)
-            gx_gradients.append(gx_gradient)
-            last_gx_direction *= -1
-
-            kx_change_points = [
-                kx_axes[0].c2p(pulse, last_gx_direction),
-                kx_axes[0].c2p(pulse + f_enc_duration, -last_gx_direction)  # Step up to final value
-            ]
-            kx_change = VMobject()
-            kx_change.set_points_as_corners(kx_change_points)
-            kx_change.set_stroke(LIGHT_BLUE, width=2)
-            kx_phases.append(kx_change)
-
-            ky_change_points = [
-                ky_axes[0].c2p(pulse, last_ky),
-                ky_axes[0].c2p(pulse + f_enc_duration - pulse_duration / 2, last_ky),
-                ky_axes[0].c2p(pulse + f_enc_duration, last_ky + 0.2)  # Step up to final value
-            ]
-            last_ky += 0.2
-
-            ky_change = VMobject()
-            ky_change.set_points_as_corners(ky_change_points)
-            ky_change.set_stroke(PINK, width=2)
-            ky_phases.append(ky_change)
-
-            if pulse == 0.5:
-                continue
-
-            # Create the G_y pulse
-            gy_pulse = self.create_gradient_rectangle(gy_axes, pulse - pulse_duration / 2, pulse_duration, 1, color=PINK)
-            gy_pulses.append(gy_pulse)
-
-        self.add(*gx_gradients, *gy_pulses)
-
-        # Create k-space changes from phase encoding and frequency rephase
-        # For k_y: Integral of G_y creates a step function
-        ky_change_points = [
-            ky_axes[0].c2p(pe_start, 0),
-            ky_axes[0].c2p(pe_end, -1)  # Step up to final value
-        ]
-
-        ky_change = VMobject()
-        ky_change.set_points_as_corners(ky_change_points)
-        ky_change.set_stroke(PINK, width=2)
-
-        # For k_x: Integral of G_x creates negative ramp during rephase
-        kx_rephase_points = [
-            kx_axes[0].c2p(pe_start, 0),
-            kx_axes[0].c2p(pe_end, -1)  # Ramp down to negative value
-        ]
-
-        kx_rephase = VMobject()
-        kx_rephase.set_points_as_corners(kx_rephase_points)
-        kx_rephase.set_stroke(LIGHT_BLUE, width=2)
-
-        # Play k-space changes for phase encoding and frequency rephase
+        self.add(gx_waveform, gy_waveform)
+
+        # k-space is the integral of the gradients: k_x zig-zags across each line while k_y
+        # steps up by one line at every blip
+        kx = compiled.kx / np.abs(compiled.kx).max()
+        ky = compiled.ky / np.abs(compiled.ky).max()
+        kx_curve = self.create_waveform_curve(kx_axes, compiled.times, kx, color=LIGHT_BLUE)
+        ky_curve = self.create_waveform_curve(ky_axes, compiled.times, ky, color=PINK)
+
+        # The same trajectory as a path through the k_x-k_y plane
+        panel = Axes(
+            x_range=[-1.2, 1.2, 1],
+            y_range=[-1.2, 1.2, 1],
+            x_length=self.panel_size,
+            y_length=self.panel_size,
+            axis_config={"include_tip": False, "include_numbers": False, "color": self.diagram_color},
+        )
+        panel.next_to(axes_group, RIGHT, buff=0.6)
+        panel_labels = VGroup(
+            MathTex("k_x", color=LIGHT_BLUE).scale(0.7).next_to(panel.x_axis, RIGHT, buff=0.1),
+            MathTex("k_y", color=PINK).scale(0.7).next_to(panel.y_axis, UP, buff=0.1),
+        )
+        kspace_path = VMobject()
+        kspace_path.set_points_as_corners(coords_to_points(panel, kx, ky))
+        kspace_path.set_stroke(LIGHT_GREEN, width=2)
+        path_start = Dot(panel.c2p(0, 0), radius=0.06, color=LIGHT_GREEN)
+
+        # Play k-space changes
         # self.play(
-        #     Create(ky_change),
-        #     Create(kx_rephase),
+        #     Create(ky_curve),
+        #     Create(kx_curve),
+        #     Create(kspace_path),
         #     run_time=1.5
         # )
-        self.add(ky_change, kx_rephase)
-
-        self.add(ky_phases[0], kx_phases[0])
-        self.add(kx_phases[1])
-        self.add(ky_phases[1])
-        self.add(ky_phases[2], kx_phases[2])
-        self.add(ky_phases[3], kx_phases[3])
-        self.add(ky_phases[4], kx_phases[4])
-        self.add(ky_phases[5], kx_phases[5])
-        self.add(ky_phases[6], kx_phases[6])
-        self.add(ky_phases[7], kx_phases[7])
-        self.add(ky_phases[8], kx_phases[8])
-
-        # Create frequency readout gradient
-        # fenc_readout_gradient = self.create_gradient_rectangle(gx_axes, fenc_readout_start,
-        #                                                        fenc_readout_duration, 1, color=LIGHT_BLUE)
-        #
-        # # Play frequency readout gradient animation
-        # # self.play(
-        # #     Create(fenc_readout_gradient),
-        # #     run_time=1.5
-        # # )
-        # # self.add(fenc_readout_gradient)
-        #
-        # # Create k_x change during readout (from negative to positive)
-        # kx_readout_points = [
-        #     kx_axes[0].c2p(fenc_readout_start, -1),  # Start from negative value
-        #     kx_axes[0].c2p(fenc_readout_end, 1)  # Ramp up to positive value
-        # ]
-        #
-        # ky_readout_points = [
-        #     ky_axes[0].c2p(pe_end, 1),  # Maintain value
-        #     ky_axes[0].c2p(fenc_readout_end, 1)  # Maintain value
-        # ]
-        #
-        # kx_readout = VMobject()
-        # kx_readout.set_points_as_corners(kx_readout_points)
-        # kx_readout.set_stroke(LIGHT_BLUE, width=2)
-        #
-        # ky_readout = VMobject()
-        # ky_readout.set_points_as_corners(ky_readout_points)
-        # ky_readout.set_stroke(PINK, width=2)
-
-        # Play k_x change during readout
-        # self.play(
-        #     Create(kx_readout),
-        #     Create(ky_readout),
-        #     run_time=1.5
-        # )
-        # self.add(kx_readout, ky_readout)
-
-    def create_labeled_axes(self, label, width, height, color=WHITE, secondary_label=None):
-        # Create axes with label but without y-axis
-        axes = Axes(
-            x_range=[0, 10, 1],
-            y_range=[-1, 1, 0.5],
-            x_length=width,
-            y_length=height,
-            axis_config={"include_tip": False, "include_numbers": False},
-            y_axis_config={"include_ticks": False, "stroke_opacity": 0}  # Hide y-axis
-        )
-
-        labels = VGroup()
+        self.add(ky_curve, kx_curve, panel, panel_labels, path_start, kspace_path)
 
-        label_tex = MathTex(label, color=color)
-        labels.add(label_tex)
 
-        if secondary_label:
-            secondary_label_tex = Tex(secondary_label, color=color).scale(0.5)
-            secondary_label_tex.next_to(label_tex, DOWN, buff=0.3)
-            labels.add(secondary_label_tex)
+class EPIGeometricDistortion(Scene):
+    resolution = 128
+    # Echo spacings swept, as multiples of the one drawn in EPISequenceTraversal
+    echo_spacing_factors = np.linspace(0.25, 2, 36)
 
-        labels.next_to(axes.y_axis, LEFT, buff=0.2)
-        return VGroup(axes, labels)
-
-    def create_vertical_time_markers(self, time_points, connecting_axes):
-        markers = []
-
-        # Get the top and bottom y coordinates for our dashed lines
-        top_y = connecting_axes[0][0].get_origin()[1] + connecting_axes[0][0].get_y_axis().get_height() / 2
-        bottom_y = connecting_axes[-1][0].get_origin()[1] - connecting_axes[-1][0].get_y_axis().get_height() / 2
-
-        for time in time_points:
-            # Get the x coordinate for this time point
-            x = connecting_axes[0][0].c2p(time, 0)[0]
-
-            # Create dashed line
-            line = DashedLine(
-                start=[x, top_y, 0],
-                end=[x, bottom_y, 0],
-                stroke_width=1,
-                dash_length=0.1
-            )
-            markers.append(line)
-
-        return markers
+    def construct(self):
+        self.camera.frame_width = 16
+        self.camera.frame_height = 9
 
-    def create_gradient_rectangle(self, axes, start_time, duration, amplitude, color=WHITE, fill_opacity=1):
-        # Calculate coordinates in axes space
-        x_start = start_time
-        x_end = start_time + duration
-        y_height = amplitude
+        image = load_grayscale("assets/brain-axial.png", quarter_turns=1, resolution=self.resolution)
+        field_map = susceptibility_field_map(image.shape)
+
+        timing = EPITiming.from_sequence(EPISequenceTraversal.create_sequence())
+        timings = [timing.with_echo_spacing(factor * timing.echo_spacing) for factor in self.echo_spacing_factors]
+
+        # The whole sweep comes from the disk cache after the first render
+        distortion = EPIDistortion(image, field_map)
+        frames = distortion.sweep(timings)
+        gray = lookup_table()
+        field_colors = lookup_table([BLUE, BLACK, RED])
+
+        field_pixels = apply_lookup_table(0.5 + field_map / (2 * np.abs(field_map).max()), field_colors)
+        field_pixels[..., 3] = 140
+        image_img = ImageMobject(apply_lookup_table(image / image.max(), gray))
+        image_img.scale_to_fit_height(5.5)
+        image_img.move_to(LEFT * 4 + DOWN * 0.3)
+        field_img = ImageMobject(field_pixels)
+        field_img.scale_to_fit_height(5.5)
+        field_img.move_to(image_img)
+
+        epi_img = ImageMobject(apply_lookup_table(frames[0] / image.max(), gray))
+        epi_img.scale_to_fit_height(5.5)
+        epi_img.move_to(RIGHT * 4 + DOWN * 0.3)
+
+        image_title = Text("Object + Field Map", color=PINK).scale(0.6).next_to(image_img, UP, buff=0.3)
+        epi_title = Text("EPI Image", color=PINK).scale(0.6).next_to(epi_img, UP, buff=0.3)
+        pe_arrow = Arrow(epi_img.get_corner(DR) + RIGHT * 0.3, epi_img.get_corner(UR) + RIGHT * 0.3, buff=0,
+                         color=PINK)
+        pe_label = Tex("phase encode", color=PINK).scale(0.5).rotate(PI / 2).next_to(pe_arrow, RIGHT, buff=0.1)
+        self.add(image_img, field_img, epi_img, image_title, epi_title, pe_arrow, pe_label)
+
+        shift_equation = MathTex(r"\Delta y = \Delta f \cdot N \cdot ESP", color=LIGHT_GREEN).scale(0.8)
+        shift_equation.move_to(DOWN * 3.9)
+        spacing_label = MathTex("ESP =", color=LIGHT_BLUE).scale(0.7)
+        spacing_value = DecimalNumber(timings[0].echo_spacing, num_decimal_places=2, color=LIGHT_BLUE).scale(0.7)
+        spacing_readout = VGroup(spacing_label, spacing_value).arrange(RIGHT, buff=0.15)
+        spacing_readout.move_to(UP * 0.5)
+        self.add(shift_equation, spacing_readout)
+
+        step_tracker = ValueTracker(0)
+        shown_step = [0]
+
+        def show_current_step(mobject):
+            step = int(np.clip(round(step_tracker.get_value()), 0, len(frames) - 1))
+            if step == shown_step[0]:
+                return
+            shown_step[0] = step
+            epi_img.pixel_array[:] = apply_lookup_table(frames[step] / image.max(), gray)
+            spacing_value.set_value(timings[step].echo_spacing)
+
+        epi_img.add_updater(show_current_step)
+
+        self.wait(1)
+        self.play(step_tracker.animate.set_value(len(frames) - 1), run_time=6, rate_func=there_and_back_with_pause)
+        self.wait(1)
+
+        epi_img.remove_updater(show_current_step)
+
+
+class NonCartesianTraversal(Scene):
+    # "radial" (golden-angle spokes) or "spiral" (interleaves)
+    trajectory = "radial"
+    resolution = 256
+    shots_per_second = 32
 
-        # Convert to pixel coordinates
-        p1 = axes[0].c2p(x_start, 0)
-        p2 = axes[0].c2p(x_end, y_height)
+    def construct(self):
+        self.camera.frame_width = 16
+        self.camera.frame_height = 9
 
-        # Create the rectangle
-        rect = Rectangle(
-            width=p2[0] - p1[0],
-            height=abs(p2[1] - p1[1]),
-            stroke_width=1.5,
-            fill_color=color,
-            fill_opacity=fill_opacity
+        resolution = self.resolution
+        if self.trajectory == "radial":
+            shots = radial(int(np.ceil(np.pi / 2 * resolution)), resolution)
+            shots_per_second = self.shots_per_second
+            shot_name = "spokes"
+        else:
+            shots = spiral(16, resolution)
+            shots_per_second = 2
+            shot_name = "interleaves"
+        num_shots, samples_per_shot = shots.shape[:2]
+
+        # Exact k-space of the analytic phantom at every trajectory sample
+        samples = shepp_logan_transform(shots[..., 0], shots[..., 1]).ravel()
+        gridding = Gridding(shots, resolution)
+        peak = np.abs(gridding.reconstruct(samples)).max()
+        gridding.reset()
+
+        # === K-space panel: the trajectory drawn so far, with the current shot highlighted ===
+        panel_size = 6
+        k_space_center = LEFT * 3.8 + DOWN * 0.4
+        k_space_frame = Square(side_length=panel_size, color=WHITE, stroke_width=2).move_to(k_space_center)
+        kx_axis = Line(k_space_frame.get_left(), k_space_frame.get_right(), color=GRAY, stroke_width=1)
+        ky_axis = Line(k_space_frame.get_bottom(), k_space_frame.get_top(), color=GRAY, stroke_width=1)
+        kx_label = MathTex("k_x", color=LIGHT_BLUE).scale(0.7).next_to(kx_axis, RIGHT, buff=0.15)
+        ky_label = MathTex("k_y", color=PINK).scale(0.7).next_to(ky_axis, UP, buff=0.15)
+        self.add(k_space_frame, kx_axis, ky_axis, kx_label, ky_label)
+
+        # Decimate each shot for drawing only; straight spokes need just their two ends
+        display_stride = samples_per_shot - 1 if self.trajectory == "radial" else 16
+        display_index = np.unique(np.r_[np.arange(0, samples_per_shot, display_stride), samples_per_shot - 1])
+        display = shots[:, display_index]
+        display_points = np.zeros(display.shape[:2] + (3,))
+        display_points[..., :2] = display * (panel_size / resolution)
+        display_points += k_space_center
+        starts, ends = display_points[:, :-1], display_points[:, 1:]
+        thirds = np.linspace(0, 1, 4)[None, None, :, None]
+        shot_points = (starts[:, :, None] + thirds * (ends - starts)[:, :, None]).reshape(num_shots, -1, 3)
+
+        trajectory_drawn = VMobject(stroke_color=LIGHT_GREEN, stroke_width=1, stroke_opacity=0.6)
+        current_shot = VMobject(stroke_color=PINK, stroke_width=3)
+        self.add(trajectory_drawn, current_shot)
+
+        # === Image panel: gridding reconstruction of what has been acquired ===
+        gray = lookup_table()
+        image_img = ImageMobject(np.zeros((resolution, resolution, 4), dtype=np.uint8) + np.uint8([0, 0, 0, 255]))
+        image_img.scale_to_fit_height(panel_size)
+        image_img.move_to(RIGHT * 3.8 + DOWN * 0.4)
+
+        k_space_title = Text("K-Space", color=PINK).scale(0.7).next_to(k_space_frame, UP, buff=0.4)
+        image_title = Text("Gridding Reconstruction", color=PINK).scale(0.7).next_to(image_img, UP, buff=0.4)
+        self.add(image_img, k_space_title, image_title)
+
+        shot_count = Integer(0, color=LIGHT_GREEN).scale(0.7)
+        shot_label = Tex(f"/ {num_shots} {shot_name}", color=LIGHT_GREEN).scale(0.7)
+        shot_readout = VGroup(shot_count, shot_label).arrange(RIGHT, buff=0.15)
+        shot_readout.next_to(k_space_frame, DOWN, buff=0.3)
+        self.add(shot_readout)
+
+        shots_tracker = ValueTracker(0)
+        acquired_count = [0]
+
+        def acquire_new_shots(mobject):
+            count = min(int(shots_tracker.get_value()), num_shots)
+            if count == acquired_count[0]:
+                return
+            # New samples go through the cached sparse matrix; nothing already gridded is redone
+            new_samples = np.arange(acquired_count[0] * samples_per_shot, count * samples_per_shot)
+            acquired_count[0] = count
+            gridding.add_samples(samples[new_samples], new_samples)
+
+            image_img.pixel_array[:] = apply_lookup_table(np.abs(gridding.image()) / peak, gray)
+            trajectory_drawn.points = shot_points[:count].reshape(-1, 3)
+            current_shot.points = shot_points[count - 1]
+            shot_count.set_value(count)
+
+        image_img.add_updater(acquire_new_shots)
+
+        self.wait(1)
+        self.play(
+            shots_tracker.animate.set_value(num_shots),
+            run_time=num_shots / shots_per_second,
+            rate_func=linear
         )
+        self.play(FadeOut(current_shot))
+        self.wait(2)
 
-        # Position the rectangle
-        rect.move_to((p1 + p2) / 2)
-
-        return rect
+        image_img.remove_updater(acquire_new_shots)
@@ -0,0 +1 @@
+"""Numerical helpers shared by the MRI scenes."""
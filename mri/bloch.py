@@ -0,0 +1,140 @@
+import numpy as np
+
+
+def sinc_pulse(flip_angle, duration, time_bandwidth=4, dt=0.005, apodization=0.46):
+    """
+    Complex B1 samples (in rad per unit time) of an apodized sinc pulse.
+
+    ``time_bandwidth`` counts zero crossings across the pulse, ``apodization`` is the
+    Hamming-style window weight (0 disables it). The pulse area equals the flip angle.
+    """
+    num_samples = int(round(duration / dt))
+    t = (np.arange(num_samples) + 0.5) * dt - duration / 2
+    shape = np.sinc(time_bandwidth * t / duration)
+    shape *= (1 - apodization) + apodization * np.cos(2 * np.pi * t / duration)
+    return (shape * flip_angle / (shape.sum() * dt)).astype(complex)
+
+
+class SliceSelection:
+    """
+    RF and gradient waveforms of a slice-selective excitation plus its rephasing lobe.
+
+    Times are in arbitrary units, ``gradient`` is in radians per unit time per unit of
+    position, so spins at a distance ``slice_thickness / 2`` from the slice center sit at
+    the edge of the pulse bandwidth. An off-center slice is selected the way a scanner
+    does it, by shifting the RF frequency rather than the gradient.
+    """
+
+    def __init__(self, slice_thickness, slice_center=0.0, flip_angle=np.pi / 2, duration=1.0,
+                 time_bandwidth=4, dt=0.005, rephase_fraction=0.5):
+        self.slice_center = slice_center
+        self.dt = dt
+
+        rf = sinc_pulse(flip_angle, duration, time_bandwidth, dt)
+        bandwidth = time_bandwidth / duration
+        strength = 2 * np.pi * bandwidth / slice_thickness
+
+        # Offsetting the RF frequency by strength * slice_center moves the excited band there;
+        # the phase is zero at the pulse center so the rephasing lobe still refocuses it
+        t = (np.arange(len(rf)) + 0.5) * dt - len(rf) * dt / 2
+        rf = rf * np.exp(-1j * strength * slice_center * t)
+
+        # The rephasing lobe undoes the phase the slice gradient wound up after the pulse center
+        num_rephase = int(round(duration * rephase_fraction / dt))
+        self.num_rf_samples = len(rf)
+        self.b1 = np.concatenate([rf, np.zeros(num_rephase, dtype=complex)])
+        self.gradient = np.concatenate([np.full(len(rf), strength), np.full(num_rephase, -strength)])
+
+    @property
+    def duration(self):
+        return len(self.b1) * self.dt
+
+
+class BlochTrajectory:
+    """Magnetization of every spin at every recorded time step, shape ``(frames, spins, 3)``."""
+
+    def __init__(self, times, magnetization):
+        self.times = times
+        self.magnetization = magnetization
+
+    def __len__(self):
+        return len(self.times)
+
+    def index_at(self, time):
+        return int(np.clip(np.searchsorted(self.times, time), 0, len(self) - 1))
+
+    def at(self, time):
+        return self.magnetization[self.index_at(time)]
+
+
+def rotate(magnetization, field, dt):
+    """
+    Precess every row of an Nx3 magnetization array about its own effective field.
+
+    ``field`` holds per-spin (Bx, By, Bz) in radians per unit time; the rotation is
+    applied in Rodrigues form, which is the rotation matrix acting on each row
+    without materializing an Nx3x3 array.
+    """
+    bx, by, bz = field.T
+    mx, my, mz = magnetization.T
+
+    strength = np.sqrt(bx * bx + by * by + bz * bz)
+    inverse = 1 / np.where(strength > 0, strength, 1)
+    kx, ky, kz = bx * inverse, by * inverse, bz * inverse
+
+    angle = -strength * dt
+    cos_angle = np.cos(angle)
+    sin_angle = np.sin(angle)
+    along_axis = (kx * mx + ky * my + kz * mz) * (1 - cos_angle)
+
+    rotated = np.empty_like(magnetization)
+    rotated[:, 0] = mx * cos_angle + (ky * mz - kz * my) * sin_angle + kx * along_axis
+    rotated[:, 1] = my * cos_angle + (kz * mx - kx * mz) * sin_angle + ky * along_axis
+    rotated[:, 2] = mz * cos_angle + (kx * my - ky * mx) * sin_angle + kz * along_axis
+    return rotated
+
+
+def simulate(positions, b1, gradient, dt, initial=None, off_resonance=None, record_every=1):
+    """
+    Run the Bloch equations (no relaxation) for every spin through the given waveforms.
+
+    ``positions`` is either an (N,) array along a single gradient axis, with
+    ``gradient`` of shape (T,), or an (N, 3) array with ``gradient`` of shape (T, 3).
+    Returns a BlochTrajectory holding the initial state and every ``record_every``-th step.
+    """
+    positions = np.asarray(positions, dtype=float)
+    gradient = np.asarray(gradient, dtype=float)
+    b1 = np.asarray(b1, dtype=complex)
+    num_spins = len(positions)
+    num_steps = len(b1)
+
+    if initial is None:
+        magnetization = np.tile([0.0, 0.0, 1.0], (num_spins, 1))
+    else:
+        magnetization = np.array(initial, dtype=float)
+
+    # Longitudinal field of each spin at every step, in one broadcast
+    if positions.ndim == 1:
+        bz = gradient[:, None] * positions[None, :]
+    else:
+        bz = gradient @ positions.T
+    if off_resonance is not None:
+        bz = bz + np.asarray(off_resonance, dtype=float)[None, :]
+
+    recorded_steps = np.arange(0, num_steps + 1, record_every)
+    trajectory = np.empty((len(recorded_steps), num_spins, 3), dtype=np.float32)
+    trajectory[0] = magnetization
+
+    field = np.empty((num_spins, 3))
+    frame = 1
+    for step in range(num_steps):
+        field[:, 0] = b1[step].real
+        field[:, 1] = b1[step].imag
+        field[:, 2] = bz[step]
+        magnetization = rotate(magnetization, field, dt)
+
+        if frame < len(recorded_steps) and step + 1 == recorded_steps[frame]:
+            trajectory[frame] = magnetization
+            frame += 1
+
+    return BlochTrajectory(recorded_steps * dt, trajectory)
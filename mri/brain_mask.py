@@ -0,0 +1,97 @@
+from pathlib import Path
+
+import numpy as np
+from PIL import Image
+from scipy import ndimage
+
+from mri.disk_cache import cached_array, file_digest
+
+
+def _otsu_threshold(values):
+    # Threshold that best separates the histogram into two classes
+    histogram, _ = np.histogram(values, bins=256, range=(0, 256))
+    probability = histogram / histogram.sum()
+    class_weight = np.cumsum(probability)
+    class_mean = np.cumsum(probability * np.arange(256))
+    total_mean = class_mean[-1]
+    between_variance = (total_mean * class_weight - class_mean) ** 2 / (class_weight * (1 - class_weight) + 1e-12)
+    return np.argmax(between_variance)
+
+
+def _compute_mask(asset_path, quarter_turns, resolution, erosion):
+    image = Image.open(asset_path)
+    if image.mode in ("RGBA", "LA", "PA") and np.asarray(image.getchannel("A")).min() < 255:
+        channel = image.getchannel("A")
+    else:
+        channel = image.convert("L")
+
+    # Downsample so the longest side matches the requested resolution
+    scale = resolution / max(channel.size)
+    size = (max(1, round(channel.size[0] * scale)), max(1, round(channel.size[1] * scale)))
+    values = np.asarray(channel.resize(size, Image.BOX), dtype=float)
+
+    mask = values > _otsu_threshold(values) / 2
+
+    # Drop frames drawn around the picture so they don't enclose the whole image
+    border = max(1, resolution // 50)
+    mask[:border, :] = mask[-border:, :] = False
+    mask[:, :border] = mask[:, -border:] = False
+
+    # Close small gaps in the skull outline before filling it in
+    smoothing = max(1, resolution // 32)
+    mask = ndimage.binary_closing(mask, iterations=smoothing, border_value=0)
+    mask = ndimage.binary_fill_holes(mask)
+    mask = ndimage.binary_opening(mask, iterations=smoothing)
+
+    labels, _ = ndimage.label(mask)
+    sizes = np.bincount(labels.ravel())
+    sizes[0] = 0
+    mask = labels == sizes.argmax()
+
+    if erosion:
+        mask = ndimage.binary_erosion(mask, iterations=erosion)
+
+    # Match the orientation of the ImageMobject after ``rotate(quarter_turns * 90 * DEGREES)``
+    return np.rot90(mask, quarter_turns)
+
+
+class BrainMask:
+    """
+    Binary brain region of an asset image, in the orientation it is displayed in.
+
+    Masks are derived from the alpha channel when the image has one and from its
+    intensity otherwise, and are cached on disk per asset, rotation and resolution.
+    """
+
+    def __init__(self, mask):
+        self.mask = np.asarray(mask, dtype=bool)
+
+    @classmethod
+    def load(cls, asset_path, quarter_turns=0, resolution=128, erosion=0):
+        asset_path = Path(asset_path)
+        if not asset_path.suffix:
+            asset_path = asset_path.with_suffix(".png")
+        mask = cached_array(
+            "brain_masks",
+            (file_digest(asset_path), quarter_turns % 4, resolution, erosion),
+            lambda: _compute_mask(asset_path, quarter_turns % 4, resolution, erosion)
+        )
+        return cls(mask)
+
+    def contains(self, x, y, center, width, height):
+        """Which of the scene points ``(x, y)`` fall in the brain of an image placed at ``center``."""
+        rows, cols = self.mask.shape
+        u = (np.asarray(x, dtype=float) - center[0]) / width + 0.5
+        v = 0.5 - (np.asarray(y, dtype=float) - center[1]) / height
+
+        inside = (u >= 0) & (u < 1) & (v >= 0) & (v < 1)
+        col = np.clip((u * cols).astype(int), 0, cols - 1)
+        row = np.clip((v * rows).astype(int), 0, rows - 1)
+        return inside & self.mask[row, col]
+
+    def for_image(self, image_mobject):
+        """A vectorized ``mask(x, y)`` bound to where ``image_mobject`` currently sits."""
+        center = image_mobject.get_center()
+        width = image_mobject.width
+        height = image_mobject.height
+        return lambda x, y: self.contains(x, y, center, width, height)
@@ -0,0 +1,107 @@
+import numpy as np
+
+
+def variable_density_mask(shape, acceleration=4, center_fraction=0.08, seed=0):
+    """
+    Random k-space sampling mask, dense near k = 0 and sparse towards the edges.
+
+    A central square of half-width ``center_fraction`` (as a fraction of k_max) is always
+    sampled; elsewhere the sampling probability falls off polynomially with distance
+    from the center, scaled so that roughly ``1 / acceleration`` of all samples are kept.
+    """
+    rows, cols = shape
+    ky = (np.arange(rows) - rows // 2) / (rows / 2)
+    kx = (np.arange(cols) - cols // 2) / (cols / 2)
+    radius = np.hypot(ky[:, None], kx[None, :]) / np.sqrt(2)
+
+    falloff = (1 - radius) ** 4
+    probability = np.clip(falloff * (1 / acceleration) / falloff.mean(), 0, 1)
+    mask = np.random.default_rng(seed).random(shape) < probability
+
+    center = (np.abs(ky)[:, None] <= center_fraction) & (np.abs(kx)[None, :] <= center_fraction)
+    return mask | center
+
+
+def forward(image):
+    """Centered orthonormal 2D FFT, so the data-consistency step has unit Lipschitz constant."""
+    return np.fft.fftshift(np.fft.fft2(np.fft.ifftshift(image), norm="ortho"))
+
+
+def adjoint(kspace):
+    return np.fft.fftshift(np.fft.ifft2(np.fft.ifftshift(kspace), norm="ortho"))
+
+
+def haar(image, levels):
+    """Orthonormal multi-level 2D Haar transform; each level splits the top-left block into four."""
+    coefficients = np.array(image)
+    rows, cols = coefficients.shape
+    for _ in range(levels):
+        block = coefficients[:rows, :cols]
+        a, b = block[0::2, 0::2], block[0::2, 1::2]
+        c, d = block[1::2, 0::2], block[1::2, 1::2]
+        half_rows, half_cols = rows // 2, cols // 2
+        block[:half_rows, :half_cols], block[:half_rows, half_cols:], block[half_rows:, :half_cols], block[half_rows:, half_cols:] = (
+            (a + b + c + d) / 2, (a - b + c - d) / 2, (a + b - c - d) / 2, (a - b - c + d) / 2
+        )
+        rows, cols = half_rows, half_cols
+    return coefficients
+
+
+def inverse_haar(coefficients, levels):
+    image = np.array(coefficients)
+    rows, cols = image.shape[0] >> (levels - 1), image.shape[1] >> (levels - 1)
+    for _ in range(levels):
+        half_rows, half_cols = rows // 2, cols // 2
+        block = image[:rows, :cols]
+        low_low, low_high = block[:half_rows, :half_cols].copy(), block[:half_rows, half_cols:].copy()
+        high_low, high_high = block[half_rows:, :half_cols].copy(), block[half_rows:, half_cols:].copy()
+        block[0::2, 0::2] = (low_low + low_high + high_low + high_high) / 2
+        block[0::2, 1::2] = (low_low - low_high + high_low - high_high) / 2
+        block[1::2, 0::2] = (low_low + low_high - high_low - high_high) / 2
+        block[1::2, 1::2] = (low_low - low_high - high_low + high_high) / 2
+        rows, cols = 2 * rows, 2 * cols
+    return image
+
+
+def soft_threshold(values, threshold):
+    # Shrinks complex magnitudes towards zero and keeps the phase
+    magnitude = np.abs(values)
+    return values * (np.maximum(magnitude - threshold, 0) / np.maximum(magnitude, 1e-12))
+
+
+def fista(kspace, mask, iterations=100, regularization=0.002, levels=4):
+    """
+    Reconstruct an image from masked k-space with FISTA and Haar-wavelet sparsity.
+
+    Minimizes ``0.5 * ||mask * F x - y||² + regularization * ||W x||₁``. Returns
+    ``(iterations + 1, rows, cols)`` magnitude frames, frame 0 being the zero-filled
+    reconstruction, all written into one buffer allocated up front. Images whose
+    sides are not divisible by ``2 ** levels`` are zero-padded for the wavelet step.
+    """
+    measured = np.where(mask, kspace, 0)
+    rows, cols = measured.shape
+    step = 2 ** levels
+    padded_shape = (-(-rows // step) * step, -(-cols // step) * step)
+    padded = np.zeros(padded_shape, dtype=complex)
+    threshold = regularization * np.abs(adjoint(measured)).max()
+
+    frames = np.empty((iterations + 1, rows, cols), dtype=np.float32)
+    image = adjoint(measured)
+    frames[0] = np.abs(image)
+
+    momentum_image = image
+    t = 1.0
+    for iteration in range(1, iterations + 1):
+        # Gradient step on data consistency (step size 1), then wavelet shrinkage
+        residual = np.where(mask, forward(momentum_image) - measured, 0)
+        estimate = momentum_image - adjoint(residual)
+
+        padded[:rows, :cols] = estimate
+        shrunk = inverse_haar(soft_threshold(haar(padded, levels), threshold), levels)[:rows, :cols]
+
+        t_next = (1 + np.sqrt(1 + 4 * t * t)) / 2
+        momentum_image = shrunk + ((t - 1) / t_next) * (shrunk - image)
+        image, t = shrunk, t_next
+        frames[iteration] = np.abs(image)
+
+    return frames
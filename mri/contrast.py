@@ -0,0 +1,120 @@
+from pathlib import Path
+import hashlib
+
+import numpy as np
+
+from mri.brain_mask import BrainMask
+from mri.disk_cache import cached_memmap
+from mri.kspace import load_grayscale
+from mri.phantom import TISSUES, tissue_labels
+
+
+# Approximate values at 1.5 T: T1, T2 and T2* in ms, proton density relative to CSF
+TISSUE_PARAMETERS = {
+    "background": (1.0, 1.0, 1.0, 0.0),
+    "scalp": (250.0, 70.0, 50.0, 0.9),
+    "csf": (4000.0, 2000.0, 1500.0, 1.0),
+    "gray matter": (950.0, 100.0, 70.0, 0.8),
+    "white matter": (600.0, 80.0, 60.0, 0.7),
+    "lesion": (1200.0, 150.0, 100.0, 0.85),
+    # Shepp–Logan labels mapped onto the tissues they stand for
+    "skull": (250.0, 70.0, 50.0, 0.9),
+    "brain": (950.0, 100.0, 70.0, 0.8),
+    "ventricle": (4000.0, 2000.0, 1500.0, 1.0),
+}
+
+BRAIN_TISSUES = ("background", "scalp", "csf", "gray matter", "white matter")
+
+
+def _classify_intensities(values, num_classes, iterations=20):
+    # 1D k-means from evenly spaced quantiles; returns the class of every value, darkest first
+    centers = np.quantile(values, (np.arange(num_classes) + 0.5) / num_classes)
+    for _ in range(iterations):
+        classes = np.argmin(np.abs(values[:, None] - centers[None, :]), axis=1)
+        sums = np.bincount(classes, weights=values, minlength=num_classes)
+        counts = np.bincount(classes, minlength=num_classes)
+        centers = np.where(counts > 0, sums / np.maximum(counts, 1), centers)
+    return classes
+
+
+def segment_brain(asset_path, quarter_turns=0, resolution=256):
+    """
+    Tissue labels (indices into ``BRAIN_TISSUES``) of a T1-weighted asset image.
+
+    Inside the brain mask, intensities split into CSF, gray and white matter from
+    dark to bright; bright pixels outside it are scalp.
+    """
+    asset_path = Path(asset_path)
+    image = load_grayscale(asset_path, quarter_turns, resolution)
+    brain = BrainMask.load(asset_path, quarter_turns, resolution=resolution).mask
+
+    labels = np.zeros(image.shape, dtype=np.uint8)
+    labels[~brain & (image > 0.5 * image[brain].mean())] = BRAIN_TISSUES.index("scalp")
+    labels[brain] = BRAIN_TISSUES.index("csf") + _classify_intensities(image[brain], 3)
+    return labels
+
+
+class TissueMaps:
+    """Per-pixel T1, T2, T2* (ms) and proton density, plus the tissue labels they came from."""
+
+    def __init__(self, labels, tissue_names):
+        self.labels = np.asarray(labels)
+        self.tissue_names = tuple(tissue_names)
+        table = np.array([TISSUE_PARAMETERS[name] for name in self.tissue_names])
+        self.t1, self.t2, self.t2_star, self.proton_density = np.moveaxis(table[self.labels], -1, 0)
+
+    @classmethod
+    def from_phantom(cls, resolution=256):
+        return cls(tissue_labels(resolution), TISSUES)
+
+    @classmethod
+    def from_image(cls, asset_path, quarter_turns=0, resolution=256):
+        return cls(segment_brain(asset_path, quarter_turns, resolution), BRAIN_TISSUES)
+
+    @property
+    def shape(self):
+        return self.labels.shape
+
+    def digest(self):
+        return hashlib.sha1(np.ascontiguousarray(self.labels).tobytes() + repr(self.tissue_names).encode()).hexdigest()
+
+    def tissue_means(self, images):
+        """Mean of ``images`` (any leading axes, then rows and cols) over each tissue, tissues last."""
+        images = np.asarray(images)
+        flat = images.reshape(-1, self.labels.size)
+        counts = np.bincount(self.labels.ravel(), minlength=len(self.tissue_names))
+        one_hot = self.labels.ravel()[:, None] == np.arange(len(self.tissue_names))[None, :]
+        means = (flat @ one_hot) / np.maximum(counts, 1)
+        return means.reshape(images.shape[:-2] + (len(self.tissue_names),))
+
+
+def weighted_images(maps, repetition_times, echo_times, flip_angles, spin_echo=False):
+    """
+    Steady-state signal for every (TR, TE, flip angle) of the grids, as a 5D memmap.
+
+    Uses the spoiled gradient-echo equation, with T2 in place of T2* when
+    ``spin_echo`` is set. The result has shape ``(TR, TE, flip, rows, cols)``; it is
+    computed as the product of a (TR, flip) part and a TE part broadcast straight into
+    a file under ``.cache``, so scrubbing any axis later is just indexing.
+    """
+    repetition_times = np.asarray(repetition_times, dtype=float)
+    echo_times = np.asarray(echo_times, dtype=float)
+    flip_angles = np.asarray(flip_angles, dtype=float)
+    decay = maps.t2 if spin_echo else maps.t2_star
+
+    def fill(out):
+        e1 = np.exp(-repetition_times[:, None, None, None, None] / maps.t1)
+        sin_flip = np.sin(flip_angles)[None, None, :, None, None]
+        cos_flip = np.cos(flip_angles)[None, None, :, None, None]
+        longitudinal = maps.proton_density * sin_flip * (1 - e1) / (1 - cos_flip * e1)
+        transverse = np.exp(-echo_times[None, :, None, None, None] / decay)
+        np.multiply(longitudinal, transverse, out=out)
+
+    shape = (len(repetition_times), len(echo_times), len(flip_angles)) + maps.shape
+    return cached_memmap(
+        "contrast",
+        (maps.digest(), repetition_times.tobytes(), echo_times.tobytes(), flip_angles.tobytes(), spin_echo),
+        shape,
+        np.float32,
+        fill
+    )
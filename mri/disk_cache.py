@@ -0,0 +1,83 @@
+from pathlib import Path
+import hashlib
+import os
+
+import numpy as np
+
+
+CACHE_DIR = Path(".cache")
+
+_file_digests = {}
+
+
+def file_digest(path):
+    """SHA-1 of a file's contents, remembered for as long as its size and mtime stay the same."""
+    path = Path(path)
+    stat = path.stat()
+    key = (str(path.resolve()), stat.st_size, stat.st_mtime_ns)
+    if key not in _file_digests:
+        _file_digests[key] = hashlib.sha1(path.read_bytes()).hexdigest()
+    return _file_digests[key]
+
+
+def cache_key(*parts):
+    return hashlib.sha1(repr(parts).encode()).hexdigest()[:20]
+
+
+def cache_path(namespace, key_parts, suffix=".npy"):
+    return CACHE_DIR / namespace / f"{cache_key(*key_parts)}{suffix}"
+
+
+def _write_atomically(path, write):
+    path.parent.mkdir(parents=True, exist_ok=True)
+    temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+    with open(temporary_path, "wb") as file:
+        write(file)
+    os.replace(temporary_path, path)
+
+
+def cached_array(namespace, key_parts, compute):
+    """
+    Load an array from ``.cache/<namespace>/`` or compute and store it.
+
+    ``key_parts`` should include everything the result depends on (file digests,
+    resolutions, settings), so a change in any of them produces a new entry.
+    """
+    path = cache_path(namespace, key_parts)
+    if path.exists():
+        return np.load(path)
+
+    array = np.asarray(compute())
+    _write_atomically(path, lambda file: np.save(file, array))
+    return array
+
+
+def cached_arrays(namespace, key_parts, compute):
+    """Like ``cached_array`` for a dict of arrays, stored together as one ``.npz``."""
+    path = cache_path(namespace, key_parts, suffix=".npz")
+    if path.exists():
+        with np.load(path) as stored:
+            return {name: stored[name] for name in stored.files}
+
+    arrays = {name: np.asarray(value) for name, value in compute().items()}
+    _write_atomically(path, lambda file: np.savez(file, **arrays))
+    return arrays
+
+
+def cached_memmap(namespace, key_parts, shape, dtype, fill):
+    """
+    A read-only memory-mapped ``.npy`` array from ``.cache/<namespace>/``.
+
+    On a miss, ``fill(out)`` writes the contents straight into a writable memmap of
+    ``shape`` and ``dtype``, so arrays larger than memory never exist as a whole in RAM.
+    """
+    path = cache_path(namespace, key_parts)
+    if not path.exists():
+        path.parent.mkdir(parents=True, exist_ok=True)
+        temporary_path = path.with_name(f".{path.name}.{os.getpid()}.tmp")
+        out = np.lib.format.open_memmap(temporary_path, mode="w+", dtype=dtype, shape=tuple(shape))
+        fill(out)
+        out.flush()
+        del out
+        os.replace(temporary_path, path)
+    return np.load(path, mmap_mode="r")
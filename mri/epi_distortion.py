@@ -0,0 +1,122 @@
+import hashlib
+
+import numpy as np
+
+from mri.disk_cache import cached_array
+from mri.kspace import inverse_spectrum
+
+
+TAU = 2 * np.pi
+
+
+class EPITiming:
+    """
+    When each phase-encode line of an EPI readout is acquired.
+
+    Line ``n`` is read out at ``first_echo + n * echo_spacing``, at the middle of its
+    frequency-encoding window. Times are in the same units as the field map's
+    inverse (cycles per unit time).
+    """
+
+    def __init__(self, first_echo, echo_spacing):
+        self.first_echo = float(first_echo)
+        self.echo_spacing = float(echo_spacing)
+
+    @classmethod
+    def from_sequence(cls, sequence):
+        # Echoes fall at the middle of each ADC window of a PulseSequence
+        starts, durations, _ = sequence.events("adc")
+        echo_spacing = np.diff(starts).mean() if len(starts) > 1 else 0.0
+        return cls(starts[0] + durations[0] / 2, echo_spacing)
+
+    def with_echo_spacing(self, echo_spacing):
+        return EPITiming(self.first_echo, echo_spacing)
+
+    def key(self):
+        return self.first_echo, self.echo_spacing
+
+
+def susceptibility_field_map(shape, strength=0.03, seed=None):
+    """
+    A smooth synthetic off-resonance map in cycles per unit time, shaped like ``shape``.
+
+    Two lobes near the front of the head stand in for the air–tissue boundaries of
+    the sinuses, on top of a weak linear shim error.
+    """
+    rows, cols = shape
+    y = (rows // 2 - np.arange(rows))[:, None] * (2 / rows)
+    x = (np.arange(cols) - cols // 2)[None, :] * (2 / cols)
+
+    lobes = (np.exp(-((x - 0.25) ** 2 + (y - 0.55) ** 2) / 0.04)
+             - 0.7 * np.exp(-((x + 0.25) ** 2 + (y - 0.5) ** 2) / 0.05))
+    return strength * (lobes + 0.15 * y)
+
+
+class EPIDistortion:
+    """
+    EPI reconstruction of an image whose spins precess at a field map's off-resonance.
+
+    Every phase-encode line picks up the phase ``2π Δf(y, x) t_n`` accumulated by the
+    time it is read. Time within a line is neglected, so the distortion appears along
+    the phase-encode direction only, where the low bandwidth per pixel makes it large.
+    Lines are encoded in chunks of ``chunk_size``, one einsum each, so at most a chunk
+    of lines' phase factors is held at once. Within a chunk they are built from powers
+    of the per-line factor ``exp(-2πi Δf Δt)``, a multiplication per pixel and line
+    instead of an exponential. The phase gained by the first echo is the same for
+    every echo spacing, so it is applied to the image once per ``first_echo`` and
+    kept; a sweep over echo spacings then only builds the per-line ramps. Whole sweeps
+    are cached on disk per field map and timing.
+    """
+
+    def __init__(self, image, field_map, chunk_size=32):
+        self.image = np.asarray(image, dtype=float)
+        self.field_map = np.asarray(field_map, dtype=float)
+        self.chunk_size = chunk_size
+        rows = self.image.shape[0]
+
+        # Centered ky against centered y, matching mri.kspace.spectrum along the rows
+        ky = np.arange(rows) - rows // 2
+        y = np.arange(rows) - rows // 2
+        self.encoding = np.exp(-1j * TAU * np.outer(ky, y) / rows)
+        # Off-resonance in radians per unit time, the only part of the phase that is per pixel
+        self.angular_frequency = TAU * self.field_map
+        self._first_echo_images = {}
+
+    def first_echo_image(self, first_echo):
+        """The image with the off-resonance phase it has gained by ``first_echo``, kept per echo time."""
+        if first_echo not in self._first_echo_images:
+            self._first_echo_images[first_echo] = self.image * np.exp(-1j * first_echo * self.angular_frequency)
+        return self._first_echo_images[first_echo]
+
+    def hybrid_kspace(self, timing):
+        # (ky, x): each line sums its column through the encoding and the phase gained since the first echo
+        weighted = self.first_echo_image(timing.first_echo)
+        step = np.exp(-1j * timing.echo_spacing * self.angular_frequency)
+        kspace = np.empty((len(self.encoding), self.image.shape[1]), dtype=complex)
+        for start in range(0, len(self.encoding), self.chunk_size):
+            encoding = self.encoding[start:start + self.chunk_size]
+            # The chunk's first line, then one more echo spacing per line: each pass doubles the
+            # filled lines by multiplying them with the factor for as many spacings
+            ramps = np.empty((len(encoding),) + step.shape, dtype=complex)
+            ramps[0] = weighted * np.exp(-1j * start * timing.echo_spacing * self.angular_frequency)
+            filled, factor = 1, step
+            while filled < len(ramps):
+                count = min(filled, len(ramps) - filled)
+                np.multiply(ramps[:count], factor, out=ramps[filled:filled + count])
+                filled, factor = filled + count, factor * factor
+            kspace[start:start + len(encoding)] = np.einsum("ny,nyx->nx", encoding, ramps, optimize=True)
+        return kspace
+
+    def reconstruct(self, timing):
+        """The distorted magnitude image an EPI readout with ``timing`` would produce."""
+        return np.abs(inverse_spectrum(self.hybrid_kspace(timing), axes=(0,)))
+
+    def sweep(self, timings):
+        """Distorted images for several timings, stacked ``(timings, rows, cols)`` and cached on disk."""
+        digests = tuple(hashlib.sha1(np.ascontiguousarray(array).tobytes()).hexdigest()
+                        for array in (self.image, self.field_map))
+        return cached_array(
+            "epi_distortion",
+            (digests, tuple(timing.key() for timing in timings)),
+            lambda: np.stack([self.reconstruct(timing) for timing in timings])
+        )
@@ -0,0 +1,81 @@
+from manim import Animation, VMobject, WHITE, linear
+import numpy as np
+
+from mri.plotting import coords_to_points
+
+
+def step_outlines(axes, start_time, duration, amplitudes):
+    """
+    Control points of one closed rectangle per amplitude, shaped ``(steps, 16, 3)``.
+
+    Each rectangle runs from the time axis up (or down) to its amplitude between
+    ``start_time`` and ``start_time + duration``; all of them come out of a single
+    vectorized pass.
+    """
+    amplitudes = np.asarray(amplitudes, dtype=float)
+    times = start_time + duration * np.array([0, 0, 1, 1])
+    levels = amplitudes[:, None] * np.array([0, 1, 1, 0])
+    corners = coords_to_points(axes, np.broadcast_to(times, levels.shape), levels)
+    ends = np.roll(corners, -1, axis=1)
+    thirds = np.linspace(0, 1, 4)[:, None]
+    segments = corners[:, :, None, :] + thirds * (ends - corners)[:, :, None, :]
+    return segments.reshape(len(amplitudes), 16, 3)
+
+
+class GradientTable(VMobject):
+    """
+    Every step of a gradient table (e.g. phase encoding) drawn as one VMobject.
+
+    The steps share one set of points, so a 256-step table costs one fill and one
+    stroke. The current step is a child VMobject whose 16 points are copied from
+    the table whenever the step changes.
+    """
+
+    def __init__(self, axes, start_time, duration, amplitudes, color=WHITE, fill_opacity=0.3,
+                 outline_color=WHITE, stroke_width=1.5, **kwargs):
+        super().__init__(**kwargs)
+        self.amplitudes = np.asarray(amplitudes, dtype=float)
+        self.step_points = step_outlines(axes, start_time, duration, self.amplitudes)
+        self.current_step = None
+
+        self.set_points(self.step_points.reshape(-1, 3))
+        self.set_fill(color, opacity=fill_opacity)
+        self.set_stroke(outline_color, width=stroke_width)
+
+        self.highlight = VMobject()
+        self.highlight.set_fill(color, opacity=1)
+        self.highlight.set_stroke(outline_color, width=stroke_width)
+        self.add(self.highlight)
+
+    @property
+    def num_steps(self):
+        # Not __len__: manim reads a mobject's length as its number of submobjects
+        return len(self.amplitudes)
+
+    def set_step(self, step):
+        """Show ``step`` at full opacity, or no step for ``None``."""
+        if step is not None and not 0 <= step < self.num_steps:
+            raise IndexError(f"Step {step} is out of range for a table of {self.num_steps} steps")
+        if step == self.current_step:
+            return self
+        self.current_step = step
+        if step is None:
+            self.highlight.clear_points()
+        else:
+            self.highlight.set_points(self.step_points[step])
+        return self
+
+
+class StepGradientTable(Animation):
+    """Move a GradientTable's highlight through ``steps`` (every step, in order, by default)."""
+
+    def __init__(self, table, steps=None, rate_func=linear, **kwargs):
+        self.steps = np.arange(table.num_steps) if steps is None else np.asarray(steps)
+        super().__init__(table, rate_func=rate_func, **kwargs)
+
+    def create_starting_mobject(self):
+        return self.mobject
+
+    def interpolate_mobject(self, alpha):
+        index = min(int(self.rate_func(alpha) * len(self.steps)), len(self.steps) - 1)
+        self.mobject.set_step(int(self.steps[index]))
@@ -0,0 +1,195 @@
+from pathlib import Path
+
+from manim import BLACK, WHITE, color_to_rgb
+import numpy as np
+from PIL import Image
+
+from mri.disk_cache import cached_array, file_digest
+
+
+def _asset_path(asset_path):
+    asset_path = Path(asset_path)
+    if not asset_path.suffix:
+        asset_path = asset_path.with_suffix(".png")
+    return asset_path
+
+
+def load_grayscale(asset_path, quarter_turns=0, resolution=None):
+    """
+    An asset image as floats in [0, 1], in the orientation it is displayed in.
+
+    With ``resolution`` the image is box-filtered so its longest side has that many
+    pixels; otherwise it keeps its own size.
+    """
+    image = Image.open(_asset_path(asset_path)).convert("L")
+    if resolution is not None:
+        scale = resolution / max(image.size)
+        image = image.resize((max(1, round(image.size[0] * scale)), max(1, round(image.size[1] * scale))), Image.BOX)
+    return np.rot90(np.asarray(image, dtype=float) / 255, quarter_turns)
+
+
+def spectrum(image):
+    """Centered 2D Fourier transform: k = 0 sits in the middle of the array."""
+    return np.fft.fftshift(np.fft.fft2(np.fft.ifftshift(image, axes=(-2, -1))), axes=(-2, -1))
+
+
+def inverse_spectrum(kspace, axes=(-2, -1)):
+    """Inverse of ``spectrum``, also usable along a single axis."""
+    return np.fft.fftshift(np.fft.ifftn(np.fft.ifftshift(kspace, axes=axes), axes=axes), axes=axes)
+
+
+def image_spectrum(asset_path, quarter_turns=0, resolution=None):
+    """Centered k-space of an asset image, cached on disk like ``kspace_pixels``."""
+    asset_path = _asset_path(asset_path)
+    return cached_array(
+        "spectra",
+        (file_digest(asset_path), quarter_turns % 4, resolution),
+        lambda: spectrum(load_grayscale(asset_path, quarter_turns, resolution))
+    )
+
+
+def log_magnitude(kspace, dynamic_range=6.5):
+    """
+    Log magnitude of ``kspace`` windowed to [0, 1].
+
+    The top of the window is the peak (normally k = 0) and the bottom sits
+    ``dynamic_range`` decades below it.
+    """
+    magnitude = np.abs(kspace)
+    decades = np.log10(np.maximum(magnitude, magnitude.max() * 10.0 ** -(dynamic_range + 1)) + 1e-300)
+    return np.clip((decades - decades.max()) / dynamic_range + 1, 0, 1)
+
+
+def lookup_table(colors=(BLACK, WHITE), size=256):
+    """RGBA uint8 table of ``size`` entries blending evenly through ``colors``."""
+    anchors = np.array([color_to_rgb(color) for color in colors])
+    position = np.linspace(0, len(anchors) - 1, size)
+    index = np.minimum(position.astype(int), len(anchors) - 2)
+    alpha = (position - index)[:, None]
+    rgbs = anchors[index] + alpha * (anchors[index + 1] - anchors[index])
+
+    table = np.full((size, 4), 255, dtype=np.uint8)
+    table[:, :3] = np.rint(255 * rgbs)
+    return table
+
+
+def apply_lookup_table(values, table):
+    # Values in [0, 1] to RGBA pixels with a single fancy-indexing pass
+    indices = np.rint(np.clip(values, 0, 1) * (len(table) - 1)).astype(np.intp)
+    return table[indices]
+
+
+def kspace_pixels(asset_path, quarter_turns=0, resolution=None, dynamic_range=6.5, colors=(BLACK, WHITE)):
+    """
+    RGBA k-space picture of an asset image, ready for an ImageMobject.
+
+    Cached on disk under the image's content hash, orientation, resolution and
+    display settings, so repeat renders skip the FFT and any change regenerates it.
+    """
+    asset_path = _asset_path(asset_path)
+    colors = tuple(str(color) for color in colors)
+
+    def compute():
+        kspace = image_spectrum(asset_path, quarter_turns, resolution)
+        return apply_lookup_table(log_magnitude(kspace, dynamic_range), lookup_table(colors))
+
+    return cached_array(
+        "kspace",
+        (file_digest(asset_path), quarter_turns % 4, resolution, dynamic_range, colors),
+        compute
+    )
+
+
+def sampling_order(num_lines, order="linear", seed=0):
+    """
+    The order in which k-space lines are acquired.
+
+    ``"linear"`` sweeps from one edge to the other, ``"centric"`` starts at k = 0 and
+    alternates outwards, and ``"random"`` is a seeded shuffle.
+    """
+    lines = np.arange(num_lines)
+    if order == "linear":
+        return lines
+    if order == "centric":
+        return lines[np.argsort(np.abs(lines - num_lines // 2), kind="stable")]
+    if order == "random":
+        return np.random.default_rng(seed).permutation(num_lines)
+    raise ValueError(f"Unknown sampling order: {order!r}")
+
+
+class ProgressiveReconstruction:
+    """
+    An image rebuilt from k-space as lines or single samples are acquired.
+
+    The inverse FFT is linear, so each new line adds its 1D inverse FFT along kx,
+    spread over the image by that line's ky basis profile, to a running buffer. A
+    line costs O(width * height) instead of a full 2D inverse FFT, and lines can
+    arrive in any order.
+    """
+
+    def __init__(self, kspace):
+        self.kspace = np.asarray(kspace, dtype=complex)
+        rows, cols = self.kspace.shape
+        # Column r is the image-space profile of k-space row r (likewise for columns)
+        self.row_basis = inverse_spectrum(np.eye(rows), axes=(0,))
+        self.col_basis = inverse_spectrum(np.eye(cols), axes=(0,))
+        self.image = np.zeros((rows, cols), dtype=complex)
+        self.acquired = np.zeros((rows, cols), dtype=bool)
+
+    def acquire_lines(self, rows):
+        rows = np.unique(rows)
+        rows = rows[~self.acquired[rows].all(axis=1)]
+        if len(rows) == 0:
+            return self
+        # Only samples not already in the buffer contribute
+        new_samples = np.where(self.acquired[rows], 0, self.kspace[rows])
+        lines = inverse_spectrum(new_samples, axes=(1,))
+        self.image += self.row_basis[:, rows] @ lines
+        self.acquired[rows] = True
+        return self
+
+    def acquire_samples(self, rows, cols):
+        samples = np.unique(np.ravel_multi_index((rows, cols), self.kspace.shape))
+        rows, cols = np.unravel_index(samples[~self.acquired.flat[samples]], self.kspace.shape)
+        # Sum of rank-one updates, one per sample, as a single matrix product
+        self.image += (self.row_basis[:, rows] * self.kspace[rows, cols]) @ self.col_basis[:, cols].T
+        self.acquired[rows, cols] = True
+        return self
+
+    def magnitude(self, out=None):
+        return np.abs(self.image, out=out)
+
+
+def sweep_reconstructions(image, fov_scales, kmax_fractions):
+    """
+    k-space and reconstructions of ``image`` for a sweep of sampling settings.
+
+    Step ``i`` samples ky at ``fov_scales[i]`` times the native spacing (so the field
+    of view shrinks by that factor and the object wraps around) and keeps only
+    ``|k| <= kmax_fractions[i]`` of the native extent. All variants are built as one
+    stacked array and reconstructed with a single batched inverse FFT; returns
+    ``(kspace, images)``, both shaped ``(steps, rows, cols)``.
+    """
+    image = np.asarray(image, dtype=float)
+    rows, cols = image.shape
+    fov_scales = np.asarray(fov_scales, dtype=float)
+    kmax_fractions = np.asarray(kmax_fractions, dtype=float)
+
+    # kx is always fully sampled, so its transform is shared by every step
+    rows_spectrum = np.fft.fftshift(np.fft.fft(np.fft.ifftshift(image, axes=1), axis=1), axes=1)
+
+    # ky is sampled off the native grid: one DFT matrix per distinct spacing
+    unique_scales, scale_index = np.unique(fov_scales, return_inverse=True)
+    ky = np.arange(rows) - rows // 2
+    y = np.arange(rows) - rows // 2
+    dft = np.exp(-2j * np.pi * unique_scales[:, None, None] * np.outer(ky, y)[None] / rows)
+    kspace = (dft @ rows_spectrum)[scale_index]
+
+    # Truncate to a centered box, with k measured in units of the native Nyquist limit. Wider
+    # ky spacing reaches further out, but there is no data past the native limit to sample.
+    ky_fraction = np.abs(ky)[None, :] * fov_scales[:, None] / (rows / 2)
+    kx_fraction = np.abs(np.arange(cols) - cols // 2) / (cols / 2)
+    kmax = np.minimum(kmax_fractions, 1)[:, None, None]
+    kspace *= np.maximum(ky_fraction[:, :, None], kx_fraction[None, None, :]) <= kmax
+
+    return kspace, np.abs(inverse_spectrum(kspace))
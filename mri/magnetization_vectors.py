@@ -0,0 +1,108 @@
+from manim import DEGREES, VMobject
+import numpy as np
+
+
+TAU = 2 * np.pi
+
+
+def _segments(starts, ends):
+    # Straight cubic Bézier segments between matching rows of ``starts`` and ``ends``
+    thirds = np.linspace(0, 1, 4)[:, None]
+    starts = np.asarray(starts)[..., None, :]
+    ends = np.asarray(ends)[..., None, :]
+    return starts + thirds * (ends - starts)
+
+
+def screen_projection(elevation=20 * DEGREES, azimuth=-30 * DEGREES):
+    """
+    A 3x3 matrix taking magnetization vectors (rows, z longitudinal) to screen offsets.
+
+    The view is orthographic: the transverse plane is turned by ``azimuth`` and then
+    tipped towards the viewer by ``elevation``, with z kept pointing up the screen.
+    """
+    screen_x = [np.cos(azimuth), np.sin(azimuth), 0]
+    screen_y = [-np.sin(elevation) * np.sin(azimuth), np.sin(elevation) * np.cos(azimuth), np.cos(elevation)]
+    return np.column_stack([screen_x, screen_y, np.zeros(3)])
+
+
+def precess(magnetization, angles, out=None):
+    """Rotate Nx3 magnetization vectors about z by per-spin ``angles``."""
+    if out is None:
+        out = np.empty_like(magnetization)
+    cos_angle, sin_angle = np.cos(angles), np.sin(angles)
+    mx, my = magnetization[:, 0].copy(), magnetization[:, 1].copy()
+    out[:, 0] = cos_angle * mx - sin_angle * my
+    out[:, 1] = sin_angle * mx + cos_angle * my
+    out[:, 2] = magnetization[:, 2]
+    return out
+
+
+class MagnetizationVectors(VMobject):
+    """
+    Every spin's magnetization drawn as a 3D arrow, projected flat in one pass.
+
+    The vectors live in an Nx3 array. A redraw is one matrix multiply by the screen
+    projection followed by array arithmetic for the tips, written straight into
+    ``points``; the precession cones traced by the tips are a second VMobject built
+    the same way.
+    """
+
+    def __init__(self, magnetization, origins, length=0.5, tip_length=0.1, projection=None, show_cones=True,
+                 cone_samples=24, cone_opacity=0.35, stroke_width=4, **kwargs):
+        super().__init__(stroke_width=stroke_width, fill_opacity=1, **kwargs)
+        self.magnetization = np.array(magnetization, dtype=float)
+        self.origins = np.asarray(origins, dtype=float)
+        self.length = length
+        self.tip_length = tip_length
+        self.projection = screen_projection() if projection is None else projection
+
+        self.cones = None
+        if show_cones:
+            # A unit circle in the transverse plane and the unit z offset, both already projected
+            angles = np.linspace(0, TAU, cone_samples + 1)
+            circle = np.column_stack([np.cos(angles), np.sin(angles), np.zeros_like(angles)])
+            self.cone_template = _segments(circle[:-1], circle[1:]).reshape(-1, 3) @ self.projection
+            self.cone_lift = np.array([0, 0, 1.0]) @ self.projection
+            self.cones = VMobject(
+                stroke_color=self.get_stroke_color(), stroke_width=1.5, stroke_opacity=cone_opacity, fill_opacity=0
+            )
+            self.add(self.cones)
+
+        self.update_vectors()
+
+    def set_magnetization(self, magnetization, phase_offset=0.0):
+        if phase_offset:
+            precess(np.asarray(magnetization, dtype=float), phase_offset, out=self.magnetization)
+        else:
+            self.magnetization[:] = magnetization
+        return self.update_vectors()
+
+    def update_vectors(self):
+        screen = self.length * (self.magnetization @ self.projection)
+        ends = self.origins + screen
+
+        # Tips shrink with vectors that point (nearly) at the viewer
+        screen_length = np.linalg.norm(screen, axis=1)
+        tip_length = np.minimum(self.tip_length, screen_length)
+        direction = screen / np.maximum(screen_length, 1e-9)[:, None]
+        across = np.column_stack([-direction[:, 1], direction[:, 0], np.zeros(len(direction))])
+        tip_base = ends - tip_length[:, None] * direction
+        half_width = (tip_length / np.sqrt(3))[:, None] * across
+
+        left, right = tip_base - half_width, tip_base + half_width
+        arrows = np.concatenate([
+            _segments(left, ends),
+            _segments(ends, right),
+            _segments(right, left),
+            _segments(self.origins, tip_base),
+        ], axis=1)
+        self.points = arrows.reshape(-1, 3)
+
+        if self.cones is not None:
+            transverse = self.length * np.hypot(self.magnetization[:, 0], self.magnetization[:, 1])
+            height = self.length * self.magnetization[:, 2]
+            cones = (self.origins[:, None, :] + height[:, None, None] * self.cone_lift
+                     + transverse[:, None, None] * self.cone_template[None])
+            self.cones.points = cones.reshape(-1, 3)
+        return self
+
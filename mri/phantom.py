@@ -0,0 +1,127 @@
+from functools import lru_cache
+
+import numpy as np
+from scipy.special import j1
+
+
+TISSUES = ("background", "skull", "brain", "ventricle", "lesion")
+
+# Modified Shepp–Logan phantom (Toft): intensity, semi-axes (a, b, c), center (x, y, z),
+# rotation about z in degrees and tissue label. Coordinates span [-1, 1] on every axis;
+# the 2D phantom uses the in-plane parameters alone, as in the classic 2D table.
+SHEPP_LOGAN = (
+    (1.0, 0.6900, 0.920, 0.810, 0.00, 0.0000, 0.00, 0, "skull"),
+    (-0.8, 0.6624, 0.874, 0.780, 0.00, -0.0184, 0.00, 0, "brain"),
+    (-0.2, 0.1100, 0.310, 0.220, 0.22, 0.0000, 0.00, -18, "ventricle"),
+    (-0.2, 0.1600, 0.410, 0.280, -0.22, 0.0000, 0.00, 18, "ventricle"),
+    (0.1, 0.2100, 0.250, 0.410, 0.00, 0.3500, -0.15, 0, "lesion"),
+    (0.1, 0.0460, 0.046, 0.050, 0.00, 0.1000, 0.25, 0, "lesion"),
+    (0.1, 0.0460, 0.046, 0.050, 0.00, -0.1000, 0.25, 0, "lesion"),
+    (0.1, 0.0460, 0.023, 0.050, -0.08, -0.6050, 0.00, 0, "lesion"),
+    (0.1, 0.0230, 0.023, 0.020, 0.00, -0.6060, 0.00, 0, "lesion"),
+    (0.1, 0.0230, 0.046, 0.020, 0.06, -0.6050, 0.00, 0, "lesion"),
+)
+
+
+def pixel_coordinates(resolution):
+    """
+    Coordinates of pixel centers along one axis, in the phantom's [-1, 1] units.
+
+    Index ``resolution // 2`` sits exactly at 0, matching the centered FFTs in
+    ``mri.kspace`` so analytic and numerical k-space agree in phase.
+    """
+    return (np.arange(resolution) - resolution // 2) * (2 / resolution)
+
+
+def _rasterize(resolution, dimensions):
+    # Images are indexed (row, col) or (slice, row, col): rows run down the screen, so y is flipped
+    coordinate = pixel_coordinates(resolution)
+    shape = (resolution,) * dimensions
+    image = np.zeros(shape)
+    labels = np.zeros(shape, dtype=np.uint8)
+
+    for intensity, a, b, c, x0, y0, z0, angle, tissue in SHEPP_LOGAN:
+        cos_angle, sin_angle = np.cos(np.radians(angle)), np.sin(np.radians(angle))
+
+        # Only evaluate the ellipse's bounding box; small features cost almost nothing
+        reach = max(a, b)
+        cols = np.flatnonzero(np.abs(coordinate - x0) <= reach)
+        rows = np.flatnonzero(np.abs(-coordinate - y0) <= reach)
+        x = coordinate[cols][None, :] - x0
+        y = -coordinate[rows][:, None] - y0
+        u = (cos_angle * x + sin_angle * y) / a
+        v = (-sin_angle * x + cos_angle * y) / b
+        radius = u ** 2 + v ** 2
+
+        if dimensions == 2:
+            inside = radius <= 1
+            window = np.ix_(rows, cols)
+        else:
+            slices = np.flatnonzero(np.abs(coordinate - z0) <= c)
+            w = (coordinate[slices][:, None, None] - z0) / c
+            inside = radius[None] + w ** 2 <= 1
+            window = np.ix_(slices, rows, cols)
+
+        image[window] += intensity * inside
+        labels[window] = np.where(inside, TISSUES.index(tissue), labels[window])
+
+    image.setflags(write=False)
+    labels.setflags(write=False)
+    return image, labels
+
+
+@lru_cache(maxsize=8)
+def shepp_logan(resolution=256):
+    """The 2D modified Shepp–Logan phantom as a read-only ``(resolution, resolution)`` array."""
+    return _rasterize(resolution, 2)[0]
+
+
+@lru_cache(maxsize=8)
+def tissue_labels(resolution=256):
+    """Index into ``TISSUES`` of the topmost ellipse at every pixel of ``shepp_logan``."""
+    return _rasterize(resolution, 2)[1]
+
+
+@lru_cache(maxsize=2)
+def shepp_logan_3d(resolution=128):
+    """The 3D phantom as read-only ``(image, labels)`` volumes indexed (z, row, col)."""
+    return _rasterize(resolution, 3)
+
+
+def shepp_logan_transform(kx, ky):
+    """
+    Exact Fourier transform of the continuous 2D phantom at arbitrary ``(kx, ky)``.
+
+    ``k`` is in cycles per field of view, with ky pointing up the image. Each ellipse
+    transforms to a jinc, ``a * b * J1(2πκ) / κ``, shifted by its center.
+    """
+    # The field of view is 2 units wide, so one cycle per FOV is half a cycle per unit
+    kx = np.asarray(kx, dtype=float) / 2
+    ky = np.asarray(ky, dtype=float) / 2
+
+    transform = np.zeros(np.broadcast(kx, ky).shape, dtype=complex)
+    for intensity, a, b, c, x0, y0, z0, angle, tissue in SHEPP_LOGAN:
+        cos_angle, sin_angle = np.cos(np.radians(angle)), np.sin(np.radians(angle))
+        ku = a * (cos_angle * kx + sin_angle * ky)
+        kv = b * (-sin_angle * kx + cos_angle * ky)
+        kappa = np.hypot(ku, kv)
+        jinc = np.where(kappa > 0, j1(2 * np.pi * kappa) / np.where(kappa > 0, kappa, 1), np.pi)
+        shift = np.exp(-2j * np.pi * (kx * x0 + ky * y0))
+        transform += intensity * a * b * jinc * shift
+    return transform
+
+
+@lru_cache(maxsize=8)
+def shepp_logan_kspace(resolution=256):
+    """
+    Exact k-space of the continuous 2D phantom, sampled on the grid of ``mri.kspace.spectrum``.
+
+    Scaled by the pixel area so it lines up with the FFT of ``shepp_logan(resolution)``.
+    """
+    # Rows of the k-space array run against ky, like the rows of the image against y
+    k = np.arange(resolution) - resolution // 2
+    pixel_area = (2 / resolution) ** 2
+
+    kspace = shepp_logan_transform(k[None, :], -k[:, None]) / pixel_area
+    kspace.setflags(write=False)
+    return kspace
@@ -0,0 +1,58 @@
+from manim import color_to_rgb, rgb_to_color
+import numpy as np
+
+
+TAU = 2 * np.pi
+
+
+class PhaseColormap:
+    """
+    A lookup table from spin phase to color.
+
+    Phases are mapped to a position in [0, 1) so that 0 and 1 meet where an arrow
+    points straight down; with two bins the first half of the table holds
+    left-pointing arrows and the second half right-pointing ones.
+    """
+
+    def __init__(self, rgbs):
+        self.rgbs = np.asarray(rgbs, dtype=float)
+        self.colors = [rgb_to_color(rgb) for rgb in self.rgbs]
+
+    @classmethod
+    def left_right(cls, left_color, right_color):
+        return cls([color_to_rgb(left_color), color_to_rgb(right_color)])
+
+    @classmethod
+    def linear(cls, start_color, end_color, num_bins=32):
+        # Straight blend between two colors, with a seam where arrows point down
+        alpha = (np.arange(num_bins) + 0.5) / num_bins
+        start, end = color_to_rgb(start_color), color_to_rgb(end_color)
+        return cls(start + alpha[:, None] * (end - start))
+
+    @classmethod
+    def cyclic(cls, colors, num_bins=32):
+        # Blend through ``colors`` and back to the first one, so there is no seam
+        anchors = np.array([color_to_rgb(color) for color in colors] + [color_to_rgb(colors[0])])
+        position = (np.arange(num_bins) + 0.5) / num_bins * (len(anchors) - 1)
+        index = np.minimum(position.astype(int), len(anchors) - 2)
+        alpha = (position - index)[:, None]
+        return cls(anchors[index] + alpha * (anchors[index + 1] - anchors[index]))
+
+    @classmethod
+    def hues(cls, num_bins=64):
+        # Full-saturation hue wheel, for density renders where hue alone carries the phase
+        hue = (np.arange(num_bins) + 0.5) / num_bins
+        channel_offsets = np.array([0, 2 / 3, 1 / 3])
+        return cls(np.clip(np.abs((hue[:, None] + channel_offsets) % 1 * 6 - 3) - 1, 0, 1))
+
+    def __len__(self):
+        return len(self.rgbs)
+
+    def positions(self, phase):
+        return (0.5 - np.asarray(phase) / TAU) % 1.0
+
+    def bin_indices(self, phase):
+        return np.minimum((self.positions(phase) * len(self)).astype(int), len(self) - 1)
+
+    def rgbs_for(self, phase):
+        return self.rgbs[self.bin_indices(phase)]
@@ -0,0 +1,31 @@
+import numpy as np
+
+
+TAU = 2 * np.pi
+
+
+def phase_encode_steps(num_steps):
+    # k_y indices of a centered Cartesian table, e.g. -64..63 for 128 steps
+    return np.arange(num_steps) - num_steps // 2
+
+
+def phase_encode_table(y, num_steps, fov):
+    """
+    Phase of every spin after every phase-encode step, shape ``(num_steps, spins)``.
+
+    Step ``k`` winds ``k`` full cycles of phase across a field of view ``fov``, which is
+    what a G_y lobe with area ``k / (gamma * fov)`` does to spins at positions ``y``.
+    """
+    k_y = phase_encode_steps(num_steps) / fov
+    return TAU * np.outer(k_y, np.asarray(y, dtype=float))
+
+
+def phase_encode_preview(num_steps, height):
+    """
+    Grayscale stripe pattern of every step, shape ``(num_steps, height)``.
+
+    Row ``k`` is ``cos`` of the step's phase sampled top to bottom across the field of
+    view, ready to be broadcast into an image column by column.
+    """
+    y = 0.5 - (np.arange(height) + 0.5) / height
+    return np.round(127.5 * (1 + np.cos(phase_encode_table(y, num_steps, 1.0)))).astype(np.uint8)
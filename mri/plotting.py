@@ -0,0 +1,59 @@
+from manim import WHITE, VMobject
+import numpy as np
+
+
+def coords_to_points(axes, x, y):
+    """Vectorized ``axes.c2p`` for linear axes: scene points for whole coordinate arrays."""
+    origin = axes.c2p(0, 0)
+    x_unit = axes.c2p(1, 0) - origin
+    y_unit = axes.c2p(0, 1) - origin
+    x = np.asarray(x, dtype=float)[..., None]
+    y = np.asarray(y, dtype=float)[..., None]
+    return origin + x * x_unit + y * y_unit
+
+
+def piecewise_coords(breakpoints, pieces, samples=2):
+    """
+    Coordinates tracing a function defined piece by piece.
+
+    ``pieces[i]`` holds on ``[breakpoints[i], breakpoints[i + 1]]`` and is either a
+    constant or a vectorized callable, evaluated on ``samples`` points of its piece
+    (two are exact for straight pieces). Both one-sided values are kept at every
+    breakpoint, so a step comes out as an exact vertical corner. When every piece
+    is a constant, as for a pulse train, no Python runs per piece.
+    """
+    breakpoints = np.asarray(breakpoints, dtype=float)
+    if not any(callable(piece) for piece in pieces):
+        x = np.repeat(breakpoints, 2)[1:-1]
+        y = np.repeat(np.asarray(pieces, dtype=float), 2)
+    else:
+        xs, ys = [], []
+        for start, end, piece in zip(breakpoints[:-1], breakpoints[1:], pieces):
+            x = np.linspace(start, end, samples if callable(piece) else 2)
+            xs.append(x)
+            ys.append(np.broadcast_to(piece(x) if callable(piece) else piece, x.shape).astype(float))
+        x, y = np.concatenate(xs), np.concatenate(ys)
+
+    # Drop the repeated point where neighbouring pieces meet without a step
+    keep = np.ones(len(x), dtype=bool)
+    keep[1:] = (np.diff(x) != 0) | (np.diff(y) != 0)
+    return x[keep], y[keep]
+
+
+def plot_piecewise(axes, breakpoints, pieces, samples=2, color=WHITE, stroke_width=4, fill_opacity=0):
+    """
+    A piecewise function drawn as one polyline on ``axes``; see ``piecewise_coords``.
+
+    With ``fill_opacity`` the outline is closed along the x axis and filled, which
+    gives the area under the curve.
+    """
+    x, y = piecewise_coords(breakpoints, pieces, samples)
+    if fill_opacity:
+        x = np.concatenate([[x[0]], x, [x[-1]]])
+        y = np.concatenate([[0], y, [0]])
+
+    curve = VMobject()
+    curve.set_points_as_corners(coords_to_points(axes, x, y))
+    curve.set_stroke(color, width=stroke_width)
+    curve.set_fill(color, opacity=fill_opacity)
+    return curve
@@ -0,0 +1,266 @@
+import numpy as np
+
+from mri.rf_pulses import SHAPES as RF_SHAPES, envelope
+from mri.signal_equation import kspace_from_gradients
+
+
+CHANNELS = ("rf", "gx", "gy", "gz", "adc")
+# Gradient lobes are trapezoids; RF pulses take their envelope from mri.rf_pulses
+SHAPES = ("trapezoid",) + RF_SHAPES
+
+# Event edges closer than this to a sample time count as falling on it
+TIME_TOLERANCE = 1e-9
+
+
+class PulseSequence:
+    """
+    A timeline of RF, gradient and ADC events, kept sorted by start time.
+
+    Each event is one entry in parallel arrays (channel, start, duration, amplitude,
+    ramp, shape), so sampling every waveform on a time grid is a handful of array
+    operations whatever the number of events. Gradient lobes are trapezoids whose
+    ``duration`` includes both ramps; a ramp of 0 gives a rectangle.
+    """
+
+    def __init__(self):
+        self.channel = np.empty(0, dtype=int)
+        self.start = np.empty(0)
+        self.duration = np.empty(0)
+        self.amplitude = np.empty(0)
+        self.ramp = np.empty(0)
+        self.shape = np.empty(0, dtype=int)
+
+    def __len__(self):
+        return len(self.start)
+
+    def copy(self):
+        sequence = PulseSequence()
+        sequence.channel = self.channel.copy()
+        sequence.start = self.start.copy()
+        sequence.duration = self.duration.copy()
+        sequence.amplitude = self.amplitude.copy()
+        sequence.ramp = self.ramp.copy()
+        sequence.shape = self.shape.copy()
+        return sequence
+
+    @property
+    def end(self):
+        return float((self.start + self.duration).max()) if len(self) else 0.0
+
+    def add(self, channel, start, duration, amplitude=1.0, shape="trapezoid", ramp=0.0):
+        """
+        Insert one event, or a batch of them when any of the numbers are arrays.
+
+        New events go after any that start at the same time; returns the sequence
+        for chaining.
+        """
+        start, duration, amplitude, ramp = np.broadcast_arrays(
+            *(np.atleast_1d(np.asarray(value, dtype=float)) for value in (start, duration, amplitude, ramp)))
+        count = len(start)
+        fields = {
+            "channel": np.full(count, CHANNELS.index(channel)),
+            "start": start,
+            "duration": duration,
+            "amplitude": amplitude,
+            "ramp": ramp,
+            "shape": np.full(count, SHAPES.index(shape)),
+        }
+        for name, values in fields.items():
+            setattr(self, name, np.concatenate([getattr(self, name), values]))
+
+        # A stable sort keeps insertion order among events that start together
+        order = np.argsort(self.start, kind="stable")
+        for name in fields:
+            setattr(self, name, getattr(self, name)[order])
+        return self
+
+    def mask(self, channel):
+        return self.channel == CHANNELS.index(channel)
+
+    def events(self, channel):
+        """Start, duration and amplitude of every event on ``channel``, in time order."""
+        keep = self.mask(channel)
+        return self.start[keep], self.duration[keep], self.amplitude[keep]
+
+    def area(self, channel):
+        # Net area of the trapezoidal lobes, e.g. to size a prephasing lobe
+        keep = self.mask(channel) & (self.shape == SHAPES.index("trapezoid"))
+        return float(np.sum((self.duration[keep] - self.ramp[keep]) * self.amplitude[keep]))
+
+    def scaled(self, channel, factor):
+        """A copy with every amplitude on ``channel`` multiplied by ``factor``, e.g. one phase-encoding step."""
+        sequence = self.copy()
+        sequence.amplitude[sequence.mask(channel)] *= factor
+        return sequence
+
+    def sample(self, channel, times, left=None):
+        """
+        ``channel``'s waveform at the sorted ``times``.
+
+        An event covers ``[start, start + duration)``. Where ``left`` is set a sample
+        takes the limit from the left instead, so a repeated time can carry both sides
+        of a jump. Trapezoids are sums of ramp functions, evaluated for all samples
+        at once through cumulative sums; shaped events are only evaluated on the
+        samples they cover.
+        """
+        times = np.asarray(times, dtype=float)
+        left = np.zeros(len(times), dtype=bool) if left is None else np.asarray(left, dtype=bool)
+        keep = self.mask(channel)
+        start, duration, amplitude = self.start[keep], self.duration[keep], self.amplitude[keep]
+        ramp, shape = self.ramp[keep], self.shape[keep]
+        end = start + duration
+
+        trapezoid = shape == SHAPES.index("trapezoid")
+        ramped = trapezoid & (ramp > 0)
+        stepped = trapezoid & ~ramped
+
+        # Ramped edges change the slope, unramped ones step the value
+        slope = amplitude[ramped] / ramp[ramped]
+        bend_times = np.concatenate([start[ramped], start[ramped] + ramp[ramped], end[ramped] - ramp[ramped],
+                                     end[ramped]])
+        bends = np.concatenate([slope, -slope, -slope, slope])
+        step_times = np.concatenate([start[stepped], end[stepped]])
+        steps = np.concatenate([amplitude[stepped], -amplitude[stepped]])
+
+        values = _accumulate(bend_times, bends, times, left, ramped=True)
+        values += _accumulate(step_times, steps, times, left, ramped=False)
+
+        shaped = np.flatnonzero(~trapezoid)
+        first = np.searchsorted(times, start[shaped] - TIME_TOLERANCE, side="left")
+        last = np.searchsorted(times, end[shaped] + TIME_TOLERANCE, side="right")
+        counts = last - first
+        if counts.sum():
+            event = shaped[np.repeat(np.arange(len(shaped)), counts)]
+            offsets = np.arange(counts.sum()) - np.repeat(np.cumsum(counts) - counts, counts)
+            index = np.repeat(first, counts) + offsets
+            # Same convention as the trapezoids: on at the start, off at the end, unless seen from the left
+            at_start = np.abs(times[index] - start[event]) < TIME_TOLERANCE
+            at_end = np.abs(times[index] - end[event]) < TIME_TOLERANCE
+            covered = np.where(at_start, ~left[index], np.where(at_end, left[index], True))
+            index, event = index[covered], event[covered]
+            local = (times[index] - start[event]) / duration[event]
+            envelopes = np.empty(len(index))
+            for code in np.unique(shape[event]):
+                same = shape[event] == code
+                envelopes[same] = envelope(SHAPES[code], local[same])
+            np.add.at(values, index, amplitude[event] * envelopes)
+        return values
+
+    def breakpoints(self, ramp_samples=4, shape_samples=64):
+        """
+        Sample times that trace every waveform exactly, with the ``left`` flags for
+        ``sample``: each event edge (twice where a lobe steps, once from each side), a
+        few points along each ramp, where k-space curves, and ``shape_samples``
+        across each shaped pulse.
+
+        The number of points grows with the number of events, not with duration.
+        """
+        trapezoid = self.shape == SHAPES.index("trapezoid")
+        start, end, ramp = self.start, self.start + self.duration, self.ramp
+        ramped = trapezoid & (ramp > 0)
+        jumped = ~ramped
+
+        fractions = np.linspace(0, 1, ramp_samples + 2)
+        ramp_times = np.concatenate([
+            (start[ramped, None] + fractions * ramp[ramped, None]).ravel(),
+            (end[ramped, None] - fractions * ramp[ramped, None]).ravel(),
+        ])
+        shaped = ~trapezoid
+        shape_times = (start[shaped, None] + np.linspace(0, 1, shape_samples) * self.duration[shaped, None]).ravel()
+        jumps = np.unique(np.concatenate([start[jumped], end[jumped]]))
+
+        times = np.unique(np.concatenate([[0.0, self.end], ramp_times, shape_times, jumps]))
+        # Every jump appears twice: first the value before it, then the value after
+        times = np.concatenate([times, jumps])
+        left = np.concatenate([np.zeros(len(times) - len(jumps), dtype=bool), np.ones(len(jumps), dtype=bool)])
+        order = np.lexsort((~left, times))
+        return times[order], left[order]
+
+    def compile(self, dt=1 / 160, duration=None, gamma_bar=1.0, exact=False):
+        """
+        Sample every channel on one time grid and integrate Gx and Gy into the
+        k-space trajectory.
+
+        The grid is uniform from 0 to ``duration`` (the end of the last event by
+        default) and starts one sample early so that lobes starting at 0 ramp up from
+        zero too. Lobes whose edges fall on it integrate to their exact area: each
+        step becomes a one-sample ramp. With ``exact`` the grid is ``breakpoints()``
+        instead, which is exact for any timing and much shorter for long sequences.
+        """
+        if exact:
+            times, left = self.breakpoints()
+        else:
+            duration = self.end if duration is None else duration
+            times, left = np.arange(-1, int(round(duration / dt)) + 1) * dt, None
+        waveforms = {channel: self.sample(channel, times, left) for channel in CHANNELS}
+        kx, ky = kspace_from_gradients(waveforms["gx"], waveforms["gy"], dt, gamma_bar,
+                                       times=times if exact else None)
+        return CompiledSequence(times, waveforms, kx, ky)
+
+
+def _accumulate(edge_times, changes, times, left, ramped):
+    # Sum of every change whose edge has passed: as a step, or as a ramp growing from its edge
+    order = np.argsort(edge_times)
+    edge_times, changes = edge_times[order], changes[order]
+    passed = np.where(left,
+                      np.searchsorted(edge_times, times - TIME_TOLERANCE, side="left"),
+                      np.searchsorted(edge_times, times + TIME_TOLERANCE, side="right"))
+    total = np.concatenate([[0.0], np.cumsum(changes)])
+    if not ramped:
+        return total[passed]
+    moment = np.concatenate([[0.0], np.cumsum(changes * edge_times)])
+    return times * total[passed] - moment[passed]
+
+
+def epi_sequence(echo_train_length, flat_top=1.0, ramp=0.0625, readout_amplitude=0.5, blip_area=0.1,
+                 prephase_duration=0.5, start=0.0):
+    """
+    A blipped EPI train: a prephasing lobe on each axis, then ``echo_train_length``
+    readout lobes of alternating sign with the ADC open on their flat tops.
+
+    Each G_y blip is a triangle of area ``blip_area`` spanning the ramps between two
+    readouts, so every echo sits one line further up k-space. The prephasers move
+    the trajectory to the start of the first line, which makes the train cover
+    k-space symmetrically about its center.
+    """
+    echo_spacing = flat_top + 2 * ramp
+    readout_start = start + prephase_duration + np.arange(echo_train_length) * echo_spacing
+    polarity = np.where(np.arange(echo_train_length) % 2 == 0, 1.0, -1.0)
+    readout_area = readout_amplitude * (flat_top + ramp)
+    prephase_flat = prephase_duration - ramp
+
+    sequence = PulseSequence()
+    sequence.add("gx", start, prephase_duration, -readout_area / 2 / prephase_flat, ramp=ramp)
+    sequence.add("gy", start, prephase_duration, -(echo_train_length - 1) * blip_area / 2 / prephase_flat, ramp=ramp)
+    sequence.add("gx", readout_start, echo_spacing, polarity * readout_amplitude, ramp=ramp)
+    sequence.add("adc", readout_start + ramp, flat_top)
+    sequence.add("gy", readout_start[1:] - ramp, 2 * ramp, blip_area / ramp, ramp=ramp)
+    return sequence
+
+
+class CompiledSequence:
+    """A PulseSequence sampled on one time grid, with its k-space trajectory."""
+
+    def __init__(self, times, waveforms, kx, ky):
+        self.times = times
+        self.waveforms = waveforms
+        self.kx = kx
+        self.ky = ky
+
+    def __getitem__(self, name):
+        if name == "kx":
+            return self.kx
+        if name == "ky":
+            return self.ky
+        return self.waveforms[name]
+
+    def segment(self, name, start, end):
+        """Times and values of a waveform or k-space coordinate between ``start`` and ``end``."""
+        first = np.searchsorted(self.times, start - TIME_TOLERANCE, side="left")
+        last = np.searchsorted(self.times, end + TIME_TOLERANCE, side="right")
+        return self.times[first:last], self[name][first:last]
+
+    def adc_samples(self):
+        # Trajectory points at which the ADC is open
+        acquired = self.waveforms["adc"] != 0
+        return self.kx[acquired], self.ky[acquired]
@@ -0,0 +1,131 @@
+"""
+RF pulse envelopes and their Bézier outlines for sequence diagrams.
+
+Envelopes are functions of the normalized time ``t`` in ``[0, 1]`` with a peak of
+1. Outlines are sampled adaptively: knots crowd where the curve bends and thin out
+along flat tails, and the curve between them is a cubic Hermite segment, so a
+smooth pulse needs a few dozen points instead of a hundred smoothed ones.
+"""
+from functools import lru_cache
+
+import numpy as np
+from scipy.integrate import cumulative_trapezoid
+from scipy.interpolate import CubicSpline
+from scipy.signal import remez
+
+
+SHAPES = ("sinc", "gaussian", "hard", "slr")
+APODIZATIONS = {
+    None: lambda t: np.ones_like(t),
+    "hamming": lambda t: 0.54 + 0.46 * np.cos(2 * np.pi * (t - 0.5)),
+    "hanning": lambda t: 0.5 + 0.5 * np.cos(2 * np.pi * (t - 0.5)),
+}
+
+
+def sinc(t, lobes=5, apodization="hamming"):
+    # ``lobes`` counts the main lobe and the side lobes on both sides, so it is odd
+    zero_crossings = (lobes + 1) / 2
+    t = np.asarray(t, dtype=float)
+    return np.sinc(2 * zero_crossings * (t - 0.5)) * APODIZATIONS[apodization](t)
+
+
+def gaussian(t, sigma=0.15):
+    # ``sigma`` is a fraction of the pulse duration
+    return np.exp(-0.5 * ((np.asarray(t, dtype=float) - 0.5) / sigma) ** 2)
+
+
+def hard(t):
+    return np.ones_like(np.asarray(t, dtype=float))
+
+
+def _transition_width(passband_ripple, stopband_ripple):
+    # Pauly's empirical D∞ for a Parks–McClellan design, in units of the time-bandwidth product
+    l1, l2 = np.log10(passband_ripple), np.log10(stopband_ripple)
+    return ((5.309e-3 * l1 ** 2 + 7.114e-2 * l1 - 4.761e-1) * l2
+            + (-2.66e-3 * l1 ** 2 - 5.941e-1 * l1 - 4.278e-1))
+
+
+@lru_cache(maxsize=16)
+def _slr_taps(time_bandwidth, passband_ripple, stopband_ripple, num_taps):
+    # Equiripple low-pass with the pulse's bandwidth, in cycles per tap
+    edge = time_bandwidth / (2 * num_taps)
+    transition = _transition_width(passband_ripple, stopband_ripple) / time_bandwidth
+    bands = [0, edge * (1 - transition), edge * (1 + transition), 0.5]
+    taps = remez(num_taps, bands, [1, 0], weight=[1, passband_ripple / stopband_ripple])
+    return CubicSpline((np.arange(num_taps) + 0.5) / num_taps, taps / taps.max(), bc_type="natural")
+
+
+def slr(t, time_bandwidth=4, passband_ripple=0.01, stopband_ripple=0.01, num_taps=64):
+    """
+    Small-tip Shinnar–Le Roux pulse: in that limit the pulse is the Parks–McClellan
+    filter itself, designed here for ``time_bandwidth`` and interpolated between taps.
+    """
+    return _slr_taps(time_bandwidth, passband_ripple, stopband_ripple, num_taps)(np.asarray(t, dtype=float))
+
+
+def envelope(shape, t, **params):
+    """The envelope of ``shape`` (one of ``SHAPES``) at normalized times ``t``."""
+    return {"sinc": sinc, "gaussian": gaussian, "hard": hard, "slr": slr}[shape](t, **params)
+
+
+def adaptive_knots(x, y, tolerance, max_spacing):
+    """
+    Indices into the dense samples ``(x, y)`` for knots spaced as ``1 / sqrt(|y''|)``.
+
+    That spacing spreads the chord error evenly, and choosing the count so each
+    chord stays within ``tolerance`` bounds the error of the smoother Hermite curve
+    drawn through the same knots. ``max_spacing`` keeps straight stretches from
+    becoming a single segment.
+    """
+    curvature = np.abs(np.gradient(np.gradient(y, x), x))
+    density = np.sqrt(curvature / (8 * tolerance)) + 1 / max_spacing
+    cumulative = cumulative_trapezoid(density, x, initial=0)
+    num_segments = max(int(np.ceil(cumulative[-1])), 2)
+    targets = np.linspace(0, cumulative[-1], num_segments + 1)
+    return np.unique(np.searchsorted(cumulative, targets).clip(0, len(x) - 1))
+
+
+@lru_cache(maxsize=64)
+def pulse_bezier(shape, duration, amplitude, pixel_width, tolerance=0.25, **params):
+    """
+    Cubic Bézier control points, ``(segments * 4, 3)`` and read-only, of a pulse
+    ``duration`` wide and ``amplitude`` tall in scene units that starts at the origin.
+
+    ``pixel_width`` is the pulse's rendered width in pixels; ``tolerance`` and the
+    knot spacing are in pixels, so a pulse drawn larger gets more knots. The outline
+    starts and ends on the baseline, with straight edges where the envelope does not
+    reach zero (a hard pulse, say).
+    """
+    pixels_per_unit = pixel_width / duration
+    t = np.linspace(0, 1, max(512, 4 * int(pixel_width)))
+    values = envelope(shape, t, **params)
+    slopes = np.gradient(values, t)
+
+    x = t * pixel_width
+    knots = adaptive_knots(x, values * amplitude * pixels_per_unit, tolerance, max_spacing=pixel_width / 8)
+
+    # Hermite segments between knots, with handles a third of the way along each tangent
+    knot_points = np.column_stack([t[knots] * duration, values[knots] * amplitude, np.zeros(len(knots))])
+    tangents = np.column_stack([np.full(len(knots), duration), slopes[knots] * amplitude, np.zeros(len(knots))])
+    steps = np.diff(t[knots])[:, None] / 3
+    curve = np.stack([
+        knot_points[:-1],
+        knot_points[:-1] + steps * tangents[:-1],
+        knot_points[1:] - steps * tangents[1:],
+        knot_points[1:],
+    ], axis=1).reshape(-1, 3)
+
+    edges = []
+    if abs(values[0]) > 1e-9:
+        edges.append(_line([0, 0, 0], knot_points[0]))
+    edges.append(curve)
+    if abs(values[-1]) > 1e-9:
+        edges.append(_line(knot_points[-1], [duration, 0, 0]))
+    points = np.vstack(edges)
+    points.setflags(write=False)
+    return points
+
+
+def _line(start, end):
+    thirds = np.linspace(0, 1, 4)[:, None]
+    return np.asarray(start, dtype=float) + thirds * (np.asarray(end, dtype=float) - np.asarray(start, dtype=float))
@@ -0,0 +1,87 @@
+import numpy as np
+
+
+TAU = 2 * np.pi
+
+
+def _check_acceleration(rows, acceleration):
+    # Folding splits the rows into ``acceleration`` equal bands, so they have to divide evenly
+    if rows % acceleration:
+        raise ValueError(f"{rows} rows cannot be split into {acceleration} equal bands; "
+                         f"the row count must be a multiple of the acceleration")
+
+
+def coil_sensitivities(shape, num_coils=8, coil_distance=1.3, coil_width=0.9):
+    """
+    Smooth complex sensitivity maps of a ring of receive coils, shaped ``(coils, rows, cols)``.
+
+    The image spans [-1, 1] on both axes and the coils sit evenly around it at
+    ``coil_distance`` from the center. Magnitude falls off with distance from each
+    coil; the phase winds with the viewing angle, as it does for real loop coils.
+    """
+    rows, cols = shape
+    y = (rows // 2 - np.arange(rows))[:, None] * (2 / rows)
+    x = (np.arange(cols) - cols // 2)[None, :] * (2 / cols)
+
+    angles = np.arange(num_coils) * TAU / num_coils
+    coil_x = coil_distance * np.cos(angles)[:, None, None]
+    coil_y = coil_distance * np.sin(angles)[:, None, None]
+
+    dx, dy = x[None] - coil_x, y[None] - coil_y
+    magnitude = 1 / (1 + (dx ** 2 + dy ** 2) / coil_width ** 2)
+    phase = np.arctan2(dy, dx) - angles[:, None, None]
+    return magnitude * np.exp(1j * phase)
+
+
+def acquire(image, sensitivities, acceleration=1, noise=0.0, seed=0):
+    """
+    Aliased per-coil images from k-space keeping every ``acceleration``-th ky line.
+
+    All coils go through one batched FFT over the coil axis. ``noise`` is the
+    standard deviation a fully sampled image would have; sampling fewer lines of a
+    noisy k-space leaves each folded image ``sqrt(acceleration)`` times noisier.
+    Returns ``(coils, rows // acceleration, cols)`` complex images, in which row ``y``
+    is the sum of rows ``y + k * rows // acceleration`` of the coil images. The number
+    of rows must be a multiple of ``acceleration``.
+    """
+    _check_acceleration(image.shape[0], acceleration)
+    coil_images = sensitivities * image[None]
+    kspace = np.fft.fft2(coil_images, axes=(-2, -1))[:, ::acceleration]
+    if noise:
+        rng = np.random.default_rng(seed)
+        scale = noise * np.sqrt(image.size / 2)
+        kspace = kspace + scale * (rng.standard_normal(kspace.shape) + 1j * rng.standard_normal(kspace.shape))
+    return np.fft.ifft2(kspace, axes=(-2, -1))
+
+
+def sense_unfold(folded, sensitivities, acceleration, regularization=1e-6):
+    """
+    SENSE reconstruction of ``folded`` coil images, with the g-factor of every pixel.
+
+    Each folded pixel is a small least-squares problem: ``coils`` measurements of the
+    ``acceleration`` pixels that overlap there. All of them are solved together with
+    batched ``np.linalg`` calls. Returns ``(image, g_factor)``, both ``(rows, cols)``.
+    """
+    coils, rows, cols = sensitivities.shape
+    _check_acceleration(rows, acceleration)
+    reduced = rows // acceleration
+
+    # (reduced, cols, coils, acceleration): which coil sees how much of each overlapping pixel
+    encoding = sensitivities.reshape(coils, acceleration, reduced, cols).transpose(2, 3, 0, 1)
+    measured = folded.transpose(1, 2, 0)[..., None]
+
+    encoding_adjoint = encoding.conj().swapaxes(-1, -2)
+    normal = encoding_adjoint @ encoding + regularization * np.eye(acceleration)
+    inverse = np.linalg.inv(normal)
+    unfolded = (inverse @ (encoding_adjoint @ measured))[..., 0]
+
+    diagonal = np.einsum("...ii->...i", inverse).real * np.einsum("...ii->...i", normal).real
+    g_factor = np.sqrt(np.maximum(diagonal, 1))
+
+    # Back from (reduced, cols, acceleration) to full-FOV row order
+    image = unfolded.transpose(2, 0, 1).reshape(rows, cols)
+    return image, g_factor.transpose(2, 0, 1).reshape(rows, cols)
+
+
+def root_sum_of_squares(coil_images):
+    return np.sqrt(np.sum(np.abs(coil_images) ** 2, axis=0))
@@ -0,0 +1,114 @@
+from manim import DOWN, LEFT, RIGHT, WHITE, Axes, DashedLine, MathTex, Rectangle, Tex, VGroup, VMobject
+import numpy as np
+
+from mri.plotting import coords_to_points
+
+
+class SequenceDiagram:
+    """
+    Mixin for scenes that draw a pulse sequence as stacked, labeled timing axes.
+
+    Axes, time markers and lobe outlines are drawn in ``diagram_color``, so scenes on
+    a white background only need to override that one attribute.
+    """
+
+    diagram_color = WHITE
+    axes_width = 12
+    axes_height = 1.5
+    axes_spacing = 0.75
+
+    def create_labeled_axes(self, label, width=None, height=None, color=WHITE, secondary_label=None, duration=10):
+        # Create axes with label but without y-axis
+        axes = Axes(
+            x_range=[0, duration, duration / 10],
+            y_range=[-1, 1, 0.5],
+            x_length=width or self.axes_width,
+            y_length=height or self.axes_height,
+            axis_config={"include_tip": False, "include_numbers": False, "color": self.diagram_color},
+            y_axis_config={"include_ticks": False, "stroke_opacity": 0}  # Hide y-axis
+        )
+
+        labels = VGroup()
+
+        label_tex = MathTex(label, color=color)
+        labels.add(label_tex)
+
+        if secondary_label:
+            secondary_label_tex = Tex(secondary_label, color=color).scale(0.5)
+            secondary_label_tex.next_to(label_tex, DOWN, buff=0.3)
+            labels.add(secondary_label_tex)
+
+        labels.next_to(axes.y_axis, LEFT, buff=0.2)
+        return VGroup(axes, labels)
+
+    def stack_axes(self, *labeled_axes):
+        # Stack the axes vertically with the axes themselves (not their labels) right-aligned
+        axes_group = VGroup(*labeled_axes)
+        axes_group.arrange(DOWN, buff=self.axes_spacing, aligned_edge=RIGHT)
+        for i in range(1, len(axes_group)):
+            axes_group[i][0].align_to(axes_group[0][0], RIGHT)
+        return axes_group
+
+    def create_vertical_time_markers(self, time_points, connecting_axes):
+        markers = []
+
+        # Get the top and bottom y coordinates for our dashed lines
+        top_y = connecting_axes[0][0].get_origin()[1] + connecting_axes[0][0].get_y_axis().get_height() / 2
+        bottom_y = connecting_axes[-1][0].get_origin()[1] - connecting_axes[-1][0].get_y_axis().get_height() / 2
+
+        for time in time_points:
+            # Get the x coordinate for this time point
+            x = connecting_axes[0][0].c2p(time, 0)[0]
+
+            # Create dashed line
+            line = DashedLine(
+                start=[x, top_y, 0],
+                end=[x, bottom_y, 0],
+                stroke_width=1,
+                color=self.diagram_color,
+                dash_length=0.1
+            )
+            markers.append(line)
+
+        return markers
+
+    def create_gradient_rectangle(self, axes, start_time, duration, amplitude, color=WHITE, fill_opacity=1):
+        # Convert the lobe's corners to scene coordinates
+        p1 = axes[0].c2p(start_time, 0)
+        p2 = axes[0].c2p(start_time + duration, amplitude)
+
+        rect = Rectangle(
+            width=p2[0] - p1[0],
+            height=abs(p2[1] - p1[1]),
+            stroke_width=1.5,
+            fill_color=color,
+            fill_opacity=fill_opacity,
+            color=self.diagram_color
+        )
+        rect.move_to((p1 + p2) / 2)
+
+        return rect
+
+    def create_gradient_rectangles(self, axes, sequence, channel, color=WHITE, fill_opacity=1):
+        # One rectangle per event on a gradient channel of a PulseSequence, in time order
+        return [
+            self.create_gradient_rectangle(axes, start, duration, amplitude, color=color, fill_opacity=fill_opacity)
+            for start, duration, amplitude in zip(*sequence.events(channel))
+        ]
+
+    def create_gradient_waveform(self, axes, times, values, color=WHITE, fill_opacity=1):
+        # A whole gradient channel as one filled outline, however many lobes it has
+        times = np.concatenate([[times[0]], times, [times[-1]]])
+        values = np.concatenate([[0], values, [0]])
+        waveform = VMobject()
+        waveform.set_points_as_corners(coords_to_points(axes[0], times, values))
+        waveform.set_stroke(self.diagram_color, width=1.5)
+        waveform.set_fill(color, opacity=fill_opacity)
+        return waveform
+
+    def create_waveform_curve(self, axes, times, values, color=WHITE, stroke_width=2):
+        # Sampled waveform (RF envelope, k-space coordinate, ...) as one polyline
+        curve = VMobject()
+        curve.set_points_as_corners(coords_to_points(axes[0], times, values))
+        curve.set_stroke(color, width=stroke_width)
+        return curve
@@ -0,0 +1,75 @@
+from manim import VMobject
+import numpy as np
+
+from mri.plotting import coords_to_points
+
+
+TAU = 2 * np.pi
+
+
+class SignalRecorder:
+    """
+    Received signal of a SpinField, one complex sample at a time.
+
+    Each sample is the vectorized sum of every spin's transverse magnetization,
+    demodulated at ``demodulation_frequency``. The FFT size is fixed up front so
+    every projection reuses the same transform length.
+    """
+
+    def __init__(self, num_samples, sample_interval, demodulation_frequency=0.0, fft_size=None):
+        self.samples = np.zeros(num_samples, dtype=complex)
+        self.sample_interval = sample_interval
+        self.demodulation_frequency = demodulation_frequency
+        self.fft_size = fft_size or 1 << int(np.ceil(np.log2(max(num_samples, 2))))
+        self.count = 0
+
+    def __len__(self):
+        return self.count
+
+    @property
+    def times(self):
+        return np.arange(self.count) * self.sample_interval
+
+    def record(self, spin_field):
+        if self.count == len(self.samples):
+            return self.samples[-1]
+        time = self.count * self.sample_interval
+        demodulation = np.exp(-1j * TAU * self.demodulation_frequency * time)
+        sample = np.sum(spin_field.magnitude * np.exp(1j * spin_field.phase)) * demodulation
+        self.samples[self.count] = sample
+        self.count += 1
+        return sample
+
+    def frequencies(self):
+        return np.fft.fftshift(np.fft.fftfreq(self.fft_size, self.sample_interval))
+
+    def projection(self):
+        """Magnitude spectrum of the samples so far: the 1D projection along the readout axis."""
+        spectrum = np.fft.fftshift(np.fft.fft(self.samples[:self.count], n=self.fft_size))
+        return np.abs(spectrum)
+
+
+class SignalTrace(VMobject):
+    """
+    A polyline on ``axes`` that grows one sample at a time.
+
+    Bézier control points go into a preallocated buffer and ``points`` is a view of
+    the filled part, so appending never copies what was already drawn.
+    """
+
+    def __init__(self, axes, num_samples, **kwargs):
+        super().__init__(**kwargs)
+        self.axes = axes
+        self.buffer = np.zeros((4 * max(num_samples - 1, 0), 3))
+        self.last_point = None
+        self.count = 0
+
+    def append_sample(self, x, y):
+        point = coords_to_points(self.axes, x, y)
+        if self.last_point is not None and self.count < len(self.buffer):
+            thirds = np.linspace(0, 1, 4)[:, None]
+            self.buffer[self.count:self.count + 4] = self.last_point + thirds * (point - self.last_point)
+            self.count += 4
+            self.points = self.buffer[:self.count]
+        self.last_point = point
+        return self
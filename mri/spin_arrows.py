@@ -0,0 +1,185 @@
+from manim import Animation, Circle, VMobject, WHITE, color_to_rgb, linear, rgb_to_color
+import numpy as np
+
+
+def _line_segments(corners, closed=False):
+    # Cubic Bézier control points for a polyline through ``corners``
+    corners = np.asarray(corners, dtype=float)
+    if closed:
+        corners = np.vstack([corners, corners[:1]])
+    starts = corners[:-1]
+    ends = corners[1:]
+    thirds = np.linspace(0, 1, 4)[None, :, None]
+    return (starts[:, None, :] + thirds * (ends - starts)[:, None, :]).reshape(-1, 3)
+
+
+def arrow_template(length=0.5, tip_length=0.1, tip_width=None):
+    """
+    Control points of a single up-pointing arrow centered on the origin.
+
+    The tip is a closed triangle and the shaft an open line, so one VMobject can fill
+    the tips and stroke the shafts of every arrow in a single pass.
+    """
+    if tip_width is None:
+        tip_width = tip_length * 2 / np.sqrt(3)
+    top = length / 2
+    tip_base = top - tip_length
+
+    tip = _line_segments([
+        [-tip_width / 2, tip_base, 0],
+        [0, top, 0],
+        [tip_width / 2, tip_base, 0],
+    ], closed=True)
+    shaft = _line_segments([[0, -top, 0], [0, tip_base, 0]])
+    return np.vstack([tip, shaft])
+
+
+class SpinArrows(VMobject):
+    """
+    Every arrow of a SpinField drawn as one VMobject.
+
+    The arrow glyph is built once; each redraw maps it through the field's per-spin
+    2x2 matrices with a single einsum and writes the result into ``points`` in place.
+    With a PhaseColormap the arrows are instead sorted into one submobject per color
+    bin, so recoloring the whole field never touches more than a handful of mobjects.
+    """
+
+    def __init__(self, spin_field, length=0.5, tip_length=0.1, stroke_width=5, colormap=None, **kwargs):
+        super().__init__(stroke_width=stroke_width, fill_opacity=1, **kwargs)
+        self.spin_field = spin_field
+        self.template = arrow_template(length, tip_length)
+        self.colormap = None
+        if colormap is not None:
+            self.set_colormap(colormap)
+        self.update_from_field()
+
+    def set_colormap(self, colormap):
+        self.colormap = colormap
+        self.points = np.zeros((0, 3))
+        self.submobjects = []
+        for color in colormap.colors:
+            color_bin = VMobject(stroke_width=self.get_stroke_width(), fill_opacity=1)
+            color_bin.set_color(color)
+            self.add(color_bin)
+        self.update_from_field()
+        return self
+
+    def set_magnetization(self, magnetization, phase_offset=0.0):
+        self.spin_field.set_magnetization(magnetization, phase_offset)
+        return self.update_from_field()
+
+    def _arrow_points(self, out):
+        field = self.spin_field
+        matrices = field.arrow_matrices()
+        np.einsum("nij,kj->nki", matrices, self.template[:, :2], out=out[:, :, :2])
+        out[:, :, :2] += field.positions[:, None, :2]
+        return out
+
+    def update_from_field(self):
+        field = self.spin_field
+        count = len(field)
+        template_size = len(self.template)
+
+        if self.colormap is None:
+            if self.points.shape != (count * template_size, 3):
+                self.points = np.zeros((count * template_size, 3))
+            self._arrow_points(self.points.reshape(count, template_size, 3))
+            return self
+
+        # Group arrows by color bin with one stable sort, then hand each bin a contiguous slice
+        bins = self.colormap.bin_indices(field.phase)
+        order = np.argsort(bins, kind="stable")
+        arrows = np.zeros((count, template_size, 3))
+        self._arrow_points(arrows)
+        sorted_points = arrows[order].reshape(-1, 3)
+
+        ends = np.cumsum(np.bincount(bins, minlength=len(self.colormap))) * template_size
+        starts = np.concatenate([[0], ends[:-1]])
+        for color_bin, start, end in zip(self.submobjects, starts, ends):
+            color_bin.points = sorted_points[start:end]
+        return self
+
+
+class SpinDots(VMobject):
+    """The circles marking each spin's position, drawn as one VMobject."""
+
+    def __init__(self, spin_field, radius=0.1, color=WHITE, **kwargs):
+        super().__init__(color=color, **kwargs)
+        template = Circle(radius=radius).points
+        positions = spin_field.positions
+        self.points = (template[None, :, :] + positions[:, None, :]).reshape(-1, 3)
+
+
+class EvolveSpinField(Animation):
+    """
+    Advance the phases of a SpinField by ``phase_increment`` and redraw its arrows.
+
+    Unlike ``Rotate`` this neither copies the arrows nor touches them one at a time.
+    """
+
+    def __init__(self, spin_arrows, phase_increment, rate_func=linear, **kwargs):
+        self.phase_increment = np.asarray(phase_increment, dtype=float)
+        super().__init__(spin_arrows, rate_func=rate_func, **kwargs)
+
+    def begin(self):
+        self.start_phase = self.mobject.spin_field.phase.copy()
+        super().begin()
+
+    def create_starting_mobject(self):
+        return self.mobject
+
+    def interpolate_mobject(self, alpha):
+        field = self.mobject.spin_field
+        field.phase[:] = self.start_phase + self.rate_func(alpha) * self.phase_increment
+        self.mobject.update_from_field()
+
+
+class PlayBlochTrajectory(Animation):
+    """
+    Step spins through a precomputed BlochTrajectory between two times.
+
+    Works on anything with ``set_magnetization`` (SpinArrows or MagnetizationVectors);
+    each frame is a lookup into the trajectory followed by an in-place redraw.
+    """
+
+    def __init__(self, spin_arrows, trajectory, start_time=0.0, end_time=None, phase_offset=0.0,
+                 rate_func=linear, **kwargs):
+        self.trajectory = trajectory
+        self.start_time = start_time
+        self.end_time = trajectory.times[-1] if end_time is None else end_time
+        self.phase_offset = phase_offset
+        super().__init__(spin_arrows, rate_func=rate_func, **kwargs)
+
+    def create_starting_mobject(self):
+        return self.mobject
+
+    def interpolate_mobject(self, alpha):
+        time = self.start_time + self.rate_func(alpha) * (self.end_time - self.start_time)
+        self.mobject.set_magnetization(self.trajectory.at(time), self.phase_offset)
+
+
+class RecolorSpinArrows(Animation):
+    """
+    Fade a uniformly colored SpinArrows into the colors of a PhaseColormap.
+
+    Every bin is blended in one array operation, so this is one animation no matter
+    how many arrows are in the field.
+    """
+
+    def __init__(self, spin_arrows, colormap, **kwargs):
+        self.colormap = colormap
+        super().__init__(spin_arrows, **kwargs)
+
+    def begin(self):
+        self.start_rgb = color_to_rgb(self.mobject.get_color())
+        self.mobject.set_colormap(self.colormap)
+        super().begin()
+
+    def create_starting_mobject(self):
+        return self.mobject
+
+    def interpolate_mobject(self, alpha):
+        alpha = self.rate_func(alpha)
+        rgbs = self.start_rgb + alpha * (self.colormap.rgbs - self.start_rgb)
+        for color_bin, rgb in zip(self.mobject.submobjects, rgbs):
+            color_bin.set_color(rgb_to_color(rgb))
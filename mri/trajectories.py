@@ -0,0 +1,50 @@
+import numpy as np
+
+
+TAU = 2 * np.pi
+
+# Radial spokes this far apart never repeat and fill k-space evenly at any count
+GOLDEN_ANGLE = np.pi * 2 / (1 + np.sqrt(5))
+
+
+def radial(num_spokes, resolution=256, samples_per_spoke=None, golden_angle=True):
+    """
+    Radial spokes through the center of k-space, shaped ``(spokes, samples, 2)``.
+
+    Coordinates are ``(kx, ky)`` in cycles per field of view, reaching the Nyquist
+    limit ``resolution / 2`` at the ends of each spoke.
+    """
+    if samples_per_spoke is None:
+        samples_per_spoke = 2 * resolution
+    if golden_angle:
+        angles = np.arange(num_spokes) * GOLDEN_ANGLE
+    else:
+        angles = np.arange(num_spokes) * np.pi / num_spokes
+
+    radius = (np.arange(samples_per_spoke) - samples_per_spoke / 2) / samples_per_spoke * resolution
+    directions = np.column_stack([np.cos(angles), np.sin(angles)])
+    return radius[None, :, None] * directions[:, None, :]
+
+
+def spiral(num_interleaves, resolution=256, samples_per_interleaf=None, turn_margin=1.1):
+    """
+    Archimedean spiral interleaves from the center outwards, shaped ``(interleaves, samples, 2)``.
+
+    Neighbouring arms must stay at most one cycle per field of view apart for the
+    union of all interleaves to meet the Nyquist criterion. Arms exactly that far
+    apart leave gridding errors along the image edges, so ``turn_margin`` adds turns
+    beyond the minimum; with the default 10% a spiral reconstructs about as well as
+    a fully sampled radial acquisition.
+    """
+    k_max = resolution / 2
+    turns = int(np.ceil(turn_margin * k_max / num_interleaves))
+    if samples_per_interleaf is None:
+        # One sample per unit of arc length at the rim, about two on average over the spiral
+        samples_per_interleaf = int(np.ceil(2 * np.pi * k_max * turns))
+
+    t = np.linspace(0, 1, samples_per_interleaf, endpoint=False)
+    radius = k_max * t
+    angle = TAU * turns * t
+    offsets = np.arange(num_interleaves) * TAU / num_interleaves
+    total_angle = angle[None, :] + offsets[:, None]
+    return np.stack([radius * np.cos(total_angle), radius * np.sin(total_angle)], axis=-1)